@@ -5,6 +5,7 @@ import argparse
 import random
 from rpg_game.config import DEV_FLAGS
 from rpg_game.core import GameManager
+from rpg_game.systems.rng import initialize_rng
 
 
 def parse_args():
@@ -14,6 +15,9 @@ def parse_args():
     parser.add_argument('--quiet', action='store_true', help='Suppress non-critical notifications')
     parser.add_argument('--no-color', action='store_true', help='Disable ANSI colors')
     parser.add_argument('--seed', type=int, help='Random seed for reproducible runs')
+    parser.add_argument('--save-format', choices=['json', 'binary'], default='json',
+                        help='Format for new saves (both formats always load; binary saves keep the '
+                             'save_<slot>.json file name, so .json slots may hold binary data)')
     parser.add_argument('--new', action='store_true', help='Start a new game (bypass menu)')
     parser.add_argument('--load', action='store_true', help='Load existing game (bypass menu)')
     parser.add_argument('--name', type=str, help='Player name (use with --new)')
@@ -37,9 +41,12 @@ if __name__ == "__main__":
         DEV_FLAGS['fast'] = args.fast
         DEV_FLAGS['quiet'] = args.quiet
         DEV_FLAGS['no_color'] = args.no_color
+        DEV_FLAGS['save_format'] = args.save_format
         if args.seed is not None:
             DEV_FLAGS['seed'] = args.seed
             random.seed(args.seed)
+        # Named game streams (combat, loot, skills, events) derive from the seed
+        initialize_rng(args.seed)
         
         main()
     except KeyboardInterrupt:
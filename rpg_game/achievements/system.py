@@ -219,10 +219,7 @@ def check_achievements(player, achievement_type, value=None):
     
     elif achievement_type == 'talisman_count':
         # Check talisman count achievements
-        talisman_count = 0
-        for item in player.inventory:
-            if item.get('type') == 'talisman':
-                talisman_count += 1
+        talisman_count = player.inventory.count_type('talisman')
         
         for ach_key, ach_data in ALL_ACHIEVEMENTS.items():
             if ach_data['type'] == 'talisman_count':
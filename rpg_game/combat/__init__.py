@@ -1,6 +1,8 @@
 """Combat system"""
-from .system import combat, scale_enemy
+from .system import combat, scale_enemy, get_scaled_enemy, spawn_scaled_enemy, ScaledEnemy
+from .engine import CombatEngine, PlayerSnapshot
 from .enemies import BASE_ENEMIES
 
-__all__ = ['combat', 'scale_enemy', 'BASE_ENEMIES']
+__all__ = ['combat', 'scale_enemy', 'get_scaled_enemy', 'spawn_scaled_enemy', 'ScaledEnemy',
+           'CombatEngine', 'PlayerSnapshot', 'BASE_ENEMIES']
 
@@ -0,0 +1,230 @@
+"""Analytic expected-value calculator for encounters
+
+Computes exact fight statistics from the damage model in ``CombatEngine``
+by convolving damage distributions, with no sampling:
+
+* the player's per-hit damage is a mixture of the crit range, the DEX upper
+  range and the precision-floor range, clamped by enemy defense;
+* each enemy turn is a dodge (0 damage) or a uniform hit reduced by the
+  player's defense.
+
+A fight is a race: the enemy needs T player hits to die and gets T-1 turns
+in between, and both sequences are independent. Distributions are tracked
+only below the HP thresholds, and iteration stops once the remaining
+probability mass is below ``EV_TAIL_EPSILON``.
+"""
+import math
+from itertools import accumulate
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from ..constants import CRIT_MULTIPLIER_MIN, CRIT_MULTIPLIER_MAX, MIN_DAMAGE_ALWAYS
+from ..items.definitions import DROP_ITEMS
+from .engine import CombatEngine, PlayerSnapshot
+from .loot import NIGHT_DROP_RATE_BUFF
+
+# Probability mass below which the fight-length tail is dropped
+EV_TAIL_EPSILON = 1e-12
+
+# Hard stop for degenerate matchups (e.g. 1 damage vs huge HP)
+EV_MAX_ROUNDS = 100000
+
+# A damage PMF as runs of equal probability: (low, high, probability each)
+DamageRuns = List[Tuple[int, int, float]]
+
+
+class EncounterEV(NamedTuple):
+    """Expected outcome of one fight from full HP"""
+    name: str
+    win_probability: float
+    turns_to_kill: float          # E[player attacks needed], ignoring death
+    expected_rounds: float        # E[rounds actually fought]
+    expected_damage_taken: float
+    expected_gold: float          # Per encounter (win probability applied)
+    expected_exp: float
+    expected_drops: Dict[str, float]  # Item name -> expected count per encounter
+
+
+def _uniform_pmf(pmf: Dict[int, float], low: int, high: int, weight: float) -> None:
+    """Add ``weight`` spread evenly over the integers low..high"""
+    if weight <= 0.0:
+        return
+    if high < low:
+        high = low
+    each = weight / (high - low + 1)
+    for value in range(low, high + 1):
+        pmf[value] = pmf.get(value, 0.0) + each
+
+
+def _crit_pmf(pmf: Dict[int, float], max_damage: int, weight: float) -> None:
+    """Add the law of int(max_damage * uniform(CRIT_MULTIPLIER_MIN, CRIT_MULTIPLIER_MAX))"""
+    if weight <= 0.0:
+        return
+    if max_damage <= 0:
+        pmf[0] = pmf.get(0, 0.0) + weight
+        return
+    low = CRIT_MULTIPLIER_MIN * max_damage
+    high = CRIT_MULTIPLIER_MAX * max_damage
+    span = high - low
+    for value in range(int(low), math.ceil(high)):
+        overlap = min(value + 1, high) - max(value, low)
+        if overlap > 0:
+            pmf[value] = pmf.get(value, 0.0) + weight * overlap / span
+
+
+def _to_runs(pmf: Dict[int, float]) -> DamageRuns:
+    """Compress a PMF into runs of consecutive values with equal probability"""
+    runs: DamageRuns = []
+    for value in sorted(pmf):
+        prob = pmf[value]
+        if prob <= 0.0:
+            continue
+        if runs:
+            low, high, each = runs[-1]
+            if value == high + 1 and math.isclose(prob, each, rel_tol=1e-9, abs_tol=1e-15):
+                runs[-1] = (low, value, each)
+                continue
+        runs.append((value, value, prob))
+    return runs
+
+
+def player_damage_runs(engine: CombatEngine) -> DamageRuns:
+    """Per-attack damage dealt to the enemy (after defense)"""
+    raw: Dict[int, float] = {}
+    crit = engine.crit_chance
+    upper = min(1.0, engine.dex_bonus)
+    _crit_pmf(raw, engine.max_damage, crit)
+    _uniform_pmf(raw, engine.upper_low, engine.max_damage, (1.0 - crit) * upper)
+    _uniform_pmf(raw, engine.floor_damage, engine.max_damage, (1.0 - crit) * (1.0 - upper))
+
+    dealt: Dict[int, float] = {}
+    defense = engine.enemy.defense
+    for value, prob in raw.items():
+        key = max(1, value - defense)
+        dealt[key] = dealt.get(key, 0.0) + prob
+    return _to_runs(dealt)
+
+
+def enemy_damage_runs(engine: CombatEngine) -> DamageRuns:
+    """Per-turn damage taken by the player (0 on a dodge)"""
+    pmf: Dict[int, float] = {}
+    if engine.dodge_chance > 0.0:
+        pmf[0] = engine.dodge_chance
+    hit = 1.0 - engine.dodge_chance
+    width = engine.enemy_attack_high - engine.enemy_attack_low + 1
+    defense = engine.stats.defense
+    for raw in range(engine.enemy_attack_low, engine.enemy_attack_high + 1):
+        taken = max(MIN_DAMAGE_ALWAYS, raw - defense)
+        pmf[taken] = pmf.get(taken, 0.0) + hit / width
+    return _to_runs(pmf)
+
+
+def _mean(runs: DamageRuns) -> float:
+    return sum((low + high) / 2 * each * (high - low + 1) for low, high, each in runs)
+
+
+def _step(mass: List[float], runs: DamageRuns) -> List[float]:
+    """Add one damage draw to a cumulative-damage distribution, truncated to len(mass)"""
+    size = len(mass)
+    prefix = list(accumulate(mass, initial=0.0))
+    result = [0.0] * size
+    for low, high, each in runs:
+        if low >= size:
+            continue
+        # result[h] += each * sum(mass[h - high .. h - low])
+        for h in range(low, size):
+            start = h - high
+            result[h] += each * (prefix[h - low + 1] - prefix[start if start > 0 else 0])
+    return result
+
+
+def expected_hits_to_kill(hp: int, runs: DamageRuns) -> float:
+    """E[number of hits until cumulative damage reaches ``hp``].
+
+    Solves m[h] = 1 + sum_d p(d) * m[h - d] (m[h <= 0] = 0) bottom-up with a
+    running prefix sum, so it costs O(hp * len(runs)).
+    """
+    if hp <= 0:
+        return 0.0
+    m = [0.0] * (hp + 1)
+    prefix = [0.0] * (hp + 2)  # prefix[k] = m[0] + ... + m[k - 1]
+    for h in range(1, hp + 1):
+        total = 1.0
+        for low, high, each in runs:
+            # m[h - d] for d in low..high, clipped to indices >= 0
+            top = h - low
+            if top <= 0:
+                continue
+            bottom = max(0, h - high)
+            total += each * (prefix[top + 1] - prefix[bottom])
+        m[h] = total
+        prefix[h + 1] = prefix[h] + total
+    return m[hp]
+
+
+def expected_encounter(stats: PlayerSnapshot, enemy, night: Optional[bool] = None) -> EncounterEV:
+    """Exact expected outcome of fighting one scaled enemy from full HP.
+
+    Args:
+        stats: Player combat stats; the fight starts at ``stats.max_hp``
+        enemy: ScaledEnemy record (see ``get_scaled_enemy``)
+        night: Apply the night drop buff (default: the record's is_night)
+    """
+    engine = CombatEngine(stats, enemy)
+    hit_runs = player_damage_runs(engine)
+    taken_runs = enemy_damage_runs(engine)
+
+    # Cumulative damage so far, restricted to values still below the kill / death threshold
+    enemy_mass = [0.0] * max(1, enemy.hp)
+    enemy_mass[0] = 1.0
+    player_mass = [0.0] * max(1, stats.max_hp)
+    player_mass[0] = 1.0
+
+    enemy_survives = 1.0   # P(enemy survives n - 1 hits)
+    player_alive = 1.0     # P(player survives n - 1 enemy turns)
+    win = 0.0
+    rounds = 0.0
+    enemy_turns = 0.0
+    n = 0
+    while (n < EV_MAX_ROUNDS and enemy_survives > EV_TAIL_EPSILON
+           and player_alive > EV_TAIL_EPSILON):
+        n += 1
+        # Round n happens if both sides are still up
+        rounds += enemy_survives * player_alive
+        enemy_mass = _step(enemy_mass, hit_runs)
+        still_standing = sum(enemy_mass)
+        win += (enemy_survives - still_standing) * player_alive
+        enemy_survives = still_standing
+        # The enemy counters only if it survived this round's hit
+        enemy_turns += enemy_survives * player_alive
+        player_mass = _step(player_mass, taken_runs)
+        player_alive = sum(player_mass)
+
+    drop_multiplier = NIGHT_DROP_RATE_BUFF if (enemy.is_night if night is None else night) else 1.0
+    drops: Dict[str, float] = {}
+    for drop in enemy.drops:
+        item = DROP_ITEMS.get(drop['item'])
+        if item is None:
+            continue
+        chance = min(1.0, drop['chance'] * drop_multiplier)
+        drops[item['name']] = drops.get(item['name'], 0.0) + chance * win
+
+    return EncounterEV(
+        name=enemy.name,
+        win_probability=win,
+        turns_to_kill=expected_hits_to_kill(enemy.hp, hit_runs),
+        expected_rounds=rounds,
+        expected_damage_taken=enemy_turns * _mean(taken_runs),
+        expected_gold=win * enemy.gold,
+        expected_exp=win * enemy.exp,
+        expected_drops=drops
+    )
+
+
+def expected_for_templates(stats: PlayerSnapshot, templates: Sequence[Dict], player_level: int,
+                           location_multiplier: float = 1.0, night: bool = False) -> List[EncounterEV]:
+    """EV rows for BASE_ENEMIES-style templates scaled to ``player_level``"""
+    from .system import get_scaled_enemy
+    return [
+        expected_encounter(stats, get_scaled_enemy(template, player_level, location_multiplier, night))
+        for template in templates
+    ]
@@ -0,0 +1,234 @@
+"""UI-free combat resolution core
+
+``CombatEngine`` owns the damage math for a single fight and reports what
+happened as a stream of small typed events. It never prints, prompts or
+touches the Player object, so ``combat()`` renders the stream to the
+terminal while the simulator and tests consume it directly.
+"""
+import random
+from typing import Dict, Iterator, NamedTuple, Optional, Sequence, Union
+
+from ..constants import (
+    DODGE_CAP, DODGE_CALCULATION_DIVISOR, BOSS_ACCURACY_FLOOR, RUN_CHANCE,
+    ENEMY_ATTACK_MIN_VARIANCE, ENEMY_ATTACK_MAX_VARIANCE,
+    MIN_DAMAGE_RATIO, MIN_DAMAGE_ALWAYS,
+    CRIT_CHANCE_MAX, CRIT_DEX_DIVISOR,
+    CRIT_MULTIPLIER_MIN, CRIT_MULTIPLIER_MAX,
+    DEX_PRECISION_INTERVAL, DEX_PRECISION_BONUS,
+    DEX_DAMAGE_DIVISOR, DEX_UPPER_RANGE_RATIO
+)
+from ..items.definitions import DROP_ITEMS
+from ..items.registry import new_item
+from .loot import LootTable
+
+
+class PlayerSnapshot:
+    """Immutable view of the player stats that matter for combat math"""
+
+    __slots__ = ('max_attack', 'defense', 'max_hp', 'dex', 'agl')
+
+    def __init__(self, max_attack: int, defense: int, max_hp: int, dex: int, agl: int):
+        self.max_attack = max_attack
+        self.defense = defense
+        self.max_hp = max_hp
+        self.dex = dex
+        self.agl = agl
+
+    @classmethod
+    def from_player(cls, player) -> 'PlayerSnapshot':
+        """Capture combat stats from a live Player"""
+        return cls(
+            max_attack=player.get_max_attack_power(),
+            defense=player.get_defense_power(),
+            max_hp=player.max_hp,
+            dex=player.dex,
+            agl=player.agl
+        )
+
+
+# ---------------------------------------------------------------------------
+# Events
+# ---------------------------------------------------------------------------
+
+class Hit(NamedTuple):
+    """Player hit the enemy (``damage`` is raw, ``dealt`` is after defense)"""
+    damage: int
+    dealt: int
+
+
+class Crit(NamedTuple):
+    """Player landed a critical hit"""
+    damage: int
+    dealt: int
+
+
+class EnemyHit(NamedTuple):
+    """Enemy hit the player for ``damage`` after defense"""
+    damage: int
+
+
+class Dodge(NamedTuple):
+    """Player dodged an enemy attack of ``damage`` raw damage"""
+    damage: int
+
+
+class Heal(NamedTuple):
+    """Potions used: ``used`` of ``requested`` items restored ``amount`` HP"""
+    amount: int
+    used: int
+    requested: int
+    item_name: str = ''
+
+
+class Fled(NamedTuple):
+    """Player escaped the fight"""
+
+
+class FleeFailed(NamedTuple):
+    """Player failed to run away"""
+    chance: float
+
+
+class EnemyDefeated(NamedTuple):
+    name: str
+
+
+class PlayerDefeated(NamedTuple):
+    name: str
+
+
+class Drop(NamedTuple):
+    """An item dropped (``item`` is a fresh entry sharing the DROP_ITEMS definition)"""
+    item_id: str
+    item: Dict
+
+
+class MissingDrop(NamedTuple):
+    """A drop table references an item with no definition"""
+    item_id: str
+
+
+CombatEvent = Union[Hit, Crit, EnemyHit, Dodge, Heal, Fled, FleeFailed,
+                    EnemyDefeated, PlayerDefeated, Drop, MissingDrop]
+
+
+class CombatEngine:
+    """Resolve one fight between a player snapshot and an enemy.
+
+    ``enemy`` may be an ``Enemy`` or a ``ScaledEnemy`` record; only its
+    name, hp, attack, defense and is_boss are read. HP for both sides lives
+    on the engine (``player_hp`` / ``enemy_hp``) so callers decide when to
+    copy it back onto their own models. Every action is a generator of
+    events; nothing happens until it is iterated.
+    """
+
+    def __init__(self, stats: PlayerSnapshot, enemy, player_hp: Optional[int] = None,
+                 rng: Optional[random.Random] = None, loot_rng: Optional[random.Random] = None):
+        # Default to the module RNG; drops use ``loot_rng`` when given
+        self.rng = rng if rng is not None else random
+        self.loot_rng = loot_rng if loot_rng is not None else self.rng
+        self.stats = stats
+        self.enemy = enemy
+        self.enemy_hp = enemy.hp
+        self.player_hp = stats.max_hp if player_hp is None else player_hp
+
+        # Player attack distribution (DEX drives crits, precision and high rolls)
+        self.max_damage = stats.max_attack
+        min_damage = max(MIN_DAMAGE_ALWAYS, int(self.max_damage * MIN_DAMAGE_RATIO))
+        self.crit_chance = min(CRIT_CHANCE_MAX, stats.dex / CRIT_DEX_DIVISOR)
+        self.dex_bonus = stats.dex / DEX_DAMAGE_DIVISOR
+        precision_bonus = (stats.dex // DEX_PRECISION_INTERVAL) * DEX_PRECISION_BONUS
+        self.floor_damage = min(int(min_damage * (1 + precision_bonus)), self.max_damage)
+        upper_range = int((self.max_damage - self.floor_damage) * DEX_UPPER_RANGE_RATIO)
+        self.upper_low = max(self.max_damage - upper_range, self.floor_damage)
+
+        # Enemy attack distribution and the player's dodge chance against it
+        self.enemy_attack_low = max(MIN_DAMAGE_ALWAYS, enemy.attack + ENEMY_ATTACK_MIN_VARIANCE)
+        self.enemy_attack_high = enemy.attack + ENEMY_ATTACK_MAX_VARIANCE
+        accuracy_floor = BOSS_ACCURACY_FLOOR if getattr(enemy, 'is_boss', False) else 0.0
+        self.dodge_chance = min(min(DODGE_CAP, stats.agl / DODGE_CALCULATION_DIVISOR), 1.0 - accuracy_floor)
+
+    @property
+    def enemy_alive(self) -> bool:
+        return self.enemy_hp > 0
+
+    @property
+    def player_alive(self) -> bool:
+        return self.player_hp > 0
+
+    @property
+    def finished(self) -> bool:
+        return not (self.enemy_alive and self.player_alive)
+
+    def roll_player_damage(self):
+        """Roll one raw player attack; returns (damage, is_crit)"""
+        rng = self.rng
+        if rng.random() < self.crit_chance:
+            return int(self.max_damage * rng.uniform(CRIT_MULTIPLIER_MIN, CRIT_MULTIPLIER_MAX)), True
+        if rng.random() < self.dex_bonus:
+            return rng.randint(self.upper_low, self.max_damage), False
+        return rng.randint(self.floor_damage, self.max_damage), False
+
+    def enemy_turn(self) -> Iterator[CombatEvent]:
+        """The enemy's counter-attack, shared by every player action"""
+        damage = self.rng.randint(self.enemy_attack_low, self.enemy_attack_high)
+        if self.rng.random() < self.dodge_chance:
+            yield Dodge(damage)
+            return
+        taken = max(MIN_DAMAGE_ALWAYS, damage - self.stats.defense)
+        self.player_hp = max(0, self.player_hp - taken)
+        yield EnemyHit(taken)
+        if not self.player_alive:
+            yield PlayerDefeated(self.enemy.name)
+
+    def attack(self) -> Iterator[CombatEvent]:
+        """Player attacks; the enemy counters if it survives"""
+        damage, is_crit = self.roll_player_damage()
+        dealt = max(1, damage - self.enemy.defense)
+        self.enemy_hp = max(0, self.enemy_hp - dealt)
+        yield Crit(damage, dealt) if is_crit else Hit(damage, dealt)
+        if not self.enemy_alive:
+            yield EnemyDefeated(self.enemy.name)
+            return
+        yield from self.enemy_turn()
+
+    def use_potions(self, heal_amount: int, quantity: int = 1, item_name: str = '') -> Iterator[CombatEvent]:
+        """Drink up to ``quantity`` potions, stopping at full HP, then the enemy counters"""
+        healed = 0
+        used = 0
+        for _ in range(quantity):
+            if self.player_hp >= self.stats.max_hp:
+                break
+            amount = min(heal_amount, self.stats.max_hp - self.player_hp)
+            self.player_hp += amount
+            healed += amount
+            used += 1
+        yield Heal(healed, used, quantity, item_name)
+        yield from self.enemy_turn()
+
+    def flee(self) -> Iterator[CombatEvent]:
+        """Try to run; a failed attempt gives the enemy a free attack"""
+        if self.rng.random() > RUN_CHANCE:
+            yield Fled()
+            return
+        yield FleeFailed(1.0 - RUN_CHANCE)
+        yield from self.enemy_turn()
+
+    def roll_loot(self, table: LootTable) -> Iterator[CombatEvent]:
+        """Roll a compiled loot table once"""
+        for item_id in table.roll(self.loot_rng):
+            if item_id not in DROP_ITEMS:
+                yield MissingDrop(item_id)
+                continue
+            yield Drop(item_id, new_item(f'drops:{item_id}'))
+
+    def roll_drops(self, drops: Sequence[Dict], night: bool = False) -> Iterator[CombatEvent]:
+        """Roll a raw drop list once (night raises every chance by 50%)"""
+        return self.roll_loot(LootTable.for_drops(drops, night))
+
+    def auto_fight(self, max_rounds: Optional[int] = None) -> Iterator[CombatEvent]:
+        """Attack every round until someone falls (or ``max_rounds`` pass)"""
+        rounds = 0
+        while not self.finished and (max_rounds is None or rounds < max_rounds):
+            rounds += 1
+            yield from self.attack()
@@ -0,0 +1,88 @@
+"""Compiled loot tables
+
+Every drop in an enemy's list is an independent Bernoulli trial. Rolling
+them one by one costs a random draw per entry, and every enemy carries the
+full talisman list on top of its own drops. A ``LootTable`` instead
+precomputes the cumulative hazard H_k = -sum(log(1 - p_i), i <= k) over the
+non-guaranteed entries. An Exp(1) draw then jumps straight to the next entry
+that drops: the first success is the first k with H_k > E, and after a
+success at j the search restarts from H_j with a fresh draw. A kill costs
+one draw plus one per item actually dropped, and the result has exactly the
+same distribution as the per-entry loop.
+
+Tables for every BASE_ENEMIES entry (day and night) are compiled at import.
+"""
+import math
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .enemies import BASE_ENEMIES
+
+NIGHT_DROP_RATE_BUFF = 1.50
+
+
+class LootTable:
+    """Independent drop chances compiled for geometric-skip sampling"""
+
+    __slots__ = ('guaranteed', 'items', 'hazard')
+
+    def __init__(self, drops: Sequence[Dict], drop_multiplier: float = 1.0):
+        guaranteed = []
+        items = []
+        hazard = []
+        total = 0.0
+        for drop in drops:
+            # Same adjustment as the per-entry loop: multiplicative, capped at 100%
+            chance = min(1.0, drop['chance'] * drop_multiplier)
+            if chance >= 1.0:
+                guaranteed.append(drop['item'])
+            elif chance > 0.0:
+                total -= math.log1p(-chance)
+                items.append(drop['item'])
+                hazard.append(total)
+        self.guaranteed: Tuple[str, ...] = tuple(guaranteed)
+        self.items: Tuple[str, ...] = tuple(items)
+        self.hazard: Tuple[float, ...] = tuple(hazard)
+
+    @classmethod
+    def for_drops(cls, drops: Sequence[Dict], night: bool = False) -> 'LootTable':
+        return cls(drops, NIGHT_DROP_RATE_BUFF if night else 1.0)
+
+    def roll(self, rng) -> List[str]:
+        """Item ids dropped by one kill (guaranteed drops first)"""
+        dropped = list(self.guaranteed)
+        hazard = self.hazard
+        count = len(hazard)
+        if not count:
+            return dropped
+        rand = rng.random
+        log = math.log
+        start = 0.0
+        index = 0
+        while True:
+            index = bisect_right(hazard, start - log(1.0 - rand()), index)
+            if index >= count:
+                return dropped
+            dropped.append(self.items[index])
+            start = hazard[index]
+            index += 1
+
+
+# Compiled tables for BASE_ENEMIES, keyed by (enemy name, night)
+LOOT_TABLES: Dict[Tuple[str, bool], LootTable] = {}
+
+
+def rebuild_loot_tables() -> None:
+    """Recompile LOOT_TABLES (call after editing BASE_ENEMIES at runtime)"""
+    LOOT_TABLES.clear()
+    for enemy in BASE_ENEMIES:
+        for night in (False, True):
+            LOOT_TABLES[(enemy['name'], night)] = LootTable.for_drops(enemy['drops'], night)
+
+
+def get_loot_table(enemy_name: str, night: bool = False) -> Optional[LootTable]:
+    """Precompiled table for a BASE_ENEMIES entry, or None for unknown names"""
+    return LOOT_TABLES.get((enemy_name, bool(night)))
+
+
+rebuild_loot_tables()
@@ -0,0 +1,138 @@
+"""Multi-core balance sweeps over the zone x level x night matrix
+
+Every (zone, player level, night) cell is split into fixed-size chunks and
+each chunk gets its own seed derived from the base seed, so a sweep gives the
+same report no matter how many worker processes run it.
+"""
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..config import DEV_FLAGS
+from ..systems.rng import derive_seed
+from .simulation import (
+    SIMULATION_ZONES, PlayerSnapshot, SimulationResult,
+    get_zone, simulate_encounters, zone_enemy_pool
+)
+
+# Encounters per worker task; cells larger than this are split
+SWEEP_CHUNK_SIZE = 50000
+
+
+class SweepReport:
+    """Per-cell sweep results plus their merged total"""
+
+    def __init__(self, seed):
+        self.seed = seed
+        self.cells: Dict[Tuple[str, int, bool], SimulationResult] = {}
+        self.total = SimulationResult()
+
+    def add(self, cell: Tuple[str, int, bool], result: SimulationResult) -> None:
+        if cell not in self.cells:
+            self.cells[cell] = SimulationResult()
+        self.cells[cell].merge(result)
+        self.total.merge(result)
+
+    def rows(self) -> List[Dict]:
+        """Flat per-cell summary rows, sorted by zone order then level"""
+        zone_order = {zone[0]: i for i, zone in enumerate(SIMULATION_ZONES)}
+        rows = []
+        for (zone_name, level, night), result in self.cells.items():
+            rows.append({
+                'zone': zone_name,
+                'level': level,
+                'night': night,
+                'encounters': result.encounters,
+                'kills': result.kills,
+                'win_rate': result.win_rate,
+                'gold_per_kill': result.gold_per_kill,
+                'exp_per_kill': result.exp_per_kill,
+                'drops_per_kill': sum(result.loot.values()) / result.kills if result.kills else 0.0
+            })
+        rows.sort(key=lambda r: (zone_order.get(r['zone'], len(zone_order)), r['level'], r['night']))
+        return rows
+
+    def to_dict(self) -> Dict:
+        return {
+            'seed': self.seed,
+            'cells': [
+                {'zone': zone_name, 'level': level, 'night': night, **result.to_dict()}
+                for (zone_name, level, night), result in self.cells.items()
+            ],
+            'total': self.total.to_dict()
+        }
+
+
+def _run_chunk(task):
+    """Worker entry point: resolve one chunk of one cell"""
+    cell, encounters, seed, player_stats = task
+    zone_name, level, night = cell
+    _, _, multiplier, tiers = get_zone(zone_name)
+    rng = random.Random(seed)
+    result = simulate_encounters(zone_enemy_pool(tiers), encounters, level, multiplier,
+                                 night, player_stats, rng)
+    return cell, result
+
+
+def build_sweep_tasks(cells: Iterable[Tuple[str, int, bool]], encounters_per_cell: int, seed,
+                      player_stats: Optional[PlayerSnapshot] = None,
+                      chunk_size: int = SWEEP_CHUNK_SIZE) -> List[Tuple]:
+    """Split cells into seeded, independent worker tasks"""
+    tasks = []
+    for cell in cells:
+        remaining = encounters_per_cell
+        chunk_index = 0
+        while remaining > 0:
+            size = min(chunk_size, remaining)
+            tasks.append((cell, size, derive_seed(seed, *cell, chunk_index), player_stats))
+            remaining -= size
+            chunk_index += 1
+    return tasks
+
+
+def run_balance_sweep(encounters_per_cell: int, zones: Optional[Sequence[str]] = None,
+                      player_levels: Optional[Sequence[int]] = None,
+                      night_modes: Sequence[bool] = (False, True),
+                      player_stats: Optional[PlayerSnapshot] = None,
+                      seed=None, workers: Optional[int] = None,
+                      chunk_size: int = SWEEP_CHUNK_SIZE) -> SweepReport:
+    """Run the zone x player-level x night-mode matrix across processes.
+
+    Args:
+        encounters_per_cell: Encounters simulated for every matrix cell
+        zones: Zone names from SIMULATION_ZONES (default: all)
+        player_levels: Levels to sweep (default: each zone's own level)
+        night_modes: Night flags to sweep
+        player_stats: Optional snapshot to resolve fights instead of auto-kills
+        seed: Base seed (default: DEV_FLAGS['seed'], else a fresh random one)
+        workers: Process count (default: CPU count; 1 runs in-process)
+        chunk_size: Maximum encounters per worker task
+
+    Returns:
+        SweepReport whose ``seed`` reproduces the run
+    """
+    if seed is None:
+        seed = DEV_FLAGS['seed']
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+
+    zone_names = list(zones) if zones else [zone[0] for zone in SIMULATION_ZONES]
+    cells = []
+    for zone_name in zone_names:
+        zone_level = get_zone(zone_name)[1]
+        for level in (player_levels or [zone_level]):
+            for night in night_modes:
+                cells.append((zone_name, level, bool(night)))
+
+    tasks = build_sweep_tasks(cells, encounters_per_cell, seed, player_stats, chunk_size)
+    report = SweepReport(seed)
+
+    if workers == 1 or len(tasks) <= 1:
+        for task in tasks:
+            report.add(*_run_chunk(task))
+        return report
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for cell, result in executor.map(_run_chunk, tasks):
+            report.add(cell, result)
+    return report
@@ -1,38 +1,55 @@
 """Combat system implementation"""
-import random
+from functools import lru_cache
+from typing import Any, Dict, NamedTuple, Tuple
 from ..config import DEV_FLAGS
 from ..constants import (
-    DODGE_CAP, DODGE_CALCULATION_DIVISOR, BOSS_ACCURACY_FLOOR, RUN_CHANCE,
-    ENEMY_ATTACK_MIN_VARIANCE, ENEMY_ATTACK_MAX_VARIANCE,
-    MIN_DAMAGE_RATIO, MIN_DAMAGE_ALWAYS,
-    CRIT_CHANCE_MAX, CRIT_DEX_DIVISOR,
-    CRIT_MULTIPLIER_MIN, CRIT_MULTIPLIER_MAX,
-    DEX_PRECISION_INTERVAL, DEX_PRECISION_BONUS,
-    DEX_DAMAGE_DIVISOR, DEX_UPPER_RANGE_RATIO,
+    MIN_DAMAGE_ALWAYS,
     GUARANTEED_FLEE_GOLD_COST,
     KILL_STREAK_NOTIFICATION_INTERVAL,
     NOTIFICATION_DURATION_NORMAL, NOTIFICATION_DURATION_LONG,
     ENEMY_SCALE_BASE, ENEMY_SCALE_MULTIPLIER, ENEMY_SCALE_DECAY
 )
 from ..ui import Colors, colorize, clear_screen, show_notification, health_bar
-from ..items import DROP_ITEMS, add_item_to_inventory, remove_item_from_inventory, get_item_quantity, format_item_name
+from ..items import add_item_to_inventory, apply_inventory_changes, get_item_quantity, format_item_name
 from ..achievements.system import check_achievements
-from ..game.stats import allocate_stats
+from ..systems.time_system import is_night_at
+from ..systems.rng import rng_stream
+from .enemies import BASE_ENEMIES
+from .engine import (
+    CombatEngine, PlayerSnapshot,
+    Hit, Crit, EnemyHit, Dodge, Heal, Fled, FleeFailed,
+    PlayerDefeated, Drop, MissingDrop
+)
+from .loot import NIGHT_DROP_RATE_BUFF, LootTable, rebuild_loot_tables
 
 NIGHT_MONSTER_HP_BUFF = 1.30
 NIGHT_MONSTER_ATTACK_BUFF = 1.30
-NIGHT_DROP_RATE_BUFF = 1.50
+
+# Bounded size of the scaled-enemy table (Tepes Lair multipliers are unbounded)
+SCALED_ENEMY_CACHE_SIZE = 4096
+
+
+class ScaledEnemy(NamedTuple):
+    """Immutable, shareable stats for one enemy at one scaling point"""
+    name: str
+    hp: int
+    attack: int
+    defense: int
+    exp: int
+    gold: int
+    drops: Tuple[Dict[str, Any], ...]
+    tier: int
+    is_boss: bool
+    is_night: bool
 
 
 def is_nighttime(player):
     """Check if it's currently nighttime based on player's world clock"""
-    from ..systems.time_system import GameClock
-    clock = GameClock(player.world_anchor_timestamp)
-    return clock.is_night()
+    return is_night_at(player.world_anchor_timestamp)
 
 
-def scale_enemy(enemy_template, player_level, location_multiplier=1.0, player=None):
-    """Scale enemy stats based on player level and location"""
+def _build_scaled_enemy(enemy_template, player_level, location_multiplier, night):
+    """Compute one scaled enemy record (uncached)"""
     level_diff = max(0, player_level - enemy_template['tier'])
     base_scaler = ENEMY_SCALE_BASE + (1 - (ENEMY_SCALE_DECAY ** level_diff)) * ENEMY_SCALE_MULTIPLIER
     scale_factor = base_scaler * location_multiplier
@@ -43,31 +60,259 @@ def scale_enemy(enemy_template, player_level, location_multiplier=1.0, player=No
     exp = int(enemy_template['base_exp'] * scale_factor)
     gold = int(enemy_template['base_gold'] * scale_factor)
     
-    is_night = False
-    if player and hasattr(player, 'world_anchor_timestamp'):
-        is_night = is_nighttime(player)
-        if is_night:
-            hp = int(hp * NIGHT_MONSTER_HP_BUFF)
-            attack = int(attack * NIGHT_MONSTER_ATTACK_BUFF)
+    if night:
+        hp = int(hp * NIGHT_MONSTER_HP_BUFF)
+        attack = int(attack * NIGHT_MONSTER_ATTACK_BUFF)
+    
+    return ScaledEnemy(
+        name=enemy_template['name'],
+        hp=hp,
+        attack=attack,
+        defense=defense,
+        exp=exp,
+        gold=gold,
+        drops=tuple(enemy_template['drops']),
+        tier=enemy_template.get('tier', 1),
+        is_boss=enemy_template.get('is_boss', False),
+        is_night=night
+    )
+
+
+_TEMPLATES_BY_NAME = {template['name']: template for template in BASE_ENEMIES}
+
+
+@lru_cache(maxsize=SCALED_ENEMY_CACHE_SIZE)
+def _cached_scaled_enemy(template_name, player_level, location_multiplier, night):
+    return _build_scaled_enemy(_TEMPLATES_BY_NAME[template_name], player_level, location_multiplier, night)
+
+
+def get_scaled_enemy(enemy_template, player_level, location_multiplier=1.0, night=False):
+    """Look up the scaled stats for a BASE_ENEMIES template.
+
+    Records are built lazily and kept in a bounded LRU table keyed by
+    (template, player_level, location_multiplier, night), so repeat spawns
+    are O(1). Templates that are not in BASE_ENEMIES are scaled uncached.
+    """
+    night = bool(night)
+    if _TEMPLATES_BY_NAME.get(enemy_template['name']) is enemy_template:
+        return _cached_scaled_enemy(enemy_template['name'], player_level, location_multiplier, night)
+    return _build_scaled_enemy(enemy_template, player_level, location_multiplier, night)
+
+
+def clear_scaled_enemy_cache():
+    """Drop cached records (call after editing BASE_ENEMIES at runtime)"""
+    _TEMPLATES_BY_NAME.clear()
+    _TEMPLATES_BY_NAME.update({template['name']: template for template in BASE_ENEMIES})
+    _cached_scaled_enemy.cache_clear()
+    rebuild_loot_tables()
+
+
+def spawn_scaled_enemy(enemy_template, player_level, location_multiplier=1.0, player=None):
+    """Scaled record for a live spawn, with night taken from the player's clock"""
+    night = bool(player and hasattr(player, 'world_anchor_timestamp') and is_nighttime(player))
+    return get_scaled_enemy(enemy_template, player_level, location_multiplier, night)
+
+
+def scale_enemy(enemy_template, player_level, location_multiplier=1.0, player=None, night=None):
+    """Scale enemy stats based on player level and location (dict form).
+
+    Night buffs follow the player's world clock unless ``night`` is given
+    explicitly. Hot paths should use ``get_scaled_enemy`` instead.
+    """
+    if night is None:
+        record = spawn_scaled_enemy(enemy_template, player_level, location_multiplier, player)
+    else:
+        record = get_scaled_enemy(enemy_template, player_level, location_multiplier, night)
+    data = record._asdict()
+    data['drops'] = list(record.drops)
+    return data
+
+
+def _battle_continues():
+    clear_screen()
+    print(colorize("=" * 60, Colors.CYAN))
+    print(colorize("⚔️  BATTLE CONTINUES! ⚔️", Colors.BRIGHT_RED + Colors.BOLD))
+    print(colorize("=" * 60, Colors.CYAN))
+
+
+def _render_event(event, player, enemy):
+    """Print one combat engine event"""
+    if isinstance(event, Crit):
+        crit_msg = " CRITICAL HIT!"
+        print(f"\n{colorize('⚔️', Colors.BRIGHT_YELLOW)} {colorize('You attack', Colors.CYAN)} {colorize(enemy.name, Colors.BRIGHT_RED)} {colorize('for', Colors.WHITE)} {colorize(str(event.damage), Colors.BRIGHT_YELLOW + Colors.BOLD)} {colorize('damage!', Colors.CYAN)}{colorize(crit_msg, Colors.BRIGHT_YELLOW + Colors.BOLD)}")
+    elif isinstance(event, Hit):
+        print(f"\n{colorize('⚔️', Colors.BRIGHT_RED)} {colorize('You attack', Colors.CYAN)} {colorize(enemy.name, Colors.BRIGHT_RED)} {colorize('for', Colors.WHITE)} {colorize(str(event.damage), Colors.BRIGHT_RED + Colors.BOLD)} {colorize('damage!', Colors.CYAN)}")
+    elif isinstance(event, Dodge):
+        attack_msg = "'s attack!"
+        print(f"\n{colorize('✨', Colors.BRIGHT_CYAN)} {colorize('You dodged', Colors.BRIGHT_GREEN)} {colorize(enemy.name, Colors.BRIGHT_RED)} {colorize(attack_msg, Colors.WHITE)}")
+    elif isinstance(event, EnemyHit):
+        print(f"\n{colorize('💥', Colors.BRIGHT_RED)} {colorize(enemy.name, Colors.BRIGHT_RED)} {colorize('attacks you for', Colors.WHITE)} {colorize(str(event.damage), Colors.BRIGHT_RED + Colors.BOLD)} {colorize('damage!', Colors.WHITE)}")
+    elif isinstance(event, Heal):
+        if event.amount > 0:
+            if event.used > 1:
+                print(f"\n{colorize('🧪', Colors.BRIGHT_GREEN)} {colorize(f'You used {event.used}x', Colors.WHITE)} {colorize(event.item_name, Colors.BRIGHT_CYAN)} {colorize('and healed', Colors.WHITE)} {colorize(str(event.amount), Colors.BRIGHT_GREEN + Colors.BOLD)} {colorize('HP!', Colors.WHITE)}")
+            else:
+                print(f"\n{colorize('🧪', Colors.BRIGHT_GREEN)} {colorize('You used', Colors.WHITE)} {colorize(event.item_name, Colors.BRIGHT_CYAN)} {colorize('and healed', Colors.WHITE)} {colorize(str(event.amount), Colors.BRIGHT_GREEN + Colors.BOLD)} {colorize('HP!', Colors.WHITE)}")
+            if event.used < event.requested:
+                print(f"{colorize('ℹ️', Colors.BRIGHT_CYAN)} {colorize('(Capped at max HP - no overheal)', Colors.CYAN)}")
+        else:
+            print(f"\n{colorize('ℹ️', Colors.BRIGHT_CYAN)} {colorize('Already at full HP!', Colors.CYAN)}")
+    elif isinstance(event, Fled):
+        print(f"\n{colorize('🏃', Colors.BRIGHT_BLUE)} {colorize('You successfully ran away!', Colors.BRIGHT_GREEN)}")
+    elif isinstance(event, FleeFailed):
+        escape_msg = "You couldn't escape!"
+        print(f"\n{colorize('❌', Colors.BRIGHT_RED)} {colorize(escape_msg, Colors.YELLOW)}")
+    elif isinstance(event, MissingDrop):
+        import sys
+        print(f"\nWARNING: Missing item definition '{event.item_id}' - skipping drop", file=sys.stderr)
+
+
+def _play(engine, events, player, enemy):
+    """Render an engine action and copy the resulting HP back onto the models.
+
+    Returns True if the player was defeated.
+    """
+    defeated = False
+    for event in events:
+        _render_event(event, player, enemy)
+        if isinstance(event, PlayerDefeated):
+            defeated = True
+    player.hp = engine.player_hp
+    enemy.hp = engine.enemy_hp
+    return defeated
+
+
+def _show_victory_status(player, enemy):
+    clear_screen()
+    print(colorize("=" * 60, Colors.BRIGHT_GREEN))
+    print(colorize("         ⚔️  VICTORY! ⚔️", Colors.BRIGHT_GREEN + Colors.BOLD))
+    print(colorize("=" * 60, Colors.BRIGHT_GREEN))
+    
+    # Show defeated enemy
+    print("\n" + colorize("DEFEATED ENEMY:", Colors.BRIGHT_RED + Colors.BOLD))
+    print("-" * 60)
+    print(colorize(f"{enemy.name}", Colors.BRIGHT_RED + Colors.BOLD))
+    print(f"{colorize('HP:', Colors.WHITE)} {health_bar(0, enemy.max_hp)}")
     
-    return {
-        'name': enemy_template['name'],
-        'hp': hp,
-        'attack': attack,
-        'defense': defense,
-        'exp': exp,
-        'gold': gold,
-        'drops': enemy_template['drops'],
-        'tier': enemy_template.get('tier', 1),
-        'is_boss': enemy_template.get('is_boss', False),
-        'is_night': is_night
-    }
+    # Show player state
+    print("\n" + colorize("YOUR STATUS:", Colors.BRIGHT_CYAN + Colors.BOLD))
+    print("-" * 60)
+    print(colorize(f"{player.name} (Level {player.level})", Colors.BRIGHT_CYAN))
+    print(f"{colorize('HP:', Colors.WHITE)} {health_bar(player.hp, player.max_hp)}")
+    print(f"{colorize('Experience:', Colors.CYAN)} {colorize(str(player.exp), Colors.WHITE)}/{colorize(str(player.exp_to_next), Colors.WHITE)}")
+    print(f"{colorize('Gold:', Colors.BRIGHT_YELLOW)} {colorize(str(player.gold), Colors.BRIGHT_YELLOW)}")
+
+
+def _award_victory(player, enemy, engine):
+    """Victory screen: rewards, drops, streaks and level-ups"""
+    enemy.hp = 0
+    _show_victory_status(player, enemy)
+    
+    # Award rewards
+    print("\n" + colorize("REWARDS:", Colors.BRIGHT_YELLOW + Colors.BOLD))
+    print("-" * 60)
+    
+    # Store old values for display
+    old_exp = player.exp
+    old_gold = player.gold
+    
+    player.exp += enemy.exp_reward
+    player.gold += enemy.gold_reward
+    
+    # Check wealth achievements after gold gain
+    check_achievements(player, 'wealth')
+    
+    print(f"{colorize('💰', Colors.BRIGHT_YELLOW)} {colorize('Experience:', Colors.WHITE)} +{colorize(str(enemy.exp_reward), Colors.BRIGHT_GREEN)} ({colorize(str(old_exp), Colors.WHITE)} → {colorize(str(player.exp), Colors.BRIGHT_GREEN)})")
+    print(f"{colorize('💰', Colors.BRIGHT_YELLOW)} {colorize('Gold:', Colors.WHITE)} +{colorize(str(enemy.gold_reward), Colors.BRIGHT_YELLOW)} ({colorize(str(old_gold), Colors.WHITE)} → {colorize(str(player.gold), Colors.BRIGHT_YELLOW)})")
+    
+    # Handle drops with rarity display (OSRS-style)
+    drops_received = []
+    loot_table = getattr(enemy, 'loot_table', None)
+    if loot_table is None:
+        loot_table = LootTable.for_drops(enemy.drops or [], getattr(enemy, 'is_night', False))
+    for event in engine.roll_loot(loot_table):
+        if not isinstance(event, Drop):
+            _render_event(event, player, enemy)
+            continue
+        add_item_to_inventory(player.inventory, event.item)
+        drops_received.append(event.item)
+        
+        if event.item.get('type') == 'talisman':
+            check_achievements(player, 'talisman_found')
+            if event.item.get('name') == 'Talisman of the Hacker':
+                check_achievements(player, 'talisman_hacker')
+            check_achievements(player, 'talisman_count')
+    
+    if drops_received:
+        print(f"\n{colorize('📦', Colors.BRIGHT_CYAN)} {colorize('LOOT OBTAINED:', Colors.BRIGHT_CYAN + Colors.BOLD)}")
+        print("-" * 60)
+        for drop_item in drops_received:
+            formatted_name = format_item_name(drop_item)
+            print(f"  {colorize('•', Colors.BRIGHT_CYAN)} {formatted_name}")
+    
+    player.kill_streak += 1
+    player.total_kills += 1
+    
+    if player.kill_streak % KILL_STREAK_NOTIFICATION_INTERVAL == 0 and player.kill_streak > 0:
+        show_notification(f"Kill Streak: {player.kill_streak}!", Colors.BRIGHT_RED, NOTIFICATION_DURATION_NORMAL)
+    
+    check_achievements(player, 'kills')
+    check_achievements(player, 'streak')
+    
+    # Check for level up
+    while player.exp >= player.exp_to_next:
+        if player.level_up():
+            from ..game.stats import allocate_stats  # Import here to avoid circular dependency
+            check_achievements(player, 'level')
+            allocate_stats(player)
+            # Refresh display after level up
+            _show_victory_status(player, enemy)
+    
+    print("\n" + colorize("=" * 60, Colors.BRIGHT_GREEN))
+    input(f"\n{colorize('Press Enter to continue...', Colors.WHITE)}")
+    return True
+
+
+def _choose_potion_quantity(healing_item, item_qty):
+    """Quantity prompt for stacked potions; returns None on cancel"""
+    clear_screen()
+    print(colorize("=" * 60, Colors.CYAN))
+    print(colorize("🧪  USE POTION  🧪", Colors.BRIGHT_GREEN + Colors.BOLD))
+    print(colorize("=" * 60, Colors.CYAN))
+    formatted_name = format_item_name(healing_item)
+    print(f"\n{colorize('Item:', Colors.WHITE)} {formatted_name}")
+    print(f"{colorize('Heal Amount:', Colors.WHITE)} {colorize(str(healing_item['heal']), Colors.BRIGHT_GREEN)} HP")
+    print(f"{colorize('Quantity Available:', Colors.WHITE)} {colorize(str(item_qty), Colors.BRIGHT_YELLOW)}")
+    print(f"\n{colorize('How many to use?', Colors.BRIGHT_CYAN)}")
+    print(f"  {colorize('1.', Colors.WHITE)} Use 1")
+    if item_qty >= 5:
+        print(f"  {colorize('2.', Colors.WHITE)} Use 5")
+    if item_qty >= 10:
+        print(f"  {colorize('3.', Colors.WHITE)} Use 10")
+    print(f"  {colorize('4.', Colors.WHITE)} Use All ({item_qty})")
+    print(f"  {colorize('5.', Colors.WHITE)} Cancel")
+    print(colorize("=" * 60, Colors.CYAN))
+    
+    qty_choice = input(f"\n{colorize('Choice:', Colors.BRIGHT_CYAN)} ").strip()
+    if qty_choice == '2' and item_qty >= 5:
+        return 5
+    if qty_choice == '3' and item_qty >= 10:
+        return 10
+    if qty_choice == '4':
+        return item_qty
+    if qty_choice == '5':
+        return None
+    return 1
 
 
 def combat(player, enemy):
     # Reset guaranteed flee flag at combat start
     player._guaranteed_flee_used = False
     
+    # Equipment can't change mid-fight, so one snapshot covers the whole battle
+    engine = CombatEngine(PlayerSnapshot.from_player(player), enemy, player_hp=player.hp,
+                          rng=rng_stream('combat'), loot_rng=rng_stream('loot'))
+    
     clear_screen()
     print(colorize("=" * 60, Colors.BRIGHT_RED))
     
@@ -87,7 +332,7 @@ def combat(player, enemy):
         print(colorize(f"⚔️  {player.name.upper()}  ⚔️", Colors.BRIGHT_CYAN + Colors.BOLD))
         print(colorize(f"Level {player.level}", Colors.CYAN))
         print(f"{colorize('HP:', Colors.BRIGHT_RED + Colors.BOLD)} {health_bar(player.hp, player.max_hp)}")
-        print(f"{colorize('Attack:', Colors.YELLOW)} {colorize(str(player.get_max_attack_power()), Colors.BRIGHT_YELLOW)} | {colorize('Defense:', Colors.BLUE)} {colorize(str(player.get_defense_power()), Colors.BRIGHT_BLUE)}")
+        print(f"{colorize('Attack:', Colors.YELLOW)} {colorize(str(engine.stats.max_attack), Colors.BRIGHT_YELLOW)} | {colorize('Defense:', Colors.BLUE)} {colorize(str(engine.stats.defense), Colors.BRIGHT_BLUE)}")
         
         print("\n" + colorize("─" * 60, Colors.RED))
         print(colorize(f"👹  {enemy.name.upper()}  👹", Colors.BRIGHT_RED + Colors.BOLD))
@@ -100,199 +345,25 @@ def combat(player, enemy):
         print(f"  {colorize('2.', Colors.BRIGHT_YELLOW)} Use Potion")
         print(f"  {colorize('3.', Colors.BRIGHT_BLUE)} Try to Run")
         # Guaranteed Flee (safety valve): once per combat, costs streak reset
-        if not hasattr(player, '_guaranteed_flee_used'):
-            player._guaranteed_flee_used = False
         if not player._guaranteed_flee_used:
             print(f"  {colorize('4.', Colors.BRIGHT_RED)} Guaranteed Flee {colorize('(Resets kill streak, costs 5% gold)', Colors.YELLOW)}")
         
         choice = input(f"\n{colorize('What do you do?', Colors.BRIGHT_CYAN)} ").strip()
         
         if choice == '1':
-            # Calculate damage based on STR and DEX
-            max_damage = player.get_max_attack_power()
-            min_damage = max(MIN_DAMAGE_ALWAYS, int(max_damage * MIN_DAMAGE_RATIO))  # Minimum damage is half of max
-            
-            # Critical hit chance based on DEX (Kal Online style)
-            crit_chance = min(CRIT_CHANCE_MAX, player.dex / CRIT_DEX_DIVISOR)  # Max 25% crit at 50 DEX
-            is_crit = random.random() < crit_chance
-            
-            # DEX affects damage distribution: higher DEX = more likely to hit near max
-            dex_bonus = player.dex / DEX_DAMAGE_DIVISOR  # DEX/100 gives % chance for max damage range
-            roll = random.random()
-            
-            # DEX precision floor: every 20 DEX grants +5% minimum damage floor (before defense)
-            # This ensures DEX feels impactful even without crits
-            precision_bonus = (player.dex // DEX_PRECISION_INTERVAL) * DEX_PRECISION_BONUS  # +5% per 20 DEX, max 25% at 100 DEX
-            min_damage_with_precision = int(min_damage * (1 + precision_bonus))
-            
-            if is_crit:
-                # Critical hit: 1.5x-2x damage
-                crit_multiplier = random.uniform(CRIT_MULTIPLIER_MIN, CRIT_MULTIPLIER_MAX)
-                player_damage = int(max_damage * crit_multiplier)
-                crit_msg = " CRITICAL HIT!"
-                print(f"\n{colorize('⚔️', Colors.BRIGHT_YELLOW)} {colorize('You attack', Colors.CYAN)} {colorize(enemy.name, Colors.BRIGHT_RED)} {colorize('for', Colors.WHITE)} {colorize(str(player_damage), Colors.BRIGHT_YELLOW + Colors.BOLD)} {colorize('damage!', Colors.CYAN)}{colorize(crit_msg, Colors.BRIGHT_YELLOW + Colors.BOLD)}")
-            elif roll < dex_bonus:
-                # High DEX: hit in upper 60% of damage range
-                upper_range = int((max_damage - min_damage_with_precision) * DEX_UPPER_RANGE_RATIO)
-                player_damage = random.randint(max(max_damage - upper_range, min_damage_with_precision), max_damage)
-                print(f"\n{colorize('⚔️', Colors.BRIGHT_RED)} {colorize('You attack', Colors.CYAN)} {colorize(enemy.name, Colors.BRIGHT_RED)} {colorize('for', Colors.WHITE)} {colorize(str(player_damage), Colors.BRIGHT_RED + Colors.BOLD)} {colorize('damage!', Colors.CYAN)}")
-            else:
-                # Normal: hit in full damage range (with precision floor)
-                player_damage = random.randint(min_damage_with_precision, max_damage)
-                print(f"\n{colorize('⚔️', Colors.BRIGHT_RED)} {colorize('You attack', Colors.CYAN)} {colorize(enemy.name, Colors.BRIGHT_RED)} {colorize('for', Colors.WHITE)} {colorize(str(player_damage), Colors.BRIGHT_RED + Colors.BOLD)} {colorize('damage!', Colors.CYAN)}")
-            
-            enemy.take_damage(player_damage)
-            
-            if not enemy.is_alive():
-                # Set enemy HP to 0 for display
-                enemy.hp = 0
-                
-                # Show victory screen
-                clear_screen()
-                print(colorize("=" * 60, Colors.BRIGHT_GREEN))
-                print(colorize("         ⚔️  VICTORY! ⚔️", Colors.BRIGHT_GREEN + Colors.BOLD))
-                print(colorize("=" * 60, Colors.BRIGHT_GREEN))
-                
-                # Show defeated enemy
-                print("\n" + colorize("DEFEATED ENEMY:", Colors.BRIGHT_RED + Colors.BOLD))
-                print("-" * 60)
-                print(colorize(f"{enemy.name}", Colors.BRIGHT_RED + Colors.BOLD))
-                print(f"{colorize('HP:', Colors.WHITE)} {health_bar(enemy.hp, enemy.max_hp)}")
-                
-                # Show player state
-                print("\n" + colorize("YOUR STATUS:", Colors.BRIGHT_CYAN + Colors.BOLD))
-                print("-" * 60)
-                print(colorize(f"{player.name} (Level {player.level})", Colors.BRIGHT_CYAN))
-                print(f"{colorize('HP:', Colors.WHITE)} {health_bar(player.hp, player.max_hp)}")
-                print(f"{colorize('Experience:', Colors.CYAN)} {colorize(str(player.exp), Colors.WHITE)}/{colorize(str(player.exp_to_next), Colors.WHITE)}")
-                print(f"{colorize('Gold:', Colors.BRIGHT_YELLOW)} {colorize(str(player.gold), Colors.BRIGHT_YELLOW)}")
-                
-                # Award rewards
-                print("\n" + colorize("REWARDS:", Colors.BRIGHT_YELLOW + Colors.BOLD))
-                print("-" * 60)
-                
-                # Store old values for display
-                old_exp = player.exp
-                old_gold = player.gold
-                
-                player.exp += enemy.exp_reward
-                player.gold += enemy.gold_reward
-                
-                # Check wealth achievements after gold gain
-                check_achievements(player, 'wealth')
-                
-                print(f"{colorize('💰', Colors.BRIGHT_YELLOW)} {colorize('Experience:', Colors.WHITE)} +{colorize(str(enemy.exp_reward), Colors.BRIGHT_GREEN)} ({colorize(str(old_exp), Colors.WHITE)} → {colorize(str(player.exp), Colors.BRIGHT_GREEN)})")
-                print(f"{colorize('💰', Colors.BRIGHT_YELLOW)} {colorize('Gold:', Colors.WHITE)} +{colorize(str(enemy.gold_reward), Colors.BRIGHT_YELLOW)} ({colorize(str(old_gold), Colors.WHITE)} → {colorize(str(player.gold), Colors.BRIGHT_YELLOW)})")
-                
-                # Handle drops with rarity display (OSRS-style)
-                drops_received = []
-                if enemy.drops:
-                    # Calculate night drop bonus
-                    drop_multiplier = NIGHT_DROP_RATE_BUFF if hasattr(enemy, 'is_night') and enemy.is_night else 1.0
-                    
-                    for drop in enemy.drops:
-                        # Apply night bonus to drop rate (multiplicative, capped at 100%)
-                        adjusted_drop_chance = min(1.0, drop['chance'] * drop_multiplier)
-                        
-                        if random.random() < adjusted_drop_chance:
-                            item_id = drop['item']
-                            if item_id not in DROP_ITEMS:
-                                import sys
-                                print(f"\nWARNING: Missing item definition '{item_id}' - skipping drop", file=sys.stderr)
-                                continue
-                            
-                            drop_item = DROP_ITEMS[item_id].copy()
-                            add_item_to_inventory(player.inventory, drop_item)
-                            drops_received.append(drop_item)
-                            
-                            if drop_item.get('type') == 'talisman':
-                                check_achievements(player, 'talisman_found')
-                                if drop_item.get('name') == 'Talisman of the Hacker':
-                                    check_achievements(player, 'talisman_hacker')
-                                check_achievements(player, 'talisman_count')
-                    
-                    if drops_received:
-                        print(f"\n{colorize('📦', Colors.BRIGHT_CYAN)} {colorize('LOOT OBTAINED:', Colors.BRIGHT_CYAN + Colors.BOLD)}")
-                        print("-" * 60)
-                        for drop_item in drops_received:
-                            formatted_name = format_item_name(drop_item)
-                            print(f"  {colorize('•', Colors.BRIGHT_CYAN)} {formatted_name}")
-                
-                player.kill_streak += 1
-                player.total_kills += 1
-                
-                if player.kill_streak % KILL_STREAK_NOTIFICATION_INTERVAL == 0 and player.kill_streak > 0:
-                    show_notification(f"Kill Streak: {player.kill_streak}!", Colors.BRIGHT_RED, NOTIFICATION_DURATION_NORMAL)
-                
-                check_achievements(player, 'kills')
-                check_achievements(player, 'streak')
-                
-                # Check for level up
-                while player.exp >= player.exp_to_next:
-                    if player.level_up():
-                        check_achievements(player, 'level')
-                        allocate_stats(player)
-                        # Refresh display after level up
-                        clear_screen()
-                        print(colorize("=" * 60, Colors.BRIGHT_GREEN))
-                        print(colorize("         ⚔️  VICTORY! ⚔️", Colors.BRIGHT_GREEN + Colors.BOLD))
-                        print(colorize("=" * 60, Colors.BRIGHT_GREEN))
-                        print("\n" + colorize("DEFEATED ENEMY:", Colors.BRIGHT_RED + Colors.BOLD))
-                        print("-" * 60)
-                        print(colorize(f"{enemy.name}", Colors.BRIGHT_RED + Colors.BOLD))
-                        print(f"{colorize('HP:', Colors.WHITE)} {health_bar(0, enemy.max_hp)}")
-                        print("\n" + colorize("YOUR STATUS:", Colors.BRIGHT_CYAN + Colors.BOLD))
-                        print("-" * 60)
-                        print(colorize(f"{player.name} (Level {player.level})", Colors.BRIGHT_CYAN))
-                        print(f"{colorize('HP:', Colors.WHITE)} {health_bar(player.hp, player.max_hp)}")
-                        print(f"{colorize('Experience:', Colors.CYAN)} {colorize(str(player.exp), Colors.WHITE)}/{colorize(str(player.exp_to_next), Colors.WHITE)}")
-                        print(f"{colorize('Gold:', Colors.BRIGHT_YELLOW)} {colorize(str(player.gold), Colors.BRIGHT_YELLOW)}")
-                
-                print("\n" + colorize("=" * 60, Colors.BRIGHT_GREEN))
-                input(f"\n{colorize('Press Enter to continue...', Colors.WHITE)}")
-                return True
-            
-            # Enemy attacks - check for dodge
-            enemy_damage = random.randint(
-                max(MIN_DAMAGE_ALWAYS, enemy.attack + ENEMY_ATTACK_MIN_VARIANCE),
-                enemy.attack + ENEMY_ATTACK_MAX_VARIANCE
-            )
-            # AGL affects dodge chance: higher AGL = better chance to dodge
-            # Reduced cap to 35% (from 50%) to prevent trivialization
-            base_dodge = min(DODGE_CAP, player.agl / DODGE_CALCULATION_DIVISOR)  # Max 35% dodge at 35 AGL
-            
-            # Boss accuracy floor: bosses/elites have at least 10% hit chance
-            is_boss = hasattr(enemy, 'is_boss') and enemy.is_boss
-            accuracy_floor = BOSS_ACCURACY_FLOOR if is_boss else 0.0
-            dodge_chance = min(base_dodge, 1.0 - accuracy_floor)
-            
-            if random.random() < dodge_chance:
-                attack_msg = "'s attack!"
-                print(f"\n{colorize('✨', Colors.BRIGHT_CYAN)} {colorize('You dodged', Colors.BRIGHT_GREEN)} {colorize(enemy.name, Colors.BRIGHT_RED)} {colorize(attack_msg, Colors.WHITE)}")
-            else:
-                damage_taken = player.take_damage(enemy_damage)
-                print(f"\n{colorize('💥', Colors.BRIGHT_RED)} {colorize(enemy.name, Colors.BRIGHT_RED)} {colorize('attacks you for', Colors.WHITE)} {colorize(str(damage_taken), Colors.BRIGHT_RED + Colors.BOLD)} {colorize('damage!', Colors.WHITE)}")
-            
-            if not player.is_alive():
-                # Handle death with enhanced death screen and respawn
-                from ..game.death import handle_combat_death
-                return handle_combat_death(player, enemy.name)
+            defeated = _play(engine, engine.attack(), player, enemy)
+            if not engine.enemy_alive:
+                return _award_victory(player, enemy, engine)
         
         elif choice == '2':
-            # Use healing item - find all consumables
-            healing_items = []
-            for item in player.inventory:
-                if item.get('type') == 'consumable' and 'heal' in item and item.get('heal', 0) > 0:
-                    healing_items.append(item)
+            # Use healing item - the strongest one carried
+            healing_items = player.inventory.healing_items()
             
             if not healing_items:
                 error_msg = "❌ You don't have any healing items!"
                 print(f"\n{colorize(error_msg, Colors.BRIGHT_RED)}")
                 input(f"\n{colorize('Press Enter to continue...', Colors.WHITE)}")
-                clear_screen()
-                print(colorize("=" * 60, Colors.CYAN))
-                print(colorize("⚔️  BATTLE CONTINUES! ⚔️", Colors.BRIGHT_RED + Colors.BOLD))
-                print(colorize("=" * 60, Colors.CYAN))
+                _battle_continues()
                 continue
             
             # If only one type of healing item or quantity is 1, use it directly
@@ -301,100 +372,21 @@ def combat(player, enemy):
             
             use_qty = 1
             if item_qty > 1:
-                # Show selection menu for quantity
-                clear_screen()
-                print(colorize("=" * 60, Colors.CYAN))
-                print(colorize("🧪  USE POTION  🧪", Colors.BRIGHT_GREEN + Colors.BOLD))
-                print(colorize("=" * 60, Colors.CYAN))
-                formatted_name = format_item_name(healing_item)
-                print(f"\n{colorize('Item:', Colors.WHITE)} {formatted_name}")
-                print(f"{colorize('Heal Amount:', Colors.WHITE)} {colorize(str(healing_item['heal']), Colors.BRIGHT_GREEN)} HP")
-                print(f"{colorize('Quantity Available:', Colors.WHITE)} {colorize(str(item_qty), Colors.BRIGHT_YELLOW)}")
-                print(f"\n{colorize('How many to use?', Colors.BRIGHT_CYAN)}")
-                print(f"  {colorize('1.', Colors.WHITE)} Use 1")
-                if item_qty >= 5:
-                    print(f"  {colorize('2.', Colors.WHITE)} Use 5")
-                if item_qty >= 10:
-                    print(f"  {colorize('3.', Colors.WHITE)} Use 10")
-                print(f"  {colorize('4.', Colors.WHITE)} Use All ({item_qty})")
-                print(f"  {colorize('5.', Colors.WHITE)} Cancel")
-                print(colorize("=" * 60, Colors.CYAN))
-                
-                qty_choice = input(f"\n{colorize('Choice:', Colors.BRIGHT_CYAN)} ").strip()
-                if qty_choice == '1':
-                    use_qty = 1
-                elif qty_choice == '2' and item_qty >= 5:
-                    use_qty = min(5, item_qty)
-                elif qty_choice == '3' and item_qty >= 10:
-                    use_qty = min(10, item_qty)
-                elif qty_choice == '4':
-                    use_qty = item_qty
-                elif qty_choice == '5':
-                    clear_screen()
-                    print(colorize("=" * 60, Colors.CYAN))
-                    print(colorize("⚔️  BATTLE CONTINUES! ⚔️", Colors.BRIGHT_RED + Colors.BOLD))
-                    print(colorize("=" * 60, Colors.CYAN))
+                use_qty = _choose_potion_quantity(healing_item, item_qty)
+                if use_qty is None:
+                    _battle_continues()
                     continue
-                else:
-                    use_qty = 1
-            
-            # Use the potion(s) with anti-overheal logic
-            total_healed = 0
-            items_used = 0
-            
-            for _ in range(use_qty):
-                if player.hp >= player.max_hp:
-                    break  # Already at max HP, stop using items
-                
-                healing_amount = healing_item.get('heal', 0)
-                actual_heal = min(healing_amount, player.max_hp - player.hp)
-                player.heal(actual_heal)
-                total_healed += actual_heal
-                items_used += 1
-                remove_item_from_inventory(player.inventory, healing_item, 1)
-            
-            # Display result
-            if total_healed > 0:
-                if items_used > 1:
-                    print(f"\n{colorize('🧪', Colors.BRIGHT_GREEN)} {colorize(f'You used {items_used}x', Colors.WHITE)} {colorize(healing_item['name'], Colors.BRIGHT_CYAN)} {colorize('and healed', Colors.WHITE)} {colorize(str(total_healed), Colors.BRIGHT_GREEN + Colors.BOLD)} {colorize('HP!', Colors.WHITE)}")
-                else:
-                    print(f"\n{colorize('🧪', Colors.BRIGHT_GREEN)} {colorize('You used', Colors.WHITE)} {colorize(healing_item['name'], Colors.BRIGHT_CYAN)} {colorize('and healed', Colors.WHITE)} {colorize(str(total_healed), Colors.BRIGHT_GREEN + Colors.BOLD)} {colorize('HP!', Colors.WHITE)}")
-                
-                if items_used < use_qty:
-                    print(f"{colorize('ℹ️', Colors.BRIGHT_CYAN)} {colorize('(Capped at max HP - no overheal)', Colors.CYAN)}")
-            else:
-                print(f"\n{colorize('ℹ️', Colors.BRIGHT_CYAN)} {colorize('Already at full HP!', Colors.CYAN)}")
             
-            # Continue combat
-            clear_screen()
-            print(colorize("=" * 60, Colors.CYAN))
-            print(colorize("⚔️  BATTLE CONTINUES! ⚔️", Colors.BRIGHT_RED + Colors.BOLD))
-            print(colorize("=" * 60, Colors.CYAN))
+            # Drink with anti-overheal; only the potions actually used are consumed
+            events = engine.use_potions(healing_item.get('heal', 0), use_qty, healing_item['name'])
+            heal = next(events)
+            if heal.used:
+                apply_inventory_changes(player.inventory, [(healing_item, -heal.used)])
+            _render_event(heal, player, enemy)
             
-            # Enemy attacks - check for dodge
-            enemy_damage = random.randint(
-                max(MIN_DAMAGE_ALWAYS, enemy.attack + ENEMY_ATTACK_MIN_VARIANCE),
-                enemy.attack + ENEMY_ATTACK_MAX_VARIANCE
-            )
-            # Reduced cap to 35% (from 50%) to prevent trivialization
-            base_dodge = min(DODGE_CAP, player.agl / DODGE_CALCULATION_DIVISOR)  # Max 35% dodge at 35 AGL
-            
-            # Boss accuracy floor: bosses/elites have at least 10% hit chance
-            is_boss = hasattr(enemy, 'is_boss') and enemy.is_boss
-            accuracy_floor = BOSS_ACCURACY_FLOOR if is_boss else 0.0
-            dodge_chance = min(base_dodge, 1.0 - accuracy_floor)
-            
-            if random.random() < dodge_chance:
-                attack_msg = "'s attack!"
-                print(f"\n{colorize('✨', Colors.BRIGHT_CYAN)} {colorize('You dodged', Colors.BRIGHT_GREEN)} {colorize(enemy.name, Colors.BRIGHT_RED)} {colorize(attack_msg, Colors.WHITE)}")
-            else:
-                damage_taken = player.take_damage(enemy_damage)
-                print(f"\n{colorize('💥', Colors.BRIGHT_RED)} {colorize(enemy.name, Colors.BRIGHT_RED)} {colorize('attacks you for', Colors.WHITE)} {colorize(str(damage_taken), Colors.BRIGHT_RED + Colors.BOLD)} {colorize('damage!', Colors.WHITE)}")
-            
-            if not player.is_alive():
-                # Handle death with enhanced death screen and respawn
-                from ..game.death import handle_combat_death
-                return handle_combat_death(player, enemy.name)
+            # Enemy counterattacks
+            defeated = _play(engine, events, player, enemy)
+        
         elif choice == '4' and not player._guaranteed_flee_used:
             # Guaranteed Flee safety valve
             player._guaranteed_flee_used = True
@@ -414,51 +406,24 @@ def combat(player, enemy):
             return True
         
         elif choice == '3':
-            run_chance = random.random()
-            if run_chance > RUN_CHANCE:
-                print(f"\n{colorize('🏃', Colors.BRIGHT_BLUE)} {colorize('You successfully ran away!', Colors.BRIGHT_GREEN)}")
+            events = list(engine.flee())
+            if isinstance(events[0], Fled):
+                _render_event(events[0], player, enemy)
                 input(f"\n{colorize('Press Enter to continue...', Colors.WHITE)}")
                 return True
-            else:
-                escape_msg = "You couldn't escape!"
-                print(f"\n{colorize('❌', Colors.BRIGHT_RED)} {colorize(escape_msg, Colors.YELLOW)}")
-                enemy_damage = random.randint(
-                    max(MIN_DAMAGE_ALWAYS, enemy.attack + ENEMY_ATTACK_MIN_VARIANCE),
-                    enemy.attack + ENEMY_ATTACK_MAX_VARIANCE
-                )
-                # Reduced cap to 35% (from 50%) to prevent trivialization
-                base_dodge = min(DODGE_CAP, player.agl / DODGE_CALCULATION_DIVISOR)  # Max 35% dodge at 35 AGL
-                
-                # Boss accuracy floor: bosses/elites have at least 10% hit chance
-                is_boss = hasattr(enemy, 'is_boss') and enemy.is_boss
-                accuracy_floor = BOSS_ACCURACY_FLOOR if is_boss else 0.0
-                dodge_chance = min(base_dodge, 1.0 - accuracy_floor)
-                
-                if random.random() < dodge_chance:
-                    attack_msg = "'s attack!"
-                    print(f"{colorize('✨', Colors.BRIGHT_CYAN)} {colorize('You dodged', Colors.BRIGHT_GREEN)} {colorize(enemy.name, Colors.BRIGHT_RED)} {colorize(attack_msg, Colors.WHITE)}")
-                else:
-                    damage_taken = player.take_damage(enemy_damage)
-                    print(f"{colorize('💥', Colors.BRIGHT_RED)} {colorize(enemy.name, Colors.BRIGHT_RED)} {colorize('attacks you for', Colors.WHITE)} {colorize(str(damage_taken), Colors.BRIGHT_RED + Colors.BOLD)} {colorize('damage!', Colors.WHITE)}")
-                
-                if not player.is_alive():
-                    # Handle death with enhanced death screen and respawn
-                    from ..game.death import handle_combat_death
-                    return handle_combat_death(player, enemy.name)
+            defeated = _play(engine, events, player, enemy)
         else:
             print(f"\n{colorize('❌ Invalid choice!', Colors.BRIGHT_RED)}")
             input(f"\n{colorize('Press Enter to continue...', Colors.WHITE)}")
-            clear_screen()
-            print(colorize("=" * 60, Colors.CYAN))
-            print(colorize("⚔️  BATTLE CONTINUES! ⚔️", Colors.BRIGHT_RED + Colors.BOLD))
-            print(colorize("=" * 60, Colors.CYAN))
+            _battle_continues()
             continue
         
+        if defeated:
+            # Handle death with enhanced death screen and respawn
+            from ..game.death import handle_combat_death
+            return handle_combat_death(player, enemy.name)
+        
         input(f"\n{colorize('Press Enter to continue...', Colors.BRIGHT_CYAN)}")
-        clear_screen()
-        print(colorize("=" * 60, Colors.BRIGHT_RED))
-        print(colorize("⚔️  BATTLE CONTINUES! ⚔️", Colors.BRIGHT_RED + Colors.BOLD))
-        print(colorize("=" * 60, Colors.BRIGHT_RED))
+        _battle_continues()
     
     return player.is_alive()
-
@@ -6,6 +6,7 @@ DEV_FLAGS = {
     'fast': False,
     'quiet': False,
     'no_color': False,
-    'seed': None
+    'seed': None,
+    'save_format': 'json'  # 'json' or 'binary' (see save/binary_format.py)
 }
 
@@ -3,10 +3,12 @@ from typing import Optional
 from .game_states import GameState, validate_transition
 from ..models.player import Player
 from ..save.system import load_game, save_game, get_save_dir
+from ..save.writer import flush_saves
 from ..game.save_slots import select_save_slot_menu
 from ..ui import clear_screen, Colors, colorize
 from ..utils.input_validation import validate_player_name
 from ..constants import DEFAULT_SAVE_SLOT
+from ..items.registry import check_catalog
 from ..utils.logging import log_info, log_error
 import json
 from pathlib import Path
@@ -26,6 +28,8 @@ class GameManager:
     def run(self):
         """Main game loop"""
         log_info("GameManager started")
+        # Surface inconsistent item tables now rather than mid-game
+        check_catalog()
         self.transition_to(GameState.MAIN_MENU)
         
         while self.running:
@@ -258,6 +262,9 @@ class GameManager:
     def handle_quitting(self):
         """Handle clean application shutdown"""
         self.running = False
+        # Background saves must reach the disk before the process exits
+        if not flush_saves():
+            log_error("A background save failed before quitting")
         log_info("User quit game")
     
     def migrate_saves(self):
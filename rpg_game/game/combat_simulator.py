@@ -1,12 +1,15 @@
 """Combat simulator for testing drop rates and balancing"""
 import time
-import random
 import threading
-from collections import defaultdict
 from ..ui import Colors, colorize, clear_screen
 from ..combat.enemies import BASE_ENEMIES
-from ..combat.system import scale_enemy, NIGHT_MONSTER_HP_BUFF, NIGHT_MONSTER_ATTACK_BUFF, NIGHT_DROP_RATE_BUFF
-from ..items import DROP_ITEMS
+from ..combat.simulation import (
+    SIMULATION_ZONES, PlayerSnapshot, SimulationResult, make_rng, simulate_encounters, zone_enemy_pool
+)
+from ..combat.sweep import run_balance_sweep
+
+# Encounters resolved per engine call while the live display is running
+LIVE_CHUNK_SIZE = 20000
 
 
 def combat_simulator(player):
@@ -22,6 +25,7 @@ def combat_simulator(player):
     print(f"  {colorize('2.', Colors.WHITE)} Specific Enemy (test one enemy type)")
     print(f"  {colorize('3.', Colors.WHITE)} Boss Only (test boss drops)")
     print(f"  {colorize('4.', Colors.WHITE)} All Enemies (every enemy in game)")
+    print(f"  {colorize('5.', Colors.WHITE)} Balance Sweep (all zones, day + night, multi-core)")
     print(f"  {colorize('0.', Colors.WHITE)} Cancel")
     print(colorize("=" * 60, Colors.BRIGHT_MAGENTA))
     
@@ -30,6 +34,10 @@ def combat_simulator(player):
     if mode_choice == '0':
         return
     
+    if mode_choice == '5':
+        _run_sweep_screen()
+        return
+    
     # Get enemy pool based on mode
     enemy_pool = []
     sim_name = ""
@@ -42,18 +50,7 @@ def combat_simulator(player):
         print(colorize("=" * 60, Colors.BRIGHT_CYAN))
         print(f"\n{colorize('Available Zones:', Colors.BRIGHT_WHITE + Colors.BOLD)}")
         
-        zones = {
-            '1': ('Underground Waterways', 4, 1.0, [1]),
-            '2': ('Eslania Dungeon B1', 4, 0.9, [1]),
-            '3': ('Eslania Dungeon B2', 7, 1.0, [1, 2]),
-            '4': ('Eslania Dungeon B3', 10, 1.1, [2]),
-            '5': ('Asylion Dungeon B1', 25, 1.5, [2, 3]),
-            '6': ('Asylion Dungeon B2', 35, 1.8, [3]),
-            '7': ('Asylion Dungeon B3', 50, 2.2, [3, 4]),
-            '8': ('Limbo Dungeon', 3, 0.8, [1]),
-            '9': ('Lost Taiyan', 15, 1.3, [2, 3]),
-            '10': ('Rhaom Dungeon', 10, 1.1, [2])
-        }
+        zones = {str(i): zone for i, zone in enumerate(SIMULATION_ZONES, 1)}
         
         for key, (name, level, mult, tiers) in zones.items():
             print(f"  {colorize(key + '.', Colors.WHITE)} {name} {colorize(f'(Lv {level}, x{mult})', Colors.GRAY)}")
@@ -67,7 +64,7 @@ def combat_simulator(player):
             return
         
         sim_name, sim_level, sim_mult, tiers = zones[zone_choice]
-        enemy_pool = [e for e in BASE_ENEMIES if e['tier'] in tiers]
+        enemy_pool = zone_enemy_pool(tiers)
         
     elif mode_choice == '2':
         # Specific enemy
@@ -120,78 +117,51 @@ def combat_simulator(player):
         input("\nPress Enter to continue...")
         return
     
+    
     # Ask about night mode
     night_mode = False
     night_choice = input(f"\n{colorize('Simulate with night buffs? (y/n):', Colors.BRIGHT_MAGENTA)} ").strip().lower()
     if night_choice == 'y':
         night_mode = True
     
+    # Optionally resolve every fight with the player's current stats
+    player_stats = None
+    fight_choice = input(f"{colorize('Resolve fights with your current stats? (y/n):', Colors.BRIGHT_MAGENTA)} ").strip().lower()
+    if fight_choice == 'y':
+        player_stats = PlayerSnapshot.from_player(player)
+    
+    # Fixed-size batch or live run until Enter
+    count_choice = input(f"{colorize('Number of encounters (blank = run until Enter):', Colors.BRIGHT_CYAN)} ").strip().replace(',', '')
+    batch_size = None
+    if count_choice:
+        try:
+            batch_size = int(count_choice)
+        except ValueError:
+            batch_size = None
+        if batch_size is not None and batch_size <= 0:
+            return
+    
     # Run simulation
     _run_simulation(player, enemy_pool, sim_name, sim_level if mode_choice == '1' else player.level, 
-                     sim_mult if mode_choice == '1' else 1.0, night_mode)
+                     sim_mult if mode_choice == '1' else 1.0, night_mode, player_stats, batch_size)
 
 
-def _run_simulation(player, enemy_pool, sim_name, sim_level, location_mult, night_mode):
-    """Run the actual simulation loop"""
-    
-    # Simulation state
-    sim_active = True
-    kills = 0
+def _run_simulation(player, enemy_pool, sim_name, sim_level, location_mult, night_mode,
+                    player_stats=None, batch_size=None):
+    """Drive the headless engine and render progress and the final summary"""
+    rng = make_rng()
     start_time = time.time()
     
-    # Loot tracking
-    loot_counter = defaultdict(int)
-    total_gold = 0
-    total_exp = 0
-    
-    # Per-enemy tracking
-    enemy_kill_counts = defaultdict(int)
+    if batch_size is not None:
+        result = simulate_encounters(enemy_pool, batch_size, sim_level, location_mult,
+                                     night_mode, player_stats, rng)
+        _show_summary(sim_name, night_mode, result, time.time() - start_time)
+        return
     
-    def simulation_loop():
-        """Main simulation loop"""
-        nonlocal kills, total_gold, total_exp, loot_counter, enemy_kill_counts
-        
-        last_update = time.time()
-        kills_this_second = 0
-        
-        while sim_active:
-            current_time = time.time()
-            
-            # Kill 5 enemies per second
-            if current_time - last_update >= 0.2:  # 0.2s = 5 kills/sec
-                # Pick random enemy from pool
-                enemy_template = random.choice(enemy_pool)
-                
-                # Scale enemy
-                # For night mode, we need to create a fake player object with world_anchor_timestamp
-                if night_mode:
-                    scaled_enemy = scale_enemy(enemy_template, sim_level, location_mult, player)
-                else:
-                    scaled_enemy = scale_enemy(enemy_template, sim_level, location_mult, None)
-                
-                # Track kill
-                kills += 1
-                kills_this_second += 1
-                enemy_kill_counts[enemy_template['name']] += 1
-                
-                # Award gold and XP
-                total_gold += scaled_enemy['gold']
-                total_exp += scaled_enemy['exp']
-                
-                # Roll for drops
-                if scaled_enemy['drops']:
-                    drop_multiplier = NIGHT_DROP_RATE_BUFF if night_mode else 1.0
-                    
-                    for drop in scaled_enemy['drops']:
-                        adjusted_chance = min(1.0, drop['chance'] * drop_multiplier)
-                        
-                        if random.random() < adjusted_chance:
-                            item_id = drop['item']
-                            if item_id in DROP_ITEMS:
-                                loot_counter[DROP_ITEMS[item_id]['name']] += 1
-                
-                last_update = current_time
-                kills_this_second = kills_this_second % 5
+    # Live mode: the engine runs in chunks on the main thread while the
+    # display thread only reads the latest merged result.
+    sim_active = True
+    state = {'result': SimulationResult()}
     
     def input_handler():
         """Wait for Enter to stop"""
@@ -202,8 +172,9 @@ def _run_simulation(player, enemy_pool, sim_name, sim_level, location_mult, nigh
     def display_loop():
         """Update display every second"""
         while sim_active:
+            result = state['result']
             elapsed = time.time() - start_time
-            rate = kills / elapsed if elapsed > 0 else 0
+            rate = result.kills / elapsed if elapsed > 0 else 0
             
             clear_screen()
             print(colorize("=" * 60, Colors.BRIGHT_MAGENTA))
@@ -215,19 +186,21 @@ def _run_simulation(player, enemy_pool, sim_name, sim_level, location_mult, nigh
             if night_mode:
                 print(f"  {colorize('Mode:', Colors.WHITE)} {colorize('🌙 NIGHT (+30% HP/ATK, +50% Drops)', Colors.BRIGHT_MAGENTA)}")
             print(f"  {colorize('Duration:', Colors.WHITE)} {colorize(f'{elapsed:.1f}s', Colors.BRIGHT_YELLOW)}")
-            print(f"  {colorize('Kills:', Colors.WHITE)} {colorize(str(kills), Colors.BRIGHT_GREEN)} {colorize(f'({rate:.1f}/sec)', Colors.GRAY)}")
+            print(f"  {colorize('Kills:', Colors.WHITE)} {colorize(f'{result.kills:,}', Colors.BRIGHT_GREEN)} {colorize(f'({rate:,.0f}/sec)', Colors.GRAY)}")
+            if result.deaths:
+                print(f"  {colorize('Deaths:', Colors.WHITE)} {colorize(f'{result.deaths:,}', Colors.BRIGHT_RED)}")
             
             # Show top 10 loot items
-            if loot_counter:
+            if result.loot:
                 print(f"\n{colorize('LOOT TRACKER (Top 10):', Colors.BRIGHT_WHITE + Colors.BOLD)}")
-                sorted_loot = sorted(loot_counter.items(), key=lambda x: x[1], reverse=True)[:10]
+                sorted_loot = sorted(result.loot.items(), key=lambda x: x[1], reverse=True)[:10]
                 for item_name, count in sorted_loot:
-                    print(f"  {colorize('•', Colors.BRIGHT_CYAN)} {colorize(item_name, Colors.BRIGHT_CYAN)}: {colorize(f'{count}x', Colors.BRIGHT_YELLOW)}")
+                    print(f"  {colorize('•', Colors.BRIGHT_CYAN)} {colorize(item_name, Colors.BRIGHT_CYAN)}: {colorize(f'{count:,}x', Colors.BRIGHT_YELLOW)}")
             
             # Show totals
             print(f"\n{colorize('TOTALS:', Colors.BRIGHT_WHITE + Colors.BOLD)}")
-            print(f"  {colorize('Gold:', Colors.YELLOW)} {colorize(f'{total_gold:,}g', Colors.BRIGHT_YELLOW)} {colorize(f'(Avg: {total_gold/kills if kills > 0 else 0:.1f}g/kill)', Colors.GRAY)}")
-            print(f"  {colorize('XP:', Colors.CYAN)} {colorize(f'{total_exp:,}', Colors.BRIGHT_CYAN)} {colorize(f'(Avg: {total_exp/kills if kills > 0 else 0:.1f}/kill)', Colors.GRAY)}")
+            print(f"  {colorize('Gold:', Colors.YELLOW)} {colorize(f'{result.total_gold:,}g', Colors.BRIGHT_YELLOW)} {colorize(f'(Avg: {result.gold_per_kill:.1f}g/kill)', Colors.GRAY)}")
+            print(f"  {colorize('XP:', Colors.CYAN)} {colorize(f'{result.total_exp:,}', Colors.BRIGHT_CYAN)} {colorize(f'(Avg: {result.exp_per_kill:.1f}/kill)', Colors.GRAY)}")
             
             print(colorize("\n" + "=" * 60, Colors.BRIGHT_MAGENTA))
             print(colorize("Press Enter to stop simulation...", Colors.BRIGHT_YELLOW))
@@ -241,14 +214,20 @@ def _run_simulation(player, enemy_pool, sim_name, sim_level, location_mult, nigh
     input_thread.start()
     display_thread.start()
     
-    # Run simulation
-    simulation_loop()
-    
-    # Wait for display thread to finish
-    time.sleep(0.5)
+    # Run simulation in chunks until stopped
+    while sim_active:
+        chunk = simulate_encounters(enemy_pool, LIVE_CHUNK_SIZE, sim_level, location_mult,
+                                    night_mode, player_stats, rng)
+        merged = SimulationResult().merge(state['result']).merge(chunk)
+        state['result'] = merged
     
-    # Show final summary
-    elapsed = time.time() - start_time
+    display_thread.join(timeout=1.5)
+    _show_summary(sim_name, night_mode, state['result'], time.time() - start_time)
+
+
+def _show_summary(sim_name, night_mode, result, elapsed):
+    """Render the final simulation summary"""
+    kills = result.kills
     rate = kills / elapsed if elapsed > 0 else 0
     
     clear_screen()
@@ -260,51 +239,78 @@ def _run_simulation(player, enemy_pool, sim_name, sim_level, location_mult, nigh
     print(f"  {colorize('Zone:', Colors.WHITE)} {colorize(sim_name, Colors.BRIGHT_CYAN)}")
     if night_mode:
         print(f"  {colorize('Mode:', Colors.WHITE)} {colorize('🌙 Night Mode', Colors.BRIGHT_MAGENTA)}")
-    print(f"  {colorize('Duration:', Colors.WHITE)} {colorize(f'{elapsed:.1f} seconds', Colors.BRIGHT_YELLOW)}")
-    print(f"  {colorize('Total Kills:', Colors.WHITE)} {colorize(str(kills), Colors.BRIGHT_GREEN)}")
-    print(f"  {colorize('Kill Rate:', Colors.WHITE)} {colorize(f'{rate:.2f}/sec', Colors.BRIGHT_YELLOW)}")
+    print(f"  {colorize('Duration:', Colors.WHITE)} {colorize(f'{elapsed:.2f} seconds', Colors.BRIGHT_YELLOW)}")
+    print(f"  {colorize('Encounters:', Colors.WHITE)} {colorize(f'{result.encounters:,}', Colors.BRIGHT_CYAN)}")
+    print(f"  {colorize('Total Kills:', Colors.WHITE)} {colorize(f'{kills:,}', Colors.BRIGHT_GREEN)}")
+    print(f"  {colorize('Kill Rate:', Colors.WHITE)} {colorize(f'{rate:,.0f}/sec', Colors.BRIGHT_YELLOW)}")
+    if result.deaths or result.rounds:
+        print(f"  {colorize('Deaths:', Colors.WHITE)} {colorize(f'{result.deaths:,}', Colors.BRIGHT_RED)} {colorize(f'({result.win_rate * 100:.1f}% win rate)', Colors.GRAY)}")
+        avg_rounds = result.rounds / result.encounters if result.encounters else 0
+        print(f"  {colorize('Avg Rounds/Fight:', Colors.WHITE)} {colorize(f'{avg_rounds:.2f}', Colors.BRIGHT_CYAN)}")
     
     # Enemy breakdown
-    if enemy_kill_counts:
+    if result.enemy_kills:
         print(f"\n{colorize('ENEMY BREAKDOWN:', Colors.BRIGHT_WHITE + Colors.BOLD)}")
-        for enemy_name, count in sorted(enemy_kill_counts.items(), key=lambda x: x[1], reverse=True):
+        for enemy_name, count in sorted(result.enemy_kills.items(), key=lambda x: x[1], reverse=True):
             percentage = (count / kills * 100) if kills > 0 else 0
-            print(f"  {colorize(enemy_name, Colors.BRIGHT_RED)}: {colorize(str(count), Colors.BRIGHT_YELLOW)} {colorize(f'({percentage:.1f}%)', Colors.GRAY)}")
+            print(f"  {colorize(enemy_name, Colors.BRIGHT_RED)}: {colorize(f'{count:,}', Colors.BRIGHT_YELLOW)} {colorize(f'({percentage:.1f}%)', Colors.GRAY)}")
     
     # Loot breakdown with drop rates
-    if loot_counter:
-        print(f"\n{colorize('LOOT OBTAINED:', Colors.BRIGHT_WHITE + Colors.BOLD)}")
-        sorted_loot = sorted(loot_counter.items(), key=lambda x: x[1], reverse=True)
+    print(f"\n{colorize('LOOT OBTAINED:', Colors.BRIGHT_WHITE + Colors.BOLD)}")
+    if result.loot:
+        sorted_loot = sorted(result.loot.items(), key=lambda x: x[1], reverse=True)
         
         for item_name, count in sorted_loot:
-            drop_rate = (count / kills * 100) if kills > 0 else 0
+            drop_rate = result.drop_rate(item_name) * 100
             print(f"  {colorize('•', Colors.BRIGHT_CYAN)} {colorize(item_name, Colors.BRIGHT_CYAN)}: " + 
-                  f"{colorize(f'{count}x', Colors.BRIGHT_YELLOW)} " +
-                  f"{colorize(f'({drop_rate:.1f}% drop rate)', Colors.GRAY)}")
+                  f"{colorize(f'{count:,}x', Colors.BRIGHT_YELLOW)} " +
+                  f"{colorize(f'({drop_rate:.2f}% drop rate)', Colors.GRAY)}")
         
-        print(f"\n  {colorize('Total Unique Items:', Colors.WHITE)} {colorize(str(len(loot_counter)), Colors.BRIGHT_CYAN)}")
-        print(f"  {colorize('Total Item Drops:', Colors.WHITE)} {colorize(str(sum(loot_counter.values())), Colors.BRIGHT_YELLOW)}")
+        print(f"\n  {colorize('Total Unique Items:', Colors.WHITE)} {colorize(str(len(result.loot)), Colors.BRIGHT_CYAN)}")
+        print(f"  {colorize('Total Item Drops:', Colors.WHITE)} {colorize(f'{sum(result.loot.values()):,}', Colors.BRIGHT_YELLOW)}")
     else:
-        print(f"\n{colorize('LOOT OBTAINED:', Colors.BRIGHT_WHITE + Colors.BOLD)}")
         print(f"  {colorize('No drops received', Colors.GRAY)}")
     
     # Resource summary
     print(f"\n{colorize('RESOURCES:', Colors.BRIGHT_WHITE + Colors.BOLD)}")
-    print(f"  {colorize('Total Gold:', Colors.YELLOW)} {colorize(f'{total_gold:,}g', Colors.BRIGHT_YELLOW)}")
-    print(f"  {colorize('Avg Gold/Kill:', Colors.YELLOW)} {colorize(f'{total_gold/kills if kills > 0 else 0:.1f}g', Colors.BRIGHT_YELLOW)}")
-    print(f"  {colorize('Total XP:', Colors.CYAN)} {colorize(f'{total_exp:,}', Colors.BRIGHT_CYAN)}")
-    print(f"  {colorize('Avg XP/Kill:', Colors.CYAN)} {colorize(f'{total_exp/kills if kills > 0 else 0:.1f}', Colors.BRIGHT_CYAN)}")
-    
-    # Efficiency stats
-    if kills > 0:
-        gold_per_second = total_gold / elapsed if elapsed > 0 else 0
-        xp_per_second = total_exp / elapsed if elapsed > 0 else 0
-        print(f"\n{colorize('EFFICIENCY:', Colors.BRIGHT_WHITE + Colors.BOLD)}")
-        print(f"  {colorize('Gold/Second:', Colors.YELLOW)} {colorize(f'{gold_per_second:.1f}g/s', Colors.BRIGHT_YELLOW)}")
-        print(f"  {colorize('XP/Second:', Colors.CYAN)} {colorize(f'{xp_per_second:.1f}/s', Colors.BRIGHT_CYAN)}")
-        print(f"  {colorize('Gold/Hour:', Colors.YELLOW)} {colorize(f'{gold_per_second * 3600:,.0f}g/hr', Colors.BRIGHT_YELLOW)}")
-        print(f"  {colorize('XP/Hour:', Colors.CYAN)} {colorize(f'{xp_per_second * 3600:,.0f}/hr', Colors.BRIGHT_CYAN)}")
+    print(f"  {colorize('Total Gold:', Colors.YELLOW)} {colorize(f'{result.total_gold:,}g', Colors.BRIGHT_YELLOW)}")
+    print(f"  {colorize('Avg Gold/Kill:', Colors.YELLOW)} {colorize(f'{result.gold_per_kill:.1f}g', Colors.BRIGHT_YELLOW)}")
+    print(f"  {colorize('Total XP:', Colors.CYAN)} {colorize(f'{result.total_exp:,}', Colors.BRIGHT_CYAN)}")
+    print(f"  {colorize('Avg XP/Kill:', Colors.CYAN)} {colorize(f'{result.exp_per_kill:.1f}', Colors.BRIGHT_CYAN)}")
     
     print(colorize("\n" + "=" * 60, Colors.BRIGHT_GREEN))
     input(f"\n{colorize('Press Enter to return to dev menu...', Colors.WHITE)}")
 
+
+def _run_sweep_screen():
+    """Run a full zone x night balance sweep and print one row per cell"""
+    count_choice = input(f"\n{colorize('Encounters per zone/mode (default 100000):', Colors.BRIGHT_CYAN)} ").strip().replace(',', '')
+    try:
+        encounters = int(count_choice) if count_choice else 100000
+    except ValueError:
+        return
+    if encounters <= 0:
+        return
+    
+    print(f"\n{colorize('Running sweep across all CPU cores...', Colors.BRIGHT_YELLOW)}")
+    start_time = time.time()
+    report = run_balance_sweep(encounters)
+    elapsed = time.time() - start_time
+    
+    clear_screen()
+    print(colorize("=" * 78, Colors.BRIGHT_GREEN))
+    print(colorize("📊  BALANCE SWEEP REPORT  📊", Colors.BRIGHT_GREEN + Colors.BOLD))
+    print(colorize("=" * 78, Colors.BRIGHT_GREEN))
+    print(f"\n  {colorize('Seed:', Colors.WHITE)} {colorize(str(report.seed), Colors.BRIGHT_CYAN)}"
+          f"   {colorize('Kills:', Colors.WHITE)} {colorize(f'{report.total.kills:,}', Colors.BRIGHT_GREEN)}"
+          f"   {colorize('Duration:', Colors.WHITE)} {colorize(f'{elapsed:.2f}s', Colors.BRIGHT_YELLOW)}")
+    
+    print(f"\n  {'Zone':<24}{'Lv':>4}{'Mode':>7}{'Gold/Kill':>12}{'XP/Kill':>10}{'Drops/Kill':>12}")
+    print("  " + "-" * 69)
+    for row in report.rows():
+        mode = 'Night' if row['night'] else 'Day'
+        print(f"  {row['zone']:<24}{row['level']:>4}{mode:>7}{row['gold_per_kill']:>12.1f}"
+              f"{row['exp_per_kill']:>10.1f}{row['drops_per_kill']:>12.2f}")
+    
+    print(colorize("\n" + "=" * 78, Colors.BRIGHT_GREEN))
+    input(f"\n{colorize('Press Enter to return to dev menu...', Colors.WHITE)}")
@@ -2,11 +2,8 @@
 import time
 import random
 from ..ui import Colors, colorize, clear_screen, display_time_hud
-from ..constants import (
-    MAX_SKILL_LEVEL,
-    EXP_MULTIPLIER_PER_LEVEL, STARTING_EXP_TO_NEXT, STAT_POINTS_PER_LEVEL,
-    MAX_DEV_LEVEL
-)
+from ..constants import MAX_SKILL_LEVEL, STAT_POINTS_PER_LEVEL, MAX_DEV_LEVEL
+from ..systems.xp_tables import CHARACTER_XP, SKILL_XP
 from .dev_tables import view_all_items, view_all_monsters
 
 
@@ -79,7 +76,7 @@ def dev_menu(player):
         elif choice == '11':
             view_all_items()
         elif choice == '12':
-            view_all_monsters()
+            view_all_monsters(player)
         elif choice == '13':
             from .combat_simulator import combat_simulator
             combat_simulator(player)
@@ -238,11 +235,8 @@ def set_character_level(player):
         # Update level
         player.level = new_level
         
-        # Recalculate exp_to_next based on new level
-        # Start from level 1 exp requirement
-        player.exp_to_next = STARTING_EXP_TO_NEXT
-        for _ in range(1, new_level):
-            player.exp_to_next = int(player.exp_to_next * EXP_MULTIPLIER_PER_LEVEL)
+        # Look up exp_to_next for the new level
+        player.exp_to_next = CHARACTER_XP.exp_to_next(new_level)
         
         # Reset exp to 0 when setting level directly (clean slate)
         player.exp = 0
@@ -290,14 +284,8 @@ def gain_xp(player):
         if xp_gain == 0:
             return
         
-        old_level = player.level
-        player.exp += xp_gain
-        
-        # Check for level ups (handle multiple level ups)
-        # Use the player's level_up method to properly handle stat points and other level-up logic
-        levels_gained = 0
-        while player.level_up(silent=True):
-            levels_gained += 1
+        # Resolve all level ups at once (stat points are banked)
+        levels_gained = player.gain_exp(xp_gain)
         
         print(f"\n{colorize('✅', Colors.BRIGHT_GREEN)} {colorize(f'Gained {xp_gain} XP!', Colors.BRIGHT_GREEN)}")
         
@@ -389,12 +377,8 @@ def set_skill_level(player, skill_name):
         # Reset XP to 0 for clean state
         setattr(player, f'{skill_name}_exp', 0)
         
-        # Recalculate exp_to_next based on new level
-        from ..constants import STARTING_SKILL_EXP_TO_NEXT, SKILL_EXP_MULTIPLIER_PER_LEVEL
-        exp_to_next = STARTING_SKILL_EXP_TO_NEXT
-        for _ in range(1, new_level):
-            exp_to_next = int(exp_to_next * SKILL_EXP_MULTIPLIER_PER_LEVEL)
-        setattr(player, f'{skill_name}_exp_to_next', exp_to_next)
+        # Look up exp_to_next for the new level
+        setattr(player, f'{skill_name}_exp_to_next', SKILL_XP.exp_to_next(new_level))
         
         print(f"\n{colorize('✅', Colors.BRIGHT_GREEN)} {colorize(f'{skill_display_name} level changed from {old_level} to {new_level}!', Colors.BRIGHT_GREEN)}")
         print(f"{colorize('XP reset to 0.', Colors.WHITE)}")
@@ -5,29 +5,20 @@ from ..items.definitions import (
     POTIONS, FISHING_RODS, PICKAXES, DROP_ITEMS
 )
 from ..combat.enemies import BASE_ENEMIES
-from ..skills.fishing import FISH_TYPES, FISH_LEVEL_REQUIREMENTS, COOKED_FISH_ITEMS, GOURMET_FISH_ITEMS
+from ..combat.analysis import expected_encounter
+from ..combat.engine import PlayerSnapshot
+from ..combat.system import get_scaled_enemy
+from ..skills.fishing import FISH_TYPES, FISH_LEVEL_REQUIREMENTS
 from ..skills.mining import MINING_ORES, MINING_LEVEL_REQUIREMENTS
+from ..items.registry import find_by_key
 
 
 def get_item_sell_value(item_key):
     """Get sell value for any item from all possible sources"""
-    # Check all item dictionaries
-    item_sources = [
-        DROP_ITEMS,
-        POTIONS,
-        FISHING_RODS,
-        PICKAXES,
-        FISH_TYPES,
-        COOKED_FISH_ITEMS,
-        GOURMET_FISH_ITEMS,
-        MINING_ORES
-    ]
-    
-    for source in item_sources:
-        if item_key in source:
-            return source[item_key].get('sell_value', '?')
-    
-    return '?'
+    definition = find_by_key(item_key)
+    if definition is None:
+        return '?'
+    return definition.fields.get('sell_value', '?')
 
 
 def view_all_items():
@@ -300,9 +291,24 @@ def get_monster_locations(tier):
     return tier_locations.get(tier, ["Unknown"])
 
 
-def view_all_monsters():
-    """Display all monsters in the game with stats and drops"""
+def format_encounter_ev(ev):
+    """One-line summary of an EncounterEV for the monster table"""
+    win_pct = f"{ev.win_probability * 100:.1f}%"
+    win_color = Colors.BRIGHT_GREEN if ev.win_probability >= 0.95 else Colors.BRIGHT_YELLOW if ev.win_probability >= 0.5 else Colors.BRIGHT_RED
+    return (f"Win: {colorize(win_pct, win_color)} | "
+            f"Hits to kill: {colorize(f'{ev.turns_to_kill:.1f}', Colors.BRIGHT_WHITE)} | "
+            f"Damage taken: {colorize(f'{ev.expected_damage_taken:.0f}', Colors.BRIGHT_RED)} | "
+            f"Per fight: {colorize(f'{ev.expected_exp:.1f} XP', Colors.BRIGHT_CYAN)}, {colorize(f'{ev.expected_gold:.1f}g', Colors.BRIGHT_YELLOW)}")
+
+
+def view_all_monsters(player=None):
+    """Display all monsters in the game with stats and drops.
+
+    With a player, each monster also gets exact expected-value columns for a
+    fight at the player's level and current gear (see combat.analysis).
+    """
     pages = []
+    stats = PlayerSnapshot.from_player(player) if player else None
     
     # Group enemies by tier
     for tier_num in range(1, 7):
@@ -339,6 +345,10 @@ def view_all_monsters():
             page.append(f"  {colorize('Stats:', Colors.WHITE + Colors.BOLD)} HP: {colorize(str(hp), Colors.BRIGHT_RED)} | Attack: {colorize(str(attack), Colors.BRIGHT_YELLOW)} | Defense: {colorize(str(defense), Colors.BRIGHT_BLUE)}")
             page.append(f"  {colorize('Rewards:', Colors.WHITE + Colors.BOLD)} {colorize(f'{exp} XP', Colors.BRIGHT_CYAN)} | {colorize(f'{gold}g', Colors.BRIGHT_YELLOW)}")
             
+            if stats:
+                ev = expected_encounter(stats, get_scaled_enemy(enemy, player.level))
+                page.append(f"  {colorize(f'EV vs You (Lv {player.level}):', Colors.BRIGHT_MAGENTA + Colors.BOLD)} {format_encounter_ev(ev)}")
+            
             # Show locations
             locations = get_monster_locations(tier)
             locations_str = ", ".join(locations)
@@ -1,5 +1,4 @@
 """Exploration and location systems"""
-import random
 from ..constants import (
     ENCOUNTER_CHANCE, RANDOM_EVENT_CHANCE,
     LOCATION_MULTIPLIER_UNDERGROUND, LOCATION_MULTIPLIER_DEFAULT,
@@ -11,7 +10,8 @@ from ..ui import Colors, colorize, clear_screen, health_bar
 from ..models.location import LOCATIONS
 from ..models.enemy import Enemy
 from ..combat.enemies import BASE_ENEMIES
-from ..combat.system import scale_enemy, combat
+from ..combat.system import spawn_scaled_enemy, combat
+from ..systems.rng import rng_stream
 from ..items import POTIONS, add_item_to_inventory
 from ..achievements.system import check_achievements
 
@@ -47,24 +47,13 @@ def explore_location(player, location_name):
         choice = input(f"\n{colorize('What do you do?', Colors.BRIGHT_CYAN)} ").strip()
         
         if choice == '1':
-            encounter_chance = random.random()
+            events = rng_stream('events')
+            encounter_chance = events.random()
             if encounter_chance < ENCOUNTER_CHANCE:  # 70% chance of combat
-                enemy_template = random.choice(enemy_pool).copy()
+                enemy_template = events.choice(enemy_pool)
                 # Scale enemy based on player level (pass player for night buffs)
-                enemy_data = scale_enemy(enemy_template, player.level, location_multiplier, player)
-                
-                enemy = Enemy(
-                    name=enemy_data['name'],
-                    hp=enemy_data['hp'],
-                    attack=enemy_data['attack'],
-                    defense=enemy_data['defense'],
-                    exp_reward=enemy_data['exp'],
-                    gold_reward=enemy_data['gold'],
-                    drops=enemy_data.get('drops', []),
-                    is_night=enemy_data.get('is_night', False)
-                )
-                # Pass through boss flag if present
-                enemy.is_boss = enemy_data.get('is_boss', False)
+                enemy_data = spawn_scaled_enemy(enemy_template, player.level, location_multiplier, player)
+                enemy = Enemy.from_scaled(enemy_data)
                 won = combat(player, enemy)
                 
                 if not won:
@@ -74,8 +63,8 @@ def explore_location(player, location_name):
                 continue
             else:
                 # Random events (OSRS-style) - 5% chance
-                if random.random() < RANDOM_EVENT_CHANCE:
-                    random_event = random.choice([
+                if events.random() < RANDOM_EVENT_CHANCE:
+                    random_event = events.choice([
                         ('treasure', 'You found a hidden treasure chest!'),
                         ('mysterious', 'A mysterious figure appears and rewards you!'),
                         ('lucky', 'Your luck shines - you find valuable loot!')
@@ -89,16 +78,16 @@ def explore_location(player, location_name):
                     print(f"\n{colorize(event_msg, Colors.BRIGHT_YELLOW)}")
                     
                     if event_type == 'treasure':
-                        bonus_gold = random.randint(RANDOM_EVENT_GOLD_MIN, RANDOM_EVENT_GOLD_MAX)
+                        bonus_gold = events.randint(RANDOM_EVENT_GOLD_MIN, RANDOM_EVENT_GOLD_MAX)
                         player.gold += bonus_gold
                         print(f"\n{colorize('💰', Colors.BRIGHT_YELLOW)} {colorize(f'Gained {bonus_gold} gold!', Colors.BRIGHT_YELLOW)}")
                     elif event_type == 'mysterious':
-                        bonus_exp = random.randint(RANDOM_EVENT_EXP_MIN, RANDOM_EVENT_EXP_MAX)
+                        bonus_exp = events.randint(RANDOM_EVENT_EXP_MIN, RANDOM_EVENT_EXP_MAX)
                         player.exp += bonus_exp
                         print(f"\n{colorize('✨', Colors.BRIGHT_GREEN)} {colorize(f'Gained {bonus_exp} experience!', Colors.BRIGHT_GREEN)}")
                     elif event_type == 'lucky':
                         # Give a random consumable
-                        potion_key = random.choice(list(POTIONS.keys()))
+                        potion_key = events.choice(list(POTIONS.keys()))
                         potion = POTIONS[potion_key].copy()
                         add_item_to_inventory(player.inventory, potion)
                         potion_name = potion['name']
@@ -108,7 +97,7 @@ def explore_location(player, location_name):
                     continue
                 else:
                     # Gold scales with level
-                    base_gold = random.randint(10, 30)
+                    base_gold = events.randint(10, 30)
                     gold_found = int(base_gold * (1 + player.level * 0.1))
                     player.gold += gold_found
                     print(f"\n💰 You found {gold_found} gold!")
@@ -133,8 +122,7 @@ def explore_tepes_lair(player):
     lair_level = 1
     
     # Save player state before entering lair (for death penalty)
-    import copy
-    original_inventory = copy.deepcopy(player.inventory)
+    original_inventory = player.inventory.snapshot()
     original_gold = player.gold
     original_exp = player.exp
     original_hp = player.hp
@@ -179,41 +167,37 @@ def explore_tepes_lair(player):
                 enemy_pool = BASE_ENEMIES  # All tiers including end game
             
             # Lair enemies scale much more aggressively - Tepes is a significant challenge
-            enemy_template = random.choice(enemy_pool).copy()
+            enemy_template = rng_stream('events').choice(enemy_pool)
             lair_multiplier = 2.0 + (lair_level * 0.15)  # Base 2x difficulty, +15% per floor
-            enemy_data = scale_enemy(enemy_template, difficulty_level, lair_multiplier, player)
+            enemy_data = spawn_scaled_enemy(enemy_template, difficulty_level, lair_multiplier, player)
             
             # Lair rewards scale with floor level
             reward_multiplier = 1.0 + (lair_level * 0.2)
-            enemy_data['exp'] = int(enemy_data['exp'] * reward_multiplier)
-            enemy_data['gold'] = int(enemy_data['gold'] * reward_multiplier)
             
-            # Add Tepes Lair-specific drops at higher floors
+            # Add Tepes Lair-specific drops at higher floors (to this spawn only -
+            # the scaled record and its template drop list are shared)
+            lair_drops = list(enemy_data.drops)
+            loot = rng_stream('loot')
             if lair_level >= 10:
-                if random.random() < 0.3:
-                    enemy_data['drops'].append({'item': 'tepes_shard', 'chance': 1.0})
+                if loot.random() < 0.3:
+                    lair_drops.append({'item': 'tepes_shard', 'chance': 1.0})
             if lair_level >= 25:
-                if random.random() < 0.2:
-                    enemy_data['drops'].append({'item': 'tepes_core', 'chance': 1.0})
+                if loot.random() < 0.2:
+                    lair_drops.append({'item': 'tepes_core', 'chance': 1.0})
             if lair_level >= 50:
-                if random.random() < 0.15:
-                    enemy_data['drops'].append({'item': 'lair_essence', 'chance': 1.0})
+                if loot.random() < 0.15:
+                    lair_drops.append({'item': 'lair_essence', 'chance': 1.0})
             if lair_level >= 75:
-                if random.random() < 0.1:
-                    enemy_data['drops'].append({'item': 'void_crystal', 'chance': 1.0})
+                if loot.random() < 0.1:
+                    lair_drops.append({'item': 'void_crystal', 'chance': 1.0})
             
-            enemy = Enemy(
-                name=f"{enemy_data['name']} (Floor {lair_level})",
-                hp=enemy_data['hp'],
-                attack=enemy_data['attack'],
-                defense=enemy_data['defense'],
-                exp_reward=enemy_data['exp'],
-                gold_reward=enemy_data['gold'],
-                drops=enemy_data.get('drops', []),
-                is_night=enemy_data.get('is_night', False)
+            enemy = Enemy.from_scaled(
+                enemy_data,
+                name=f"{enemy_data.name} (Floor {lair_level})",
+                exp_reward=int(enemy_data.exp * reward_multiplier),
+                gold_reward=int(enemy_data.gold * reward_multiplier),
+                drops=lair_drops
             )
-            # Pass through boss flag if present
-            enemy.is_boss = enemy_data.get('is_boss', False)
             
             # Store state before combat for tracking
             pre_combat_inventory_count = len(player.inventory)
@@ -236,8 +220,7 @@ def explore_tepes_lair(player):
                 print(f"  {colorize('Experience:', Colors.BRIGHT_YELLOW)} {lair_exp_gained}")
                 
                 # Restore player to pre-lair state
-                import copy
-                player.inventory = copy.deepcopy(original_inventory)
+                player.inventory.restore(original_inventory)
                 player.gold = original_gold
                 player.exp = original_exp
                 player.hp = REVIVE_HP  # Revive with 1 HP
@@ -337,8 +320,7 @@ def explore_multi_floor_dungeon(player, dungeon_name, floors, start_floor='b1'):
     dungeon_exp_gained = 0
     
     # Save player state before entering dungeon
-    import copy
-    original_inventory = copy.deepcopy(player.inventory)
+    original_inventory = player.inventory.snapshot()
     original_gold = player.gold
     original_exp = player.exp
     original_hp = player.hp
@@ -448,20 +430,9 @@ def explore_multi_floor_dungeon(player, dungeon_name, floors, start_floor='b1'):
                 else:
                     enemy_pool = BASE_ENEMIES  # All tiers for end game
             
-            enemy_template = random.choice(enemy_pool).copy()
-            enemy_data = scale_enemy(enemy_template, difficulty_level, location_multiplier, player)
-            
-            enemy = Enemy(
-                name=f"{enemy_data['name']} ({floor_key.upper()})",
-                hp=enemy_data['hp'],
-                attack=enemy_data['attack'],
-                defense=enemy_data['defense'],
-                exp_reward=enemy_data['exp'],
-                gold_reward=enemy_data['gold'],
-                drops=enemy_data.get('drops', []),
-                is_night=enemy_data.get('is_night', False)
-            )
-            enemy.is_boss = enemy_data.get('is_boss', False)
+            enemy_template = rng_stream('events').choice(enemy_pool)
+            enemy_data = spawn_scaled_enemy(enemy_template, difficulty_level, location_multiplier, player)
+            enemy = Enemy.from_scaled(enemy_data, name=f"{enemy_data.name} ({floor_key.upper()})")
             
             # Store state before combat
             pre_combat_inventory_count = len(player.inventory)
@@ -479,8 +450,7 @@ def explore_multi_floor_dungeon(player, dungeon_name, floors, start_floor='b1'):
                 print(f"\n{colorize('You have fallen in the dungeon!', Colors.BRIGHT_RED)}")
                 
                 # Restore player to pre-dungeon state
-                import copy
-                player.inventory = copy.deepcopy(original_inventory)
+                player.inventory.restore(original_inventory)
                 player.gold = original_gold
                 player.exp = original_exp
                 player.hp = REVIVE_HP  # Revive with 1 HP
@@ -107,7 +107,7 @@ def view_achievements(player):
                     progress = f"{max_grade}/{ach_data['requirement']}"
                     progress_text = colorize(f" ({progress})", Colors.YELLOW)
                 elif ach_data['type'] == 'talisman_count':
-                    talisman_count = sum(1 for item in player.inventory if item.get('type') == 'talisman')
+                    talisman_count = player.inventory.count_type('talisman')
                     progress = f"{talisman_count}/{ach_data['requirement']}"
                     progress_text = colorize(f" ({progress})", Colors.YELLOW)
                 elif ach_data['type'] in ['rare_drop', 'talisman_found', 'talisman_hacker', 'first_catch', 'first_cook', 'first_mine', 'masterpiece']:
@@ -188,11 +188,7 @@ def view_inventory(player):
             print(f"{colorize('🔧 Tool:', Colors.WHITE)} {colorize('None', Colors.WHITE)}")
         
         # Get equippable items from inventory
-        equippable_items = []
-        for item in player.inventory:
-            item_type = item.get('type')
-            if item_type == 'weapon' or item_type == 'armor' or item_type == 'tool':
-                equippable_items.append(item)
+        equippable_items = player.inventory.equippable_items()
         
         # Show all inventory items
         print(f"\n{colorize('INVENTORY ITEMS:', Colors.BRIGHT_WHITE + Colors.BOLD)}")
@@ -239,8 +239,7 @@ def delete_save_slot_menu(slots):
 
 def rename_save_slot_menu():
     """Menu to rename an existing save slot"""
-    from ..save.system import list_save_slots, load_game, save_game, delete_save_slot
-    import os
+    from ..save.system import list_save_slots, rename_save_slot
     
     clear_screen()
     print(colorize("=" * 60, Colors.BRIGHT_YELLOW))
@@ -299,17 +298,12 @@ def rename_save_slot_menu():
                 input(f"\n{colorize('Press Enter to continue...', Colors.WHITE)}")
                 return
             
-            # Load the save, update slot name, save to new slot, delete old
-            player = load_game(old_slot_name)
-            if player:
-                player.save_slot = sanitized
-                save_game(player, sanitized)
-                delete_save_slot(old_slot_name)
-                
+            # Write the new slot and delete the old one in a single transaction
+            if rename_save_slot(old_slot_name, sanitized):
                 success_msg = f'Slot renamed from "{old_slot_name}" to "{sanitized}"!'
                 print(f"\n{colorize('✅', Colors.BRIGHT_GREEN)} {colorize(success_msg, Colors.BRIGHT_GREEN)}")
             else:
-                print(f"\n{colorize('❌ Failed to load save slot!', Colors.BRIGHT_RED)}")
+                print(f"\n{colorize('❌ Failed to rename save slot!', Colors.BRIGHT_RED)}")
             
             input(f"\n{colorize('Press Enter to continue...', Colors.WHITE)}")
         else:
@@ -1,7 +1,7 @@
 """Shop menus"""
 import random
 from ..ui import Colors, colorize, clear_screen, health_bar, display_time_hud
-from ..items import WEAPONS, SWORDS, BLADES, GUNS, CROSSES, MACES, MAGIC_WEAPONS, ARMOR_SETS, POTIONS, FISHING_RODS, PICKAXES, add_item_to_inventory, remove_item_from_inventory, get_item_quantity, format_item_name
+from ..items import WEAPONS, SWORDS, BLADES, GUNS, CROSSES, MACES, MAGIC_WEAPONS, ARMOR_SETS, POTIONS, FISHING_RODS, PICKAXES, add_item_to_inventory, remove_item_from_inventory, apply_inventory_changes, get_item_quantity, format_item_name
 from ..constants import MAX_QUANTITY_PER_PURCHASE, MIN_QUANTITY_PER_PURCHASE
 
 
@@ -14,10 +14,7 @@ def sell_items_menu(player, shop_name):
         print(colorize("=" * 60, Colors.CYAN))
         
         # Get sellable items (materials and items with sell_value)
-        sellable_items = []
-        for item in player.inventory:
-            if 'sell_value' in item:
-                sellable_items.append(item)
+        sellable_items = player.inventory.sellable_items()
         
         # Also allow selling equipped items
         if player.weapon and 'sell_value' in player.weapon:
@@ -112,10 +109,10 @@ def sell_items_menu(player, shop_name):
                         else:
                             continue  # Cancel
                     
-                    # Perform sale
+                    # Perform sale (items first, so a failed removal pays nothing)
                     total_value = item_to_sell['sell_value'] * sell_qty
+                    apply_inventory_changes(player.inventory, [(item_to_sell, -sell_qty)])
                     player.gold += total_value
-                    remove_item_from_inventory(player.inventory, item_to_sell, sell_qty)
                     
                     if sell_qty > 1:
                         sold_msg = f"You sold {sell_qty}x {item_to_sell['name']} for {total_value} gold!"
@@ -543,8 +540,7 @@ def general_store(player):
                             
                             if player.gold >= total_cost:
                                 player.gold -= total_cost
-                                for _ in range(qty):
-                                    add_item_to_inventory(player.inventory, item_data.copy())
+                                apply_inventory_changes(player.inventory, [(item_data, qty)])
                                 bought_msg = f"Bought {qty}x {item_data['name']}!"
                                 print(f"\n{colorize('✅', Colors.BRIGHT_GREEN)} {colorize(bought_msg, Colors.BRIGHT_GREEN)}")
                                 input(f"\n{colorize('Press Enter to continue...', Colors.WHITE)}")
@@ -779,11 +775,10 @@ def pimping_service(player):
             
             # Get talismans that can be used on weapons
             weapon_talismans = []
-            for item in player.inventory:
-                if item.get('type') == 'talisman':
-                    item_type = item.get('item_type', 'weapon')
-                    if item_type in ['weapon', 'both']:
-                        weapon_talismans.append(item)
+            for item in player.inventory.items_of_type('talisman'):
+                item_type = item.get('item_type', 'weapon')
+                if item_type in ['weapon', 'both']:
+                    weapon_talismans.append(item)
             
             if not weapon_talismans:
                 print(f"\n{colorize('❌', Colors.BRIGHT_RED)} {colorize('You need a talisman in your inventory that can be used on weapons!', Colors.WHITE)}")
@@ -903,11 +898,10 @@ def pimping_service(player):
             
             # Get talismans that can be used on armor
             armor_talismans = []
-            for item in player.inventory:
-                if item.get('type') == 'talisman':
-                    item_type = item.get('item_type', 'armor')
-                    if item_type in ['armor', 'both']:
-                        armor_talismans.append(item)
+            for item in player.inventory.items_of_type('talisman'):
+                item_type = item.get('item_type', 'armor')
+                if item_type in ['armor', 'both']:
+                    armor_talismans.append(item)
             
             if not armor_talismans:
                 print(f"\n{colorize('❌', Colors.BRIGHT_RED)} {colorize('You need a talisman in your inventory that can be used on armor!', Colors.WHITE)}")
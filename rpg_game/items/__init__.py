@@ -2,11 +2,15 @@
 
 from .definitions import WEAPONS, SWORDS, BLADES, GUNS, CROSSES, MACES, MAGIC_WEAPONS, ARMOR_SETS, POTIONS, FISHING_RODS, PICKAXES, DROP_ITEMS
 from .rarity import format_item_name
-from .inventory import get_item_key, add_item_to_inventory, remove_item_from_inventory, get_item_quantity
+from .inventory import (
+    InventoryError, get_item_key, add_item_to_inventory, remove_item_from_inventory, apply_inventory_changes,
+    get_item_quantity
+)
 
 __all__ = [
     'WEAPONS', 'SWORDS', 'BLADES', 'GUNS', 'CROSSES', 'MACES', 'MAGIC_WEAPONS', 'ARMOR_SETS', 'POTIONS', 'FISHING_RODS', 'PICKAXES', 'DROP_ITEMS',
     'format_item_name',
-    'get_item_key', 'add_item_to_inventory', 'remove_item_from_inventory', 'get_item_quantity'
+    'InventoryError', 'get_item_key', 'add_item_to_inventory', 'remove_item_from_inventory', 'apply_inventory_changes',
+    'get_item_quantity'
 ]
 
@@ -1,6 +1,10 @@
 """Inventory management functions"""
 
 
+class InventoryError(ValueError):
+    """A batch of inventory changes that cannot be applied"""
+
+
 def get_item_key(item):
     """Generate unique key for item stacking"""
     if item.get('type') in ['weapon', 'armor']:
@@ -8,8 +12,13 @@ def get_item_key(item):
     return (item.get('name'), item.get('type'), item.get('sell_value'), item.get('heal', 0))
 
 
-def add_item_to_inventory(inventory, item):
-    """Add item to inventory with stacking"""
+def add_item_to_inventory(inventory, item, quantity=1):
+    """Add item to inventory with stacking (quantity applies to stackable items)"""
+    if hasattr(inventory, 'add_item'):
+        # InventoryIndex (Player.inventory): O(1) stack lookup
+        inventory.add_item(item, quantity)
+        return
+    
     if item.get('type') in ['weapon', 'armor']:
         inventory.append(item)
         return
@@ -17,15 +26,18 @@ def add_item_to_inventory(inventory, item):
     item_key = get_item_key(item)
     for existing_item in inventory:
         if get_item_key(existing_item) == item_key:
-            existing_item['quantity'] = existing_item.get('quantity', 1) + 1
+            existing_item['quantity'] = existing_item.get('quantity', 1) + quantity
             return
     
-    item['quantity'] = 1
+    item['quantity'] = quantity
     inventory.append(item)
 
 
 def remove_item_from_inventory(inventory, item, quantity=1):
     """Remove item(s) from inventory"""
+    if hasattr(inventory, 'remove_item'):
+        return inventory.remove_item(item, quantity)
+    
     if item.get('type') in ['weapon', 'armor']:
         if item in inventory:
             inventory.remove(item)
@@ -45,6 +57,79 @@ def remove_item_from_inventory(inventory, item, quantity=1):
     return False
 
 
+def _remove_identical(inventory, item):
+    """Remove this very object (list.remove would take the first equal one)"""
+    for position, existing in enumerate(inventory):
+        if existing is item:
+            del inventory[position]
+            return
+
+
+def apply_inventory_changes(inventory, changes):
+    """Apply ``(item, quantity delta)`` changes all together, or none of them.
+
+    Raises InventoryError, leaving the inventory as it was, if a removal
+    asks for more than the inventory holds.
+    """
+    if hasattr(inventory, 'apply'):
+        # InventoryIndex (Player.inventory): one update per stack
+        inventory.apply(changes)
+        return
+    
+    # Net change per stack key; gear is added or removed one item per change
+    totals = {}
+    gear_in = []
+    gear_out = []
+    for item, delta in changes:
+        item_key = get_item_key(item)
+        if item_key is None:
+            if delta > 0:
+                gear_in.append(item)
+            elif delta < 0:
+                # The same object, else the first equal one not already taken
+                candidates = [existing for existing in inventory
+                              if (existing is item or existing == item)
+                              and not any(existing is out for out in gear_out)]
+                held = next((existing for existing in candidates if existing is item), None)
+                if held is None and candidates:
+                    held = candidates[0]
+                if held is None:
+                    raise InventoryError(f"{item.get('name', 'Item')} is not in the inventory")
+                gear_out.append(held)
+        else:
+            totals.setdefault(item_key, [item, 0])[1] += delta
+    
+    # Check every removal before changing anything
+    stacks = {}
+    for existing in inventory:
+        item_key = get_item_key(existing)
+        if item_key in totals:
+            stacks.setdefault(item_key, []).append(existing)
+    for item_key, (item, delta) in totals.items():
+        held = sum(get_item_quantity(existing) for existing in stacks.get(item_key, ()))
+        if delta < 0 and held < -delta:
+            raise InventoryError(f"Not enough {item.get('name', 'items')}: have {held}, need {-delta}")
+    
+    for held in gear_out:
+        _remove_identical(inventory, held)
+    inventory.extend(gear_in)
+    for item_key, (item, delta) in totals.items():
+        if delta > 0:
+            add_item_to_inventory(inventory, item.copy(), delta)
+        elif delta < 0:
+            # Take from each stack in turn until the quantity is used up
+            remaining = -delta
+            for existing in stacks[item_key]:
+                current_qty = get_item_quantity(existing)
+                if current_qty <= remaining:
+                    _remove_identical(inventory, existing)
+                else:
+                    existing['quantity'] = current_qty - remaining
+                remaining -= current_qty
+                if remaining <= 0:
+                    break
+
+
 def get_item_quantity(item):
     """Get item quantity"""
     return item.get('quantity', 1)
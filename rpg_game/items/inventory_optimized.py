@@ -1,172 +1,411 @@
-"""Optimized inventory with O(1) lookups"""
-from collections import defaultdict
-from typing import Dict, List, Any, Optional, Tuple
+"""Indexed inventory container
+
+``Player.inventory`` is an ``InventoryIndex``: a dense list of item dicts
+plus three hash indexes - position by item identity, stacks by stacking key
+and items by name. Items are interned into flyweight ``ItemStack`` entries
+on the way in (see registry.py), so the stacking key of a known item is an
+integer. Adding, finding and removing an
+item are O(1) however large the hoard:
+
+* a removal moves the last item into the freed position (swap-remove), so
+  no other position changes and the indexes need one update each. The
+  price is that removing an item changes the display order of the last one;
+* the key fields of an item (name, type, sell value, heal) must not be
+  changed in place while it is in the inventory - replace the item instead.
+
+Multi-item changes (cooking a fish into a meal, selling or buying several
+at once, undoing a lair run) go through ``apply``: the deltas are summed
+per stack and checked against the inventory before anything changes, each
+stack is then updated once, and an undo log puts everything back if an
+update fails half way. ``snapshot``/``restore`` build on it to roll the
+inventory back without deep-copying it.
+
+It behaves like a list for the callers that iterate, index, ``len``,
+``append``, ``remove`` or ``deepcopy`` it, and serializes as a plain list
+through ``to_list`` (``Player.to_dict``).
+
+The index also keeps per-type partitions, updated as items come and go, for
+the queries that used to filter the whole inventory: healing items ordered
+by heal for combat, equippable gear for the equipment menu, sellable items
+for the shops and per-type counts (talismans for their achievements). Like
+the stack key, an item's type, sell value and heal decide its partitions,
+so they follow the same no-change-in-place rule.
+"""
+from bisect import insort
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from .inventory import (
+    InventoryError, get_item_key, add_item_to_inventory, remove_item_from_inventory, apply_inventory_changes,
+    get_item_quantity
+)
+from .registry import intern_item, plain_item, stack_key
+
+__all__ = [
+    'InventoryIndex', 'InventoryError', 'get_item_key', 'add_item_to_inventory', 'remove_item_from_inventory',
+    'apply_inventory_changes', 'get_item_quantity'
+]
+
+Item = Dict[str, Any]
+Change = Tuple[Item, int]  # (item, quantity delta)
+
+EQUIPPABLE_TYPES = ('weapon', 'armor', 'tool')
 
 
 class InventoryIndex:
-    """Inventory with O(1) hash-based lookups"""
-    
-    def __init__(self):
-        self._items: List[Dict[str, Any]] = []
-        self._index: Dict[Tuple, List[int]] = defaultdict(list)
-        self._name_index: Dict[str, List[int]] = defaultdict(list)
-    
-    def add_item(self, item: Dict[str, Any]) -> None:
-        """Add item with indexing"""
-        item_key = self._get_item_key(item)
-        list_index = len(self._items)
-        self._items.append(item)
-        
-        if item_key is not None:
-            self._index[item_key].append(list_index)
-        
-        item_name = item.get('name', '')
-        if item_name:
-            self._name_index[item_name].append(list_index)
-    
-    def remove_item(self, item: Dict[str, Any], quantity: int = 1) -> bool:
-        """Remove item(s) from inventory"""
-        item_key = self._get_item_key(item)
-        
-        if item_key is None:
-            # Non-stackable item - remove directly
+    """Inventory with O(1) add, find and remove by stack key, name or identity"""
+
+    __slots__ = ('_items', '_positions', '_stacks', '_names', '_types', '_equippable', '_sellable',
+                 '_heals', '_heal_levels')
+
+    def __init__(self, items: Iterable[Item] = ()):
+        self._items: List[Item] = []
+        self._positions: Dict[int, int] = {}  # id(item) -> position in _items
+        self._stacks: Dict[Tuple, Dict[int, Item]] = {}  # stacking key -> items (insertion ordered)
+        self._names: Dict[str, Dict[int, Item]] = {}
+        # Partitions (id(item) -> item, in the order the items came in)
+        self._types: Dict[str, Dict[int, Item]] = {}
+        self._equippable: Dict[int, Item] = {}
+        self._sellable: Dict[int, Item] = {}
+        self._heals: Dict[int, Dict[int, Item]] = {}  # heal -> healing consumables
+        self._heal_levels: List[int] = []  # keys of _heals, ascending
+        for item in items:
+            self.append(item)
+
+    # Indexing
+
+    def _index(self, item: Item) -> None:
+        key = stack_key(item)
+        if key is not None:
+            self._stacks.setdefault(key, {})[id(item)] = item
+        name = item.get('name', '')
+        if name:
+            self._names.setdefault(name, {})[id(item)] = item
+        item_type = item.get('type')
+        self._types.setdefault(item_type, {})[id(item)] = item
+        if item_type in EQUIPPABLE_TYPES:
+            self._equippable[id(item)] = item
+        if 'sell_value' in item:
+            self._sellable[id(item)] = item
+        heal = item.get('heal', 0)
+        if item_type == 'consumable' and heal > 0:
+            if heal not in self._heals:
+                self._heals[heal] = {}
+                insort(self._heal_levels, heal)
+            self._heals[heal][id(item)] = item
+
+    def _unindex(self, item: Item) -> None:
+        for index, key in ((self._stacks, stack_key(item)), (self._names, item.get('name', '')),
+                           (self._types, item.get('type')), (self._heals, item.get('heal', 0))):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(id(item), None)
+                if not bucket:
+                    del index[key]
+                    if index is self._heals:
+                        self._heal_levels.remove(key)
+        self._equippable.pop(id(item), None)
+        self._sellable.pop(id(item), None)
+
+    def _position(self, item: Item) -> int:
+        """Position of ``item`` (the same object, else the first equal one)"""
+        position = self._positions.get(id(item))
+        if position is not None:
+            return position
+        key = stack_key(item)
+        candidates = self._stacks.get(key, {}).values() if key is not None else self._items
+        for candidate in candidates:
+            if candidate == item:
+                return self._positions[id(candidate)]
+        raise ValueError("item is not in the inventory")
+
+    def _remove_at(self, position: int) -> Item:
+        """Swap-remove the item at ``position``"""
+        item = self._items[position]
+        last = self._items.pop()
+        if last is not item:
+            self._items[position] = last
+            self._positions[id(last)] = position
+        del self._positions[id(item)]
+        self._unindex(item)
+        return item
+
+    # Stacking API
+
+    def add_item(self, item: Item, quantity: int = 1) -> Item:
+        """Add to the matching stack or start a new one; returns the stack"""
+        item = intern_item(item)
+        key = stack_key(item)
+        if key is not None:
+            stack = self.find_stack(key)
+            if stack is not None:
+                stack['quantity'] = stack.get('quantity', 1) + quantity
+                return stack
+            item['quantity'] = quantity
+        self.append(item)
+        return item
+
+    def remove_item(self, item: Item, quantity: int = 1) -> bool:
+        """Take ``quantity`` from the matching stack (or remove a gear item)"""
+        key = stack_key(item)
+        if key is None:
             try:
-                list_index = self._items.index(item)
-                self._remove_at_index(list_index)
-                return True
+                self._remove_at(self._position(item))
             except ValueError:
                 return False
-        
-        # Find matching item in index
-        if item_key not in self._index:
+            return True
+        stack = self.find_stack(key)
+        if stack is None:
             return False
-        
-        # Find the item with matching key
-        for list_index in self._index[item_key]:
-            existing_item = self._items[list_index]
-            current_qty = existing_item.get('quantity', 1)
-            
+        current_qty = stack.get('quantity', 1)
+        if current_qty <= quantity:
+            self._remove_at(self._positions[id(stack)])
+        else:
+            stack['quantity'] = current_qty - quantity
+        return True
+
+    def count(self, key: Hashable) -> int:
+        """Total quantity held under a stacking key"""
+        return sum(stack.get('quantity', 1) for stack in self._stacks.get(key, {}).values())
+
+    # Batches
+
+    def apply(self, changes: Iterable[Change]) -> None:
+        """Apply ``(item, quantity delta)`` changes all together, or none of them.
+
+        Deltas for the same stack are summed first. New stacks are copies of
+        the given item; gear is added or removed one item per change, whatever
+        the size of its delta. Raises InventoryError, before changing
+        anything, if a removal asks for more than the inventory holds.
+        """
+        totals: Dict[Hashable, List] = {}  # stacking key -> [item, net delta]
+        gear_in: List[Item] = []
+        gear_out: Dict[int, Item] = {}
+        for item, delta in changes:
+            key = stack_key(item)
+            if key is None:
+                if delta > 0:
+                    gear_in.append(item)
+                elif delta < 0:
+                    try:
+                        held = self._items[self._position(item)]
+                    except ValueError:
+                        raise InventoryError(f"{item.get('name', 'Item')} is not in the inventory") from None
+                    if id(held) in gear_out:
+                        raise InventoryError(f"{item.get('name', 'Item')} is removed twice")
+                    gear_out[id(held)] = held
+            else:
+                totals.setdefault(key, [item, 0])[1] += delta
+        for key, (item, delta) in totals.items():
+            if delta < 0 and self.count(key) < -delta:
+                raise InventoryError(
+                    f"Not enough {item.get('name', 'items')}: have {self.count(key)}, need {-delta}")
+
+        undo: List[Tuple[Callable, tuple]] = []
+        try:
+            for held in gear_out.values():
+                self._remove_at(self._positions[id(held)])
+                undo.append((self.append, (held,)))
+            for item in gear_in:
+                self.append(item)
+                undo.append((self.remove, (self._items[-1],)))
+            for key, (item, delta) in totals.items():
+                if delta > 0:
+                    self._grow(key, item, delta, undo)
+                elif delta < 0:
+                    self._shrink(key, -delta, undo)
+        except Exception:
+            for action, args in reversed(undo):
+                action(*args)
+            raise
+
+    def _grow(self, key: Hashable, item: Item, quantity: int, undo: List) -> None:
+        stack = self.find_stack(key)
+        if stack is None:
+            stack = intern_item(dict(item))
+            stack['quantity'] = quantity
+            self.append(stack)
+            undo.append((self.remove, (stack,)))
+        else:
+            old_qty = stack.get('quantity', 1)
+            stack['quantity'] = old_qty + quantity
+            undo.append((stack.__setitem__, ('quantity', old_qty)))
+
+    def _shrink(self, key: Hashable, quantity: int, undo: List) -> None:
+        for stack in list(self._stacks[key].values()):
+            current_qty = stack.get('quantity', 1)
             if current_qty <= quantity:
-                # Remove entire stack
-                self._remove_at_index(list_index)
-                return True
+                self._remove_at(self._positions[id(stack)])
+                undo.append((self.append, (stack,)))
             else:
-                # Decrease quantity
-                existing_item['quantity'] = current_qty - quantity
-                return True
-        
-        return False
-    
-    def find_item(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Find item (O(1))"""
-        item_key = self._get_item_key(item)
-        if item_key is None:
-            try:
-                return self._items[self._items.index(item)]
-            except ValueError:
-                return None
-        
-        if item_key not in self._index:
+                stack['quantity'] = current_qty - quantity
+                undo.append((stack.__setitem__, ('quantity', current_qty)))
+            quantity -= current_qty
+            if quantity <= 0:
+                return
+
+    def snapshot(self) -> List[Tuple[Item, int]]:
+        """(item, quantity) pairs to ``restore`` later; items are shared, not copied"""
+        return [(item, item.get('quantity', 1)) for item in self._items]
+
+    def restore(self, snapshot: List[Tuple[Item, int]]) -> None:
+        """Bring the contents back to a ``snapshot`` in one batch (the order may differ)"""
+        wanted: Dict[Hashable, List] = {}
+        wanted_gear: Dict[int, Item] = {}
+        for item, quantity in snapshot:
+            key = stack_key(item)
+            if key is None:
+                wanted_gear[id(item)] = item
+            else:
+                wanted.setdefault(key, [item, 0])[1] += quantity
+        changes: List[Change] = []
+        for item in self._items:
+            if stack_key(item) is None and wanted_gear.pop(id(item), None) is None:
+                changes.append((item, -1))
+        changes.extend((item, 1) for item in wanted_gear.values())
+        for key in self._stacks.keys() - wanted.keys():
+            changes.append((self.find_stack(key), -self.count(key)))
+        for key, (item, quantity) in wanted.items():
+            delta = quantity - self.count(key)
+            if delta:
+                changes.append((item, delta))
+        self.apply(changes)
+
+    def find_stack(self, key: Tuple) -> Optional[Item]:
+        """First stack with this stacking key"""
+        bucket = self._stacks.get(key)
+        return next(iter(bucket.values())) if bucket else None
+
+    def find_item(self, item: Item) -> Optional[Item]:
+        """The stack ``item`` would go to, or ``item`` itself for gear"""
+        key = stack_key(item)
+        if key is not None:
+            return self.find_stack(key)
+        try:
+            return self._items[self._position(item)]
+        except ValueError:
             return None
-        
-        list_index = self._index[item_key][0]
-        return self._items[list_index]
-    
-    def find_by_name(self, name: str) -> List[Dict[str, Any]]:
-        """Find items by name (O(1))"""
-        if name not in self._name_index:
-            return []
-        return [self._items[i] for i in self._name_index[name]]
-    
-    def get_all_items(self) -> List[Dict[str, Any]]:
-        """Get all items"""
+
+    def find_by_name(self, name: str) -> List[Item]:
+        """Every item with this name"""
+        return list(self._names.get(name, {}).values())
+
+    # Partitions
+
+    def items_of_type(self, item_type: str) -> List[Item]:
+        """Every item of this type"""
+        return list(self._types.get(item_type, {}).values())
+
+    def count_type(self, item_type: str) -> int:
+        """Number of entries (stacks count once) of this type"""
+        return len(self._types.get(item_type, ()))
+
+    def healing_items(self) -> List[Item]:
+        """Consumables that heal, strongest first"""
+        return [item for heal in reversed(self._heal_levels) for item in self._heals[heal].values()]
+
+    def equippable_items(self) -> List[Item]:
+        """Weapons, armor and tools"""
+        return list(self._equippable.values())
+
+    def sellable_items(self) -> List[Item]:
+        """Items with a sell value"""
+        return list(self._sellable.values())
+
+    def get_all_items(self) -> List[Item]:
         return self._items.copy()
-    
+
+    def to_list(self) -> List[Item]:
+        """Plain list of plain dicts, for saving"""
+        return [plain_item(item) for item in self._items]
+
+    # List API
+
+    def append(self, item: Item) -> None:
+        item = intern_item(item)
+        if id(item) in self._positions:
+            # The same entry twice would share one index entry
+            item = intern_item(dict(item))
+        self._positions[id(item)] = len(self._items)
+        self._items.append(item)
+        self._index(item)
+
+    def extend(self, items: Iterable[Item]) -> None:
+        for item in items:
+            self.append(item)
+
+    def remove(self, item: Item) -> None:
+        self._remove_at(self._position(item))
+
+    def pop(self, position: int = -1) -> Item:
+        if not self._items:
+            raise IndexError("pop from empty inventory")
+        return self._remove_at(range(len(self._items))[position])
+
+    def index(self, item: Item) -> int:
+        return self._position(item)
+
     def clear(self) -> None:
-        """Clear inventory"""
         self._items.clear()
-        self._index.clear()
-        self._name_index.clear()
-    
-    def _remove_at_index(self, list_index: int) -> None:
-        """Remove item at index"""
-        if list_index >= len(self._items):
-            return
-        
-        removed_item = self._items[list_index]
-        item_key = self._get_item_key(removed_item)
-        item_name = removed_item.get('name', '')
-        
-        self._items.pop(list_index)
-        
-        if item_key is not None:
-            self._index[item_key].remove(list_index)
-            for key, indices in self._index.items():
-                self._index[key] = [i if i < list_index else i - 1 for i in indices if i != list_index]
-        
-        if item_name:
-            self._name_index[item_name].remove(list_index)
-            for name, indices in self._name_index.items():
-                self._name_index[name] = [i if i < list_index else i - 1 for i in indices if i != list_index]
-    
-    @staticmethod
-    def _get_item_key(item: Dict[str, Any]) -> Optional[Tuple]:
-        """Generate item key"""
-        if item.get('type') in ['weapon', 'armor']:
-            return None
-        return (item.get('name'), item.get('type'), item.get('sell_value'), item.get('heal', 0))
-
-
-def get_item_key(item):
-    """Generate item stacking key"""
-    return InventoryIndex._get_item_key(item)
-
-
-def add_item_to_inventory(inventory, item):
-    """Add item with stacking"""
-    if hasattr(inventory, '_index'):
-        inventory.add_item(item)
-        return
-    
-    if item.get('type') in ['weapon', 'armor']:
-        inventory.append(item)
-        return
-    
-    item_key = get_item_key(item)
-    for existing_item in inventory:
-        if get_item_key(existing_item) == item_key:
-            existing_item['quantity'] = existing_item.get('quantity', 1) + 1
+        self._positions.clear()
+        self._stacks.clear()
+        self._names.clear()
+        self._types.clear()
+        self._equippable.clear()
+        self._sellable.clear()
+        self._heals.clear()
+        self._heal_levels.clear()
+
+    def copy(self) -> 'InventoryIndex':
+        return InventoryIndex(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Item]:
+        return iter(self._items)
+
+    def __getitem__(self, position):
+        return self._items[position]
+
+    def __setitem__(self, position: int, item: Item) -> None:
+        if isinstance(position, slice):
+            raise TypeError("inventory does not support slice assignment")
+        position = range(len(self._items))[position]
+        old = self._items[position]
+        if item is old:
             return
-    
-    item['quantity'] = 1
-    inventory.append(item)
-
-
-def remove_item_from_inventory(inventory, item, quantity=1):
-    """Remove item with stacking"""
-    if hasattr(inventory, 'remove_item'):
-        return inventory.remove_item(item, quantity)
-    
-    if item.get('type') in ['weapon', 'armor']:
-        if item in inventory:
-            inventory.remove(item)
-            return True
-        return False
-    
-    item_key = get_item_key(item)
-    for existing_item in inventory:
-        if get_item_key(existing_item) == item_key:
-            current_qty = existing_item.get('quantity', 1)
-            if current_qty <= quantity:
-                inventory.remove(existing_item)
-                return True
-            else:
-                existing_item['quantity'] = current_qty - quantity
-                return True
-    return False
+        item = intern_item(item)
+        if id(item) in self._positions:
+            item = intern_item(dict(item))
+        del self._positions[id(old)]
+        self._unindex(old)
+        self._items[position] = item
+        self._positions[id(item)] = position
+        self._index(item)
+
+    def __delitem__(self, position: int) -> None:
+        self._remove_at(range(len(self._items))[position])
+
+    def __contains__(self, item) -> bool:
+        try:
+            self._position(item)
+        except (ValueError, AttributeError):
+            return False
+        return True
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, InventoryIndex):
+            return self._items == other._items
+        if isinstance(other, list):
+            return self._items == other
+        return NotImplemented
 
+    __hash__ = None
 
-def get_item_quantity(item):
-    """Get item quantity"""
-    return item.get('quantity', 1)
+    def __reduce__(self):
+        # Rebuilt from the items: the indexes hold ids, which do not survive
+        # copying or pickling
+        return InventoryIndex, (self._items,)
 
+    def __repr__(self) -> str:
+        return f"InventoryIndex({self._items!r})"
@@ -0,0 +1,343 @@
+"""Interned item definitions and flyweight inventory entries
+
+Drops, shop purchases, catches and cooked food all start as a copy of a
+table entry, so a large inventory used to hold one full dict (name,
+description, sell value, ...) per stack. The registry interns every table
+entry once instead:
+
+* ``ItemDef`` - one per entry, under a stable id ``<table>:<key>`` such as
+  ``drops:head_kid`` or ``swords:g10``, holding a read-only view of the
+  entry. Entries that stack together (same name, type, sell value and heal,
+  like the shop and drop versions of an ampul) share an integer
+  ``stack_id``;
+* ``ItemStack`` - what ``InventoryIndex`` stores: the definition, a
+  quantity and optional per-instance ``overrides`` (talisman bonuses on
+  gear, or values from an old save that no longer match the tables). It
+  reads and writes like the item dict it replaces, and ``copy``/``to_dict``
+  turn it back into a plain dict for equipping and saving.
+
+Items that match no definition (by name and type) stay plain dicts. The
+stacking key of an interned item is its ``stack_id``, so stacking and
+lookups compare integers rather than tuples of strings.
+
+The registry doubles as the item catalog: besides ids it indexes the
+definitions by table key, display name, type and grade, so lookups that
+used to scan every table (sell values in the dev tables, fish by name when
+cooking) are single dict hits. Names shared by entries that would not stack
+together are inconsistencies between tables; ``check_catalog`` reports them
+when the game starts.
+
+The tables are collected on first use: the fish, cooked fish and ore tables
+live in the skills package, which imports this one.
+"""
+from collections.abc import Mapping, MutableMapping
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+# Fields that decide which items stack (as in inventory.get_item_key)
+KEY_FIELDS = ('name', 'type', 'sell_value', 'heal')
+
+# Gear never stacks
+UNSTACKABLE_TYPES = ('weapon', 'armor')
+
+
+class _Deleted:
+    """Marks a definition field an instance does not have.
+
+    A single instance that copies and pickles by reference, so an override
+    never turns into a stray object value that cannot be saved.
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return '_DELETED'
+
+    def __copy__(self) -> '_Deleted':
+        return self
+
+    def __deepcopy__(self, memo) -> '_Deleted':
+        return self
+
+    def __repr__(self) -> str:
+        return '<deleted>'
+
+
+_DELETED = _Deleted()
+_MISSING = object()
+
+
+class ItemDef:
+    """One interned table entry"""
+
+    __slots__ = ('uid', 'item_id', 'table', 'key', 'fields', 'stack_id')
+
+    def __init__(self, uid: int, item_id: str, fields: Dict[str, Any], stack_id: int):
+        self.uid = uid
+        self.item_id = item_id
+        self.table, self.key = item_id.split(':', 1)
+        self.fields = MappingProxyType(dict(fields))
+        self.stack_id = stack_id
+
+    def __copy__(self) -> 'ItemDef':
+        return self
+
+    def __deepcopy__(self, memo) -> 'ItemDef':
+        return self
+
+    def __reduce__(self):
+        return get_item_def, (self.item_id,)
+
+    def __repr__(self) -> str:
+        return f"ItemDef({self.item_id!r})"
+
+
+class ItemStack(MutableMapping):
+    """Inventory entry: a shared definition, a quantity and per-instance overrides"""
+
+    __slots__ = ('definition', 'quantity', 'overrides')
+
+    def __init__(self, definition: ItemDef, quantity: Optional[int] = None,
+                 overrides: Optional[Dict[str, Any]] = None):
+        self.definition = definition
+        self.quantity = quantity  # None: the entry has no 'quantity' key
+        self.overrides = overrides or None
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'quantity':
+            if self.quantity is None:
+                raise KeyError(key)
+            return self.quantity
+        if self.overrides is not None:
+            value = self.overrides.get(key, _MISSING)
+            if value is _DELETED:
+                raise KeyError(key)
+            if value is not _MISSING:
+                return value
+        return self.definition.fields[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == 'quantity':
+            self.quantity = value
+            return
+        if self.overrides is None:
+            self.overrides = {}
+        self.overrides[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        if key == 'quantity':
+            self.quantity = None
+        elif key in self.definition.fields:
+            self[key] = _DELETED
+        else:
+            del self.overrides[key]
+
+    def __iter__(self) -> Iterator[str]:
+        overrides = self.overrides or {}
+        for key in self.definition.fields:
+            if overrides.get(key, _MISSING) is not _DELETED:
+                yield key
+        for key, value in overrides.items():
+            if key not in self.definition.fields and value is not _DELETED:
+                yield key
+        if self.quantity is not None:
+            yield 'quantity'
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ItemStack) and not (self.overrides or other.overrides):
+            return self.definition is other.definition and self.quantity == other.quantity
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return dict(self) == dict(other)
+
+    __hash__ = None
+
+    @property
+    def stack_key(self) -> Optional[Hashable]:
+        """Stacking key: the definition's stack id unless a key field was overridden"""
+        if self.overrides is None or not any(field in self.overrides for field in KEY_FIELDS):
+            if self.definition.fields.get('type') in UNSTACKABLE_TYPES:
+                return None
+            return self.definition.stack_id
+        return stack_key(dict(self))
+
+    def copy(self) -> Dict[str, Any]:
+        """Plain dict copy (what equipping an item stores)"""
+        return dict(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __reduce__(self):
+        # A copy gets its own overrides
+        return ItemStack, (self.definition, self.quantity, dict(self.overrides) if self.overrides else None)
+
+    def __repr__(self) -> str:
+        return f"ItemStack({self.definition.item_id!r}, quantity={self.quantity!r}, overrides={self.overrides!r})"
+
+
+_DEFINITIONS: Dict[str, ItemDef] = {}
+_BY_NAME_TYPE: Dict[Tuple, List[ItemDef]] = {}
+_STACK_IDS: Dict[Tuple, int] = {}
+
+# Catalog indexes
+_BY_KEY: Dict[str, ItemDef] = {}  # bare table key -> first definition in table order
+_BY_NAME: Dict[str, List[ItemDef]] = {}
+_BY_TABLE_NAME: Dict[Tuple[str, str], ItemDef] = {}
+_BY_TYPE: Dict[str, List[ItemDef]] = {}
+_BY_GRADE: Dict[int, List[ItemDef]] = {}
+_CONFLICTS: List[str] = []
+
+
+def item_tables() -> Dict[str, Dict[str, Dict]]:
+    """Every item table by id prefix, in lookup order (aliases such as WEAPONS are left out)"""
+    from .definitions import (
+        SWORDS, BLADES, GUNS, CROSSES, MACES, ARMOR_SETS, POTIONS, FISHING_RODS, PICKAXES, DROP_ITEMS
+    )
+    # skills/ imports this package, so its tables are only reachable lazily
+    from ..skills.fishing import FISH_TYPES, COOKED_FISH_ITEMS, GOURMET_FISH_ITEMS
+    from ..skills.mining import MINING_ORES
+    return {
+        'drops': DROP_ITEMS, 'potions': POTIONS, 'rods': FISHING_RODS, 'pickaxes': PICKAXES,
+        'fish': FISH_TYPES, 'cooked_fish': COOKED_FISH_ITEMS, 'gourmet_fish': GOURMET_FISH_ITEMS,
+        'ores': MINING_ORES, 'swords': SWORDS, 'blades': BLADES, 'guns': GUNS, 'crosses': CROSSES,
+        'maces': MACES, 'armor': ARMOR_SETS,
+    }
+
+
+def _key_tuple(item) -> Tuple:
+    return (item.get('name'), item.get('type'), item.get('sell_value'), item.get('heal', 0))
+
+
+def _registry() -> Dict[str, ItemDef]:
+    if not _DEFINITIONS:
+        for prefix, table in item_tables().items():
+            for key, entry in table.items():
+                stack_id = _STACK_IDS.setdefault(_key_tuple(entry), len(_STACK_IDS))
+                definition = ItemDef(len(_DEFINITIONS), f'{prefix}:{key}', entry, stack_id)
+                _index_definition(definition)
+        _CONFLICTS.extend(_find_conflicts())
+    return _DEFINITIONS
+
+
+def _index_definition(definition: ItemDef) -> None:
+    fields = definition.fields
+    name = fields.get('name')
+    _DEFINITIONS[definition.item_id] = definition
+    _BY_KEY.setdefault(definition.key, definition)
+    _BY_NAME_TYPE.setdefault((name, fields.get('type')), []).append(definition)
+    _BY_NAME.setdefault(name, []).append(definition)
+    _BY_TABLE_NAME.setdefault((definition.table, name), definition)
+    _BY_TYPE.setdefault(fields.get('type'), []).append(definition)
+    if 'grade' in fields:
+        _BY_GRADE.setdefault(fields['grade'], []).append(definition)
+
+
+def _find_conflicts() -> List[str]:
+    """Display names used by entries that would not stack together"""
+    conflicts = []
+    for name, definitions in _BY_NAME.items():
+        if len({definition.stack_id for definition in definitions}) > 1:
+            details = ', '.join(
+                f"{d.item_id} (type {d.fields.get('type')}, sell {d.fields.get('sell_value')}, heal {d.fields.get('heal', 0)})"
+                for d in definitions)
+            conflicts.append(f"Item name '{name}' has conflicting definitions: {details}")
+    return conflicts
+
+
+def get_item_def(item_id: str) -> ItemDef:
+    """Definition by stable id (``<table>:<key>``); KeyError if unknown"""
+    return _registry()[item_id]
+
+
+def find_by_key(key: str) -> Optional[ItemDef]:
+    """Definition for a bare table key such as a loot table's item id (first table wins)"""
+    _registry()
+    return _BY_KEY.get(key)
+
+
+def find_by_name(name: str, table: Optional[str] = None) -> Optional[ItemDef]:
+    """First definition with this display name, in ``table`` if given"""
+    _registry()
+    if table is not None:
+        return _BY_TABLE_NAME.get((table, name))
+    definitions = _BY_NAME.get(name)
+    return definitions[0] if definitions else None
+
+
+def items_of_type(item_type: str) -> List[ItemDef]:
+    _registry()
+    return list(_BY_TYPE.get(item_type, ()))
+
+
+def items_of_grade(grade: int) -> List[ItemDef]:
+    _registry()
+    return list(_BY_GRADE.get(grade, ()))
+
+
+def check_catalog() -> List[str]:
+    """Build the catalog now and log any conflicting definitions; returns them"""
+    _registry()
+    if _CONFLICTS:
+        from ..utils.logging import log_warning
+        for conflict in _CONFLICTS:
+            log_warning(conflict)
+    return list(_CONFLICTS)
+
+
+def new_item(item_id: str, quantity: Optional[int] = None) -> ItemStack:
+    """Fresh entry for a table item, sharing its definition"""
+    return ItemStack(get_item_def(item_id), quantity)
+
+
+def stack_key(item) -> Optional[Hashable]:
+    """Stacking key of any item: an integer for known items, else the field tuple"""
+    if isinstance(item, ItemStack):
+        return item.stack_key
+    if item.get('type') in UNSTACKABLE_TYPES:
+        return None
+    _registry()
+    key = _key_tuple(item)
+    return _STACK_IDS.get(key, key)
+
+
+def intern_item(item):
+    """``item`` as an ``ItemStack`` if it matches a definition by name and type, else unchanged"""
+    if type(item) is not dict:
+        return item
+    _registry()
+    candidates = _BY_NAME_TYPE.get((item.get('name'), item.get('type')))
+    if not candidates:
+        return item
+    best, best_overrides = None, None
+    for definition in candidates:
+        fields = definition.fields
+        overrides = {key: value for key, value in item.items()
+                     if key != 'quantity' and fields.get(key, _MISSING) != value}
+        for key in fields:
+            if key not in item:
+                overrides[key] = _DELETED
+        if best is None or len(overrides) < len(best_overrides):
+            best, best_overrides = definition, overrides
+            if not overrides:
+                break
+    return ItemStack(best, item.get('quantity'), best_overrides)
+
+
+def plain_item(item):
+    """A plain dict for saving (entries that are already dicts are returned as is)"""
+    return item.to_dict() if isinstance(item, ItemStack) else item
@@ -17,6 +17,32 @@ class Enemy:
         self.gold_reward = gold_reward
         self.drops = drops if drops else []
         self.is_night = is_night  # Store for combat display
+        self.is_boss = False
+        self.loot_table = None  # Compiled LootTable for self.drops, if known
+    
+    @classmethod
+    def from_scaled(cls, scaled, name=None, exp_reward=None, gold_reward=None, drops=None):
+        """Create a live enemy from a shared ScaledEnemy record.
+        
+        The record is never mutated; overrides (floor names, lair reward
+        multipliers, bonus drops) are applied to the new instance only.
+        """
+        enemy = cls(
+            name=name if name is not None else scaled.name,
+            hp=scaled.hp,
+            attack=scaled.attack,
+            defense=scaled.defense,
+            exp_reward=scaled.exp if exp_reward is None else exp_reward,
+            gold_reward=scaled.gold if gold_reward is None else gold_reward,
+            drops=list(scaled.drops) if drops is None else drops,
+            is_night=scaled.is_night
+        )
+        enemy.is_boss = scaled.is_boss
+        if drops is None:
+            # Unmodified template drops: reuse the table compiled at import
+            from ..combat.loot import get_loot_table
+            enemy.loot_table = get_loot_table(scaled.name, scaled.is_night)
+        return enemy
     
     def take_damage(self, damage):
         """
@@ -5,11 +5,14 @@ from ..constants import (
     STARTING_BASE_HP, STARTING_STR, STARTING_DEX, STARTING_AGL,
     STARTING_ATTACK, STARTING_DEFENSE, STARTING_GOLD, STARTING_STAT_POINTS,
     HP_PER_STAT_POINT, STARTING_SKILL_LEVEL, STARTING_SKILL_EXP,
-    STARTING_SKILL_EXP_TO_NEXT, STAT_POINTS_PER_LEVEL, EXP_MULTIPLIER_PER_LEVEL,
+    STARTING_SKILL_EXP_TO_NEXT, STAT_POINTS_PER_LEVEL,
     BASE_DAMAGE, STR_DAMAGE_MULTIPLIER, MAX_SKILL_LEVEL, DEFAULT_SAVE_SLOT
 )
 from ..ui import Colors, colorize, health_bar, skill_xp_bar
+from ..systems.xp_tables import CHARACTER_XP
 from ..save.system import save_game
+from ..save.migrations import migrate_save_data
+from ..items.inventory_optimized import InventoryIndex
 
 
 class Player:
@@ -54,6 +57,15 @@ class Player:
         import random
         random_offset = random.randint(0, 3600)
         self.world_anchor_timestamp = time.time() - random_offset
+    
+    @property
+    def inventory(self):
+        """Indexed inventory (see inventory_optimized.py); assigning any list of items wraps it"""
+        return self._inventory
+    
+    @inventory.setter
+    def inventory(self, items):
+        self._inventory = items if isinstance(items, InventoryIndex) else InventoryIndex(items)
         
     def to_dict(self):
         """Convert player to dictionary for saving"""
@@ -72,7 +84,7 @@ class Player:
             'attack': self.attack,
             'defense': self.defense,
             'gold': self.gold,
-            'inventory': self.inventory,
+            'inventory': self.inventory.to_list(),
             'weapon': self.weapon,
             'armor': self.armor,
             'tool': getattr(self, 'tool', None),
@@ -100,7 +112,6 @@ class Player:
     def from_dict(cls, data):
         """Create player from dictionary"""
         import time  # For world_anchor_timestamp default
-        from ..save.system import save_game  # Import here to avoid circular dependency
         
         # Ensure name is loaded correctly - use 'name' field, fallback to 'Hero' if missing
         player_name = data.get('name', 'Hero')
@@ -142,36 +153,17 @@ class Player:
         player.highest_tower_floor = data.get('highest_tower_floor', 0)
         player.achievements = data.get('achievements', [])
         
-        # Load skills (with defaults for old save files)
-        schema_version = data.get('schema', 1)
-        if schema_version < SAVE_SCHEMA_VERSION:
-            # Migration: set defaults for new skill fields
-            player.fishing_level = STARTING_SKILL_LEVEL
-            player.fishing_exp = STARTING_SKILL_EXP
-            player.fishing_exp_to_next = STARTING_SKILL_EXP_TO_NEXT
-            player.cooking_level = STARTING_SKILL_LEVEL
-            player.cooking_exp = STARTING_SKILL_EXP
-            player.cooking_exp_to_next = STARTING_SKILL_EXP_TO_NEXT
-            player.mining_level = STARTING_SKILL_LEVEL
-            player.mining_exp = STARTING_SKILL_EXP
-            player.mining_exp_to_next = STARTING_SKILL_EXP_TO_NEXT
-            # Auto-resave with new schema
-            try:
-                save_game(player)
-            except Exception as e:
-                # Log error but don't fail loading
-                from ..utils.logging import log_warning
-                log_warning(f"Failed to auto-resave player after migration: {e}")
-        else:
-            player.fishing_level = data.get('fishing_level', STARTING_SKILL_LEVEL)
-            player.fishing_exp = data.get('fishing_exp', STARTING_SKILL_EXP)
-            player.fishing_exp_to_next = data.get('fishing_exp_to_next', STARTING_SKILL_EXP_TO_NEXT)
-            player.cooking_level = data.get('cooking_level', STARTING_SKILL_LEVEL)
-            player.cooking_exp = data.get('cooking_exp', STARTING_SKILL_EXP)
-            player.cooking_exp_to_next = data.get('cooking_exp_to_next', STARTING_SKILL_EXP_TO_NEXT)
-            player.mining_level = data.get('mining_level', STARTING_SKILL_LEVEL)
-            player.mining_exp = data.get('mining_exp', STARTING_SKILL_EXP)
-            player.mining_exp_to_next = data.get('mining_exp_to_next', STARTING_SKILL_EXP_TO_NEXT)
+        # Load skills (old schemas are upgraded in memory; the next save writes them out)
+        data = migrate_save_data(data)
+        player.fishing_level = data.get('fishing_level', STARTING_SKILL_LEVEL)
+        player.fishing_exp = data.get('fishing_exp', STARTING_SKILL_EXP)
+        player.fishing_exp_to_next = data.get('fishing_exp_to_next', STARTING_SKILL_EXP_TO_NEXT)
+        player.cooking_level = data.get('cooking_level', STARTING_SKILL_LEVEL)
+        player.cooking_exp = data.get('cooking_exp', STARTING_SKILL_EXP)
+        player.cooking_exp_to_next = data.get('cooking_exp_to_next', STARTING_SKILL_EXP_TO_NEXT)
+        player.mining_level = data.get('mining_level', STARTING_SKILL_LEVEL)
+        player.mining_exp = data.get('mining_exp', STARTING_SKILL_EXP)
+        player.mining_exp_to_next = data.get('mining_exp_to_next', STARTING_SKILL_EXP_TO_NEXT)
         
         # Load location (default to eslania_city for backwards compatibility)
         player.current_location = data.get('current_location', 'eslania_city')
@@ -236,10 +228,11 @@ class Player:
     
     def level_up(self, silent=False):
         """Level up and give stat points. If silent=True, stat points are banked without prompting."""
-        if self.exp >= self.exp_to_next:
-            self.level += 1
+        # Same cap as gain_exp: XP past the max level stays in exp
+        if self.exp >= self.exp_to_next and self.level < CHARACTER_XP.max_level:
             self.exp -= self.exp_to_next
-            self.exp_to_next = int(self.exp_to_next * EXP_MULTIPLIER_PER_LEVEL)
+            self.exp_to_next = CHARACTER_XP.advance(self.level, self.exp_to_next)
+            self.level += 1
             self.stat_points += STAT_POINTS_PER_LEVEL  # Give 5 stat points per level
             # Auto-heal on level up
             self.calculate_max_hp()
@@ -251,6 +244,19 @@ class Player:
                 input("\nPress Enter to allocate stats...")
             return True
         return False
+    
+    def gain_exp(self, amount):
+        """Add XP and apply every level it reaches at once, banking the stat points.
+        Returns the number of levels gained."""
+        old_level = self.level
+        self.level, self.exp, self.exp_to_next = CHARACTER_XP.resolve(self.level, self.exp, self.exp_to_next, amount)
+        levels_gained = self.level - old_level
+        if levels_gained > 0:
+            self.stat_points += levels_gained * STAT_POINTS_PER_LEVEL
+            # Auto-heal on level up
+            self.calculate_max_hp()
+            self.hp = self.max_hp
+        return levels_gained
             
     def get_max_attack_power(self):
         """Calculate maximum attack power based on STR and talisman bonuses"""
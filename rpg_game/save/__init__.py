@@ -2,11 +2,13 @@
 
 from .system import (
     get_save_dir, get_save_paths, save_game, load_game,
-    list_save_slots, delete_save_slot, sanitize_slot_name
+    list_save_slots, delete_save_slot, rename_save_slot, sanitize_slot_name
 )
+from .writer import queue_save, flush_saves
 
 __all__ = [
     'get_save_dir', 'get_save_paths', 'save_game', 'load_game',
-    'list_save_slots', 'delete_save_slot', 'sanitize_slot_name'
+    'list_save_slots', 'delete_save_slot', 'rename_save_slot', 'sanitize_slot_name',
+    'queue_save', 'flush_saves'
 ]
 
@@ -0,0 +1,242 @@
+"""Compact binary save format
+
+A binary save is a magic header followed by length-prefixed frames:
+
+    MAGIC | format version (1 byte)
+    frame: type (1 byte) | payload length (uint32, big endian) | zlib(JSON)
+
+Frame types, in file order:
+
+* ``F`` - every player field except ``inventory`` (always first, so the
+  header fields can be read without touching the rest of the file);
+* ``K`` - item templates interned since the previous ``K`` frame. An item
+  template is the item dict without ``quantity``, stored once however many
+  inventory entries share it;
+* ``I`` - a chunk of inventory rows ``[template index, quantity]``
+  (quantity is null for items saved without one);
+* ``E`` - end marker with the frame and inventory counts, so a truncated
+  file is rejected instead of loading a partial inventory.
+
+Inventory frames hold at most ``INVENTORY_CHUNK`` rows, so both the encoder
+and ``iter_save_frames`` work one frame at a time. JSON saves are still
+read: ``loads_save`` detects the format from the first bytes. The next
+``save_game`` writes whichever format is configured, which is how a JSON
+save migrates.
+
+Binary saves keep the slot's ``save_<slot>.json`` name (and its ``.bak``,
+``.journal`` and ``.tmp`` companions), so switching formats never leaves
+two snapshots of one slot behind. The extension therefore does not tell the
+format: a ``.json`` slot may hold binary data. Tools that read save files
+should go through ``loads_save`` or ``is_binary_save`` rather than a JSON
+parser.
+"""
+import io
+import json
+import struct
+import zlib
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+
+MAGIC = b'RPGSAVE'
+FORMAT_VERSION = 1
+FRAME_HEADER = struct.Struct('>cI')
+
+FRAME_FIELDS = b'F'
+FRAME_ITEMS = b'K'
+FRAME_INVENTORY = b'I'
+FRAME_END = b'E'
+
+# Inventory rows per frame
+INVENTORY_CHUNK = 512
+COMPRESSION_LEVEL = 6
+# Refuse frames larger than this (corrupt length prefix)
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+SAVE_FORMATS = ('json', 'binary')
+
+
+class SaveFormatError(ValueError):
+    """A binary save is malformed or truncated"""
+
+
+def is_binary_save(prefix: bytes) -> bool:
+    """True if ``prefix`` (the first bytes of a save file) starts a binary save"""
+    return prefix[:len(MAGIC)] == MAGIC
+
+
+def _write_frame(out: BinaryIO, frame_type: bytes, obj) -> None:
+    payload = zlib.compress(
+        json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8'),
+        COMPRESSION_LEVEL
+    )
+    out.write(FRAME_HEADER.pack(frame_type, len(payload)))
+    out.write(payload)
+
+
+def _template_key(item) -> str:
+    """Canonical text of an item without its quantity"""
+    if isinstance(item, dict):
+        item = {k: v for k, v in item.items() if k != 'quantity'}
+    return json.dumps(item, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def encode_save(data: Dict, out: BinaryIO) -> None:
+    """Stream ``data`` (a ``Player.to_dict()`` result) to ``out`` as a binary save"""
+    out.write(MAGIC + bytes([FORMAT_VERSION]))
+    _write_frame(out, FRAME_FIELDS, {k: v for k, v in data.items() if k != 'inventory'})
+    frames = 1
+
+    inventory = data.get('inventory') or []
+    interned: Dict[str, int] = {}
+    for start in range(0, len(inventory), INVENTORY_CHUNK):
+        new_templates = []
+        rows = []
+        for item in inventory[start:start + INVENTORY_CHUNK]:
+            key = _template_key(item)
+            index = interned.get(key)
+            if index is None:
+                index = len(interned)
+                interned[key] = index
+                if isinstance(item, dict):
+                    new_templates.append({k: v for k, v in item.items() if k != 'quantity'})
+                else:
+                    new_templates.append(item)
+            quantity = item.get('quantity') if isinstance(item, dict) else None
+            rows.append([index, quantity])
+        if new_templates:
+            _write_frame(out, FRAME_ITEMS, new_templates)
+            frames += 1
+        _write_frame(out, FRAME_INVENTORY, rows)
+        frames += 1
+
+    _write_frame(out, FRAME_END, {'frames': frames, 'inventory': len(inventory)})
+
+
+def dumps_save(data: Dict, fmt: str = 'json') -> bytes:
+    """Serialize a save in ``fmt`` ('json' or 'binary')"""
+    if fmt == 'binary':
+        out = io.BytesIO()
+        encode_save(data, out)
+        return out.getvalue()
+    if fmt != 'json':
+        raise ValueError(f"Unknown save format: {fmt}")
+    if 'inventory' in data and next(reversed(data)) != 'inventory':
+        # Inventory last, so readers of the other fields can stop before it
+        data = {k: v for k, v in data.items() if k != 'inventory'} | {'inventory': data['inventory']}
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    chunk = stream.read(size)
+    if len(chunk) != size:
+        raise SaveFormatError("Binary save is truncated")
+    return chunk
+
+
+def iter_save_frames(stream: BinaryIO) -> Iterator[Tuple[bytes, object]]:
+    """Yield (frame type, decoded payload) pairs, reading one frame at a time"""
+    header = _read_exact(stream, len(MAGIC) + 1)
+    if not is_binary_save(header):
+        raise SaveFormatError("Not a binary save")
+    if header[-1] != FORMAT_VERSION:
+        raise SaveFormatError(f"Unsupported binary save version: {header[-1]}")
+    while True:
+        frame_type, length = FRAME_HEADER.unpack(_read_exact(stream, FRAME_HEADER.size))
+        if length > MAX_FRAME_SIZE:
+            raise SaveFormatError(f"Frame too large: {length} bytes")
+        try:
+            obj = json.loads(zlib.decompress(_read_exact(stream, length)))
+        except (zlib.error, ValueError) as e:
+            raise SaveFormatError(f"Corrupt {frame_type!r} frame: {e}") from e
+        yield frame_type, obj
+        if frame_type == FRAME_END:
+            return
+
+
+def decode_save(stream: BinaryIO) -> Dict:
+    """Rebuild the save dict from a binary save stream"""
+    data = None
+    templates: List = []
+    inventory: List = []
+    frames = 0
+    for frame_type, obj in iter_save_frames(stream):
+        frames += 1
+        if frame_type == FRAME_FIELDS:
+            data = obj
+        elif frame_type == FRAME_ITEMS:
+            templates.extend(obj)
+        elif frame_type == FRAME_INVENTORY:
+            try:
+                for index, quantity in obj:
+                    template = templates[index]
+                    if isinstance(template, dict):
+                        item = dict(template)
+                        if quantity is not None:
+                            item['quantity'] = quantity
+                        inventory.append(item)
+                    else:
+                        inventory.append(template)
+            except (IndexError, TypeError, ValueError) as e:
+                raise SaveFormatError(f"Corrupt inventory frame: {e}") from e
+        elif frame_type == FRAME_END:
+            if obj.get('frames') != frames - 1 or obj.get('inventory') != len(inventory):
+                raise SaveFormatError("Binary save frame count mismatch")
+    if not isinstance(data, dict):
+        raise SaveFormatError("Binary save has no field frame")
+    data['inventory'] = inventory
+    return data
+
+
+def read_save_fields(stream: BinaryIO) -> Dict:
+    """Only the non-inventory fields of a binary save (stops after the first frame)"""
+    for frame_type, obj in iter_save_frames(stream):
+        if frame_type == FRAME_FIELDS and isinstance(obj, dict):
+            return obj
+        break
+    raise SaveFormatError("Binary save has no field frame")
+
+
+def fields_from_buffer(buffer) -> Dict:
+    """Non-inventory fields of a binary save held in a bytes-like object or mmap.
+
+    Only the header and the first frame are touched.
+    """
+    start = len(MAGIC) + 1
+    if len(buffer) < start + FRAME_HEADER.size:
+        raise SaveFormatError("Binary save is truncated")
+    if buffer[start - 1] != FORMAT_VERSION:
+        raise SaveFormatError(f"Unsupported binary save version: {buffer[start - 1]}")
+    frame_type, length = FRAME_HEADER.unpack_from(buffer, start)
+    start += FRAME_HEADER.size
+    if frame_type != FRAME_FIELDS or length > MAX_FRAME_SIZE or start + length > len(buffer):
+        raise SaveFormatError("Binary save has no field frame")
+    try:
+        obj = json.loads(zlib.decompress(buffer[start:start + length]))
+    except (zlib.error, ValueError) as e:
+        raise SaveFormatError(f"Corrupt field frame: {e}") from e
+    if not isinstance(obj, dict):
+        raise SaveFormatError("Binary save has no field frame")
+    return obj
+
+
+def loads_save(payload: bytes) -> Dict:
+    """Parse a save file's contents, JSON or binary"""
+    if is_binary_save(payload):
+        return decode_save(io.BytesIO(payload))
+    return json.loads(payload)
+
+
+def loads_save_fields(payload: bytes) -> Dict:
+    """Like ``loads_save``, but binary saves skip decoding the inventory"""
+    if is_binary_save(payload):
+        return read_save_fields(io.BytesIO(payload))
+    return json.loads(payload)
+
+
+def read_save_file(path) -> Dict:
+    """Load a save file of either format, streaming binary saves frame by frame"""
+    with open(path, 'rb') as f:
+        prefix = f.read(len(MAGIC))
+        f.seek(0)
+        if is_binary_save(prefix):
+            return decode_save(f)
+        return json.loads(f.read())
@@ -0,0 +1,342 @@
+"""Batch processing of save archives
+
+``run_corpus`` streams every ``save_<slot>.json`` in a directory (either
+format, journal replayed) through a process pool. Each save is validated,
+optionally upgraded to ``SAVE_SCHEMA_VERSION`` (see migrations.py) and
+rewritten in place, and folded into ``CorpusStats``: level histogram, gold
+distribution, item frequencies and schema versions.
+
+Work is handed out in chunks of ``CHUNK_SIZE`` file names and workers send
+back one merged ``CorpusStats`` per chunk rather than the saves themselves,
+so the parent does almost no work and the pool runs as fast as the disk
+can feed it. At most a few chunks per worker are in flight, so memory stays
+flat however large the directory is.
+
+With a checkpoint file the run is resumable: every few seconds the names of
+finished saves and the stats so far are written atomically, and a rerun
+skips those names.
+
+Command line::
+
+    python -m rpg_game.save.corpus SAVE_DIR [--migrate] [--workers N] [--checkpoint FILE] [--json]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from ..config import SAVE_SCHEMA_VERSION
+from .binary_format import dumps_save, is_binary_save
+from .migrations import migrate_save_data
+from .slot_index import SAVE_FILE_RE
+from .system import read_slot_save
+from .validation import validate_and_clean_json
+
+CHUNK_SIZE = 64
+# Chunks queued per worker
+CHUNKS_IN_FLIGHT = 4
+CHECKPOINT_VERSION = 1
+CHECKPOINT_INTERVAL = 5.0  # seconds
+# Error messages kept for the report (all errors are counted)
+MAX_RECORDED_ERRORS = 100
+
+
+class CorpusStats:
+    """Mergeable aggregates over a set of saves"""
+
+    __slots__ = ('saves', 'valid', 'migrated', 'errors', 'error_samples', 'schemas',
+                 'levels', 'gold_buckets', 'gold_total', 'gold_min', 'gold_max', 'items')
+
+    def __init__(self):
+        self.saves = 0
+        self.valid = 0
+        self.migrated = 0
+        self.errors = 0
+        self.error_samples: List[Tuple[str, str]] = []
+        self.schemas: Counter = Counter()
+        self.levels: Counter = Counter()
+        # Lower bound of a power-of-ten range (0, 1, 10, 100, ...) -> saves
+        self.gold_buckets: Counter = Counter()
+        self.gold_total = 0
+        self.gold_min: Optional[int] = None
+        self.gold_max: Optional[int] = None
+        # Item name -> total quantity held across all saves
+        self.items: Counter = Counter()
+
+    def add_save(self, data: Dict, migrated: bool = False) -> None:
+        """Count one valid save"""
+        self.saves += 1
+        self.valid += 1
+        self.migrated += migrated
+        self.schemas[data.get('schema', 1)] += 1
+        self.levels[data['level']] += 1
+        gold = data['gold']
+        self.gold_buckets[gold_bucket(gold)] += 1
+        self.gold_total += gold
+        self.gold_min = gold if self.gold_min is None else min(self.gold_min, gold)
+        self.gold_max = gold if self.gold_max is None else max(self.gold_max, gold)
+        items = self.items
+        for item in data['inventory']:
+            items[item['name']] += item.get('quantity', 1)
+
+    def add_error(self, name: str, error: str) -> None:
+        """Count one save that could not be read or failed validation"""
+        self.saves += 1
+        self.errors += 1
+        if len(self.error_samples) < MAX_RECORDED_ERRORS:
+            self.error_samples.append((name, error))
+
+    def merge(self, other: 'CorpusStats') -> None:
+        """Fold another chunk's stats into this one"""
+        self.saves += other.saves
+        self.valid += other.valid
+        self.migrated += other.migrated
+        self.errors += other.errors
+        room = MAX_RECORDED_ERRORS - len(self.error_samples)
+        self.error_samples.extend(other.error_samples[:max(room, 0)])
+        self.schemas.update(other.schemas)
+        self.levels.update(other.levels)
+        self.gold_buckets.update(other.gold_buckets)
+        self.gold_total += other.gold_total
+        for bound in (other.gold_min, other.gold_max):
+            if bound is not None:
+                self.gold_min = bound if self.gold_min is None else min(self.gold_min, bound)
+                self.gold_max = bound if self.gold_max is None else max(self.gold_max, bound)
+        self.items.update(other.items)
+
+    def to_dict(self) -> Dict:
+        return {
+            'saves': self.saves,
+            'valid': self.valid,
+            'migrated': self.migrated,
+            'errors': self.errors,
+            'error_samples': [list(sample) for sample in self.error_samples],
+            'schemas': {str(k): v for k, v in sorted(self.schemas.items())},
+            'levels': {str(k): v for k, v in sorted(self.levels.items())},
+            'gold': {
+                'total': self.gold_total,
+                'mean': self.gold_total / self.valid if self.valid else 0,
+                'min': self.gold_min,
+                'max': self.gold_max,
+                'buckets': {str(k): v for k, v in sorted(self.gold_buckets.items())}
+            },
+            'items': dict(self.items.most_common())
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CorpusStats':
+        stats = cls()
+        stats.saves = data['saves']
+        stats.valid = data['valid']
+        stats.migrated = data['migrated']
+        stats.errors = data['errors']
+        stats.error_samples = [tuple(sample) for sample in data['error_samples']]
+        stats.schemas = Counter({int(k): v for k, v in data['schemas'].items()})
+        stats.levels = Counter({int(k): v for k, v in data['levels'].items()})
+        gold = data['gold']
+        stats.gold_total = gold['total']
+        stats.gold_min = gold['min']
+        stats.gold_max = gold['max']
+        stats.gold_buckets = Counter({int(k): v for k, v in gold['buckets'].items()})
+        stats.items = Counter(data['items'])
+        return stats
+
+
+def gold_bucket(gold: int) -> int:
+    """Lower bound of the power-of-ten range holding ``gold``"""
+    if gold <= 0:
+        return 0
+    return 10 ** (len(str(int(gold))) - 1)
+
+
+def _write_save_file(path: Path, payload: bytes) -> None:
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, 'wb') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+
+def process_save_file(path: Path, migrate: bool = False) -> Tuple[Dict, bool]:
+    """Read and validate one save, upgrading it on disk if ``migrate`` is set.
+
+    Returns (cleaned save dict, whether it was rewritten). Raises ValueError
+    for an invalid save and OSError if it cannot be read or written.
+    """
+    journal_path = path.with_name(path.name + '.journal')
+    data, payload = read_slot_save(path, journal_path)[:2]
+    is_valid, cleaned, error = validate_and_clean_json(data)
+    if not is_valid:
+        raise ValueError(error)
+    if not migrate or cleaned.get('schema', 1) >= SAVE_SCHEMA_VERSION:
+        return cleaned, False
+
+    upgraded = migrate_save_data(cleaned)
+    _write_save_file(path, dumps_save(upgraded, 'binary' if is_binary_save(payload) else 'json'))
+    # The journal is folded into the new snapshot
+    if journal_path.exists():
+        journal_path.unlink()
+    return upgraded, True
+
+
+def _process_chunk(save_dir: str, names: List[str], migrate: bool) -> CorpusStats:
+    """Worker entry point: stats for one chunk of save files"""
+    stats = CorpusStats()
+    for name in names:
+        try:
+            data, migrated = process_save_file(Path(save_dir) / name, migrate)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            stats.add_error(name, str(e) or type(e).__name__)
+            continue
+        stats.add_save(data, migrated)
+    return stats
+
+
+def save_file_names(save_dir: Path) -> List[str]:
+    """File names of the saves in a directory, in a stable order"""
+    with os.scandir(save_dir) as entries:
+        names = [entry.name for entry in entries if SAVE_FILE_RE.match(entry.name) and entry.is_file()]
+    names.sort()
+    return names
+
+
+def _load_checkpoint(checkpoint: Path, save_dir: Path, migrate: bool) -> Tuple[Set[str], CorpusStats]:
+    try:
+        with open(checkpoint, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return set(), CorpusStats()
+    if state.get('version') != CHECKPOINT_VERSION or state.get('save_dir') != str(save_dir) \
+            or state.get('migrate') != migrate:
+        raise ValueError(f"Checkpoint {checkpoint} belongs to a different run")
+    return set(state['done']), CorpusStats.from_dict(state['stats'])
+
+
+def _write_checkpoint(checkpoint: Path, save_dir: Path, migrate: bool, done: Set[str], stats: CorpusStats) -> None:
+    state = {
+        'version': CHECKPOINT_VERSION,
+        'save_dir': str(save_dir),
+        'migrate': migrate,
+        'done': sorted(done),
+        'stats': stats.to_dict()
+    }
+    temp_path = checkpoint.with_name(checkpoint.name + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, separators=(',', ':'))
+    os.replace(temp_path, checkpoint)
+
+
+def run_corpus(save_dir, migrate: bool = False, workers: Optional[int] = None,
+               checkpoint=None, progress: Optional[Callable[[int, int], None]] = None,
+               chunk_size: int = CHUNK_SIZE) -> CorpusStats:
+    """Validate (and optionally migrate) every save in ``save_dir``.
+
+    ``workers`` defaults to the CPU count; 0 or 1 processes everything in
+    this process. ``progress(done, total)`` is called after every chunk.
+    """
+    save_dir = Path(save_dir).resolve()
+    checkpoint = Path(checkpoint) if checkpoint is not None else None
+    done, stats = _load_checkpoint(checkpoint, save_dir, migrate) if checkpoint else (set(), CorpusStats())
+
+    names = save_file_names(save_dir)
+    total = len(names)
+    todo = [name for name in names if name not in done]
+    chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+    finished = total - len(todo)
+    last_checkpoint = time.monotonic()
+
+    def finish(chunk: List[str], chunk_stats: CorpusStats) -> None:
+        nonlocal finished, last_checkpoint
+        stats.merge(chunk_stats)
+        finished += len(chunk)
+        if checkpoint:
+            done.update(chunk)
+            if time.monotonic() - last_checkpoint >= CHECKPOINT_INTERVAL:
+                _write_checkpoint(checkpoint, save_dir, migrate, done, stats)
+                last_checkpoint = time.monotonic()
+        if progress:
+            progress(finished, total)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            finish(chunk, _process_chunk(str(save_dir), chunk, migrate))
+    else:
+        # Spawned workers: forking a process that runs the save writer thread is unsafe
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            pending = {}
+            queue = iter(chunks)
+            while True:
+                while len(pending) < workers * CHUNKS_IN_FLIGHT:
+                    chunk = next(queue, None)
+                    if chunk is None:
+                        break
+                    pending[pool.submit(_process_chunk, str(save_dir), chunk, migrate)] = chunk
+                if not pending:
+                    break
+                completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    finish(pending.pop(future), future.result())
+
+    if checkpoint:
+        _write_checkpoint(checkpoint, save_dir, migrate, done, stats)
+    return stats
+
+
+def _print_report(stats: CorpusStats) -> None:
+    report = stats.to_dict()
+    print(f"Saves: {stats.saves}  valid: {stats.valid}  migrated: {stats.migrated}  errors: {stats.errors}")
+    print("Schema versions: " + ", ".join(f"v{k}: {v}" for k, v in report['schemas'].items()))
+    print("Levels:")
+    for level, count in report['levels'].items():
+        print(f"  {level:>4}: {count}")
+    gold = report['gold']
+    print(f"Gold: mean {gold['mean']:.1f}, min {gold['min']}, max {gold['max']}")
+    for bound, count in gold['buckets'].items():
+        print(f"  >= {bound:>10}: {count}")
+    print("Most common items:")
+    for name, quantity in stats.items.most_common(20):
+        print(f"  {name}: {quantity}")
+    for name, error in stats.error_samples:
+        print(f"Error in {name}: {error}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Validate, migrate and summarize a directory of saves')
+    parser.add_argument('save_dir', help='Directory holding save_<slot>.json files')
+    parser.add_argument('--migrate', action='store_true',
+                        help=f'Rewrite saves older than schema {SAVE_SCHEMA_VERSION} in place')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--checkpoint', help='Progress file; rerunning with it resumes the run')
+    parser.add_argument('--json', action='store_true', help='Print the stats as JSON')
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+
+    def show_progress(done: int, total: int) -> None:
+        rate = done / max(time.monotonic() - started, 1e-9)
+        sys.stderr.write(f"\r{done}/{total} saves ({rate:.0f}/s)")
+        sys.stderr.flush()
+
+    stats = run_corpus(args.save_dir, migrate=args.migrate, workers=args.workers,
+                       checkpoint=args.checkpoint, progress=show_progress)
+    sys.stderr.write("\n")
+    if args.json:
+        print(json.dumps(stats.to_dict(), indent=2))
+    else:
+        _print_report(stats)
+    return 1 if stats.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
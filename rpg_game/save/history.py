@@ -0,0 +1,378 @@
+"""Deduplicated version history of save slots
+
+A slot's save file (plus its one ``.bak``) only holds the latest state, so a
+character damaged by a bug can be rolled back at most one snapshot. The
+history keeps older versions of each slot under ``<save dir>/.history``:
+
+* a version is split into chunks - the scalar fields, the achievements and
+  the inventory in blocks of ``INVENTORY_BLOCK`` items - and each chunk is
+  stored once in ``objects/`` under the sha256 of its canonical JSON, so
+  versions (and slots) share every chunk that did not change. An autosave
+  that only moved some gold stores one small fields chunk;
+* ``<slot>.json`` is the slot's manifest: one entry per version with its id,
+  time, a few summary fields and its chunk hashes. Listing reads only the
+  manifest, diffing only loads chunks whose hashes differ and restoring
+  loads one version's chunks;
+* a version is recorded after a successful write, at most once every
+  ``HISTORY_MIN_INTERVAL`` seconds per slot and never twice for the same
+  state. A ``RetentionPolicy`` then prunes old versions, and chunks no
+  manifest refers to any more are deleted.
+
+Manifests are replaced atomically and objects are written before the
+manifest that refers to them. Objects are not fsynced: after a crash a
+version may be incomplete, which ``load_version`` reports as an error
+rather than returning partial data.
+"""
+import hashlib
+import json
+import os
+import time
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+HISTORY_DIR = '.history'
+OBJECTS_DIR = 'objects'
+MANIFEST_VERSION = 1
+
+# Seconds between two recorded versions of the same slot
+HISTORY_MIN_INTERVAL = 60
+
+# Inventory items per chunk: appending items leaves earlier blocks shared
+INVENTORY_BLOCK = 64
+
+# Fields stored as their own chunk instead of inside the fields chunk
+LIST_FIELDS = ('achievements',)
+
+SUMMARY_FIELDS = ('name', 'level', 'gold', 'current_location')
+
+VERSION_ID_LENGTH = 16
+
+
+class RetentionPolicy(NamedTuple):
+    """Which versions ``prune_versions`` keeps"""
+    keep_last: int = 10  # newest versions, whatever their age
+    keep_daily: int = 7  # plus the newest version of each of this many most recent days
+
+
+DEFAULT_RETENTION = RetentionPolicy()
+
+
+class VersionInfo(NamedTuple):
+    """One manifest entry, as returned by ``list_versions``"""
+    version_id: str
+    created: float
+    summary: Dict
+
+
+# (save dir, slot) -> (time of the last recorded version, its id)
+_LAST_RECORDED: Dict[Tuple[str, str], Tuple[float, str]] = {}
+
+
+def get_history_dir(save_dir: Path) -> Path:
+    return Path(save_dir) / HISTORY_DIR
+
+
+def _manifest_path(save_dir: Path, slot_name: str) -> Path:
+    return get_history_dir(save_dir) / f'{slot_name}.json'
+
+
+def _object_path(save_dir: Path, digest: str) -> Path:
+    return get_history_dir(save_dir) / OBJECTS_DIR / digest[:2] / digest
+
+
+def _canonical(value) -> bytes:
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _put_object(save_dir: Path, value) -> str:
+    """Store a chunk (if not already stored) and return its hash"""
+    raw = _canonical(value)
+    digest = hashlib.sha256(raw).hexdigest()
+    path = _object_path(save_dir, digest)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(path.name + '.tmp')
+        temp.write_bytes(zlib.compress(raw))
+        temp.replace(path)
+    return digest
+
+
+def _get_object(save_dir: Path, digest: str):
+    try:
+        raw = zlib.decompress(_object_path(save_dir, digest).read_bytes())
+    except (OSError, zlib.error) as e:
+        raise ValueError(f"History object {digest[:12]} is missing or damaged: {e}") from e
+    if hashlib.sha256(raw).hexdigest() != digest:
+        raise ValueError(f"History object {digest[:12]} does not match its hash")
+    return json.loads(raw)
+
+
+def _load_manifest(save_dir: Path, slot_name: str) -> List[Dict]:
+    try:
+        with open(_manifest_path(save_dir, slot_name), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return []
+    versions = manifest.get('versions')
+    return versions if isinstance(versions, list) else []
+
+
+def _write_manifest(save_dir: Path, slot_name: str, versions: List[Dict]) -> None:
+    path = _manifest_path(save_dir, slot_name)
+    path.parent.mkdir(exist_ok=True)
+    temp = path.with_name(path.name + '.tmp')
+    with open(temp, 'w', encoding='utf-8') as f:
+        json.dump({'version': MANIFEST_VERSION, 'versions': versions}, f, separators=(',', ':'))
+    temp.replace(path)
+
+
+def _store_chunks(save_dir: Path, data: Dict) -> Dict:
+    """Chunk hashes of a save dict, storing any chunk not yet in the store"""
+    fields = {key: value for key, value in data.items()
+              if key != 'inventory' and key not in LIST_FIELDS}
+    inventory = data.get('inventory') or []
+    chunks = {
+        'fields': _put_object(save_dir, fields),
+        'inventory': [_put_object(save_dir, inventory[start:start + INVENTORY_BLOCK])
+                      for start in range(0, len(inventory), INVENTORY_BLOCK)],
+    }
+    for key in LIST_FIELDS:
+        if key in data:
+            chunks[key] = _put_object(save_dir, data[key])
+    return chunks
+
+
+def _entry_hashes(entry: Dict) -> Iterable[str]:
+    for value in entry.get('chunks', {}).values():
+        if isinstance(value, list):
+            yield from value
+        else:
+            yield value
+
+
+def record_version(save_dir: Path, slot_name: str, data: Dict, now: Optional[float] = None,
+                   policy: RetentionPolicy = DEFAULT_RETENTION, force: bool = False) -> Optional[str]:
+    """Add ``data`` to the slot's history; returns the new version id, or None if skipped.
+
+    Skipped when the last version is younger than ``HISTORY_MIN_INTERVAL``
+    (unless ``force``) or holds exactly the same state.
+    """
+    now = time.time() if now is None else now
+    key = (str(save_dir), slot_name)
+    last = _LAST_RECORDED.get(key)
+    if not force and last is not None and now - last[0] < HISTORY_MIN_INTERVAL:
+        return None
+
+    versions = _load_manifest(save_dir, slot_name)
+    if not force and versions and now - versions[-1].get('created', 0) < HISTORY_MIN_INTERVAL:
+        _LAST_RECORDED[key] = (versions[-1].get('created', 0), versions[-1].get('id'))
+        return None
+
+    chunks = _store_chunks(save_dir, data)
+    version_id = hashlib.sha256(_canonical(chunks)).hexdigest()[:VERSION_ID_LENGTH]
+    if versions and versions[-1].get('id') == version_id:
+        _LAST_RECORDED[key] = (now, version_id)
+        return None
+
+    versions.append({
+        'id': version_id,
+        'created': now,
+        'summary': {field: data[field] for field in SUMMARY_FIELDS if field in data},
+        'chunks': chunks,
+    })
+    _write_manifest(save_dir, slot_name, versions)
+    _LAST_RECORDED[key] = (now, version_id)
+    prune_versions(save_dir, slot_name, policy)
+    return version_id
+
+
+def list_versions(save_dir: Path, slot_name: str) -> List[VersionInfo]:
+    """The slot's versions, oldest first (reads only the manifest)"""
+    return [VersionInfo(entry['id'], entry['created'], entry.get('summary', {}))
+            for entry in _load_manifest(save_dir, slot_name)]
+
+
+def _find_entry(save_dir: Path, slot_name: str, version_id: str) -> Dict:
+    # A state revisited later (e.g. after a restore) appears twice with the same id
+    matches = list({entry['id']: entry for entry in _load_manifest(save_dir, slot_name)
+                    if entry['id'].startswith(version_id)}.values())
+    if len(matches) != 1:
+        problem = "No" if not matches else "Ambiguous"
+        raise ValueError(f"{problem} version '{version_id}' in the history of slot '{slot_name}'")
+    return matches[0]
+
+
+def _entry_data(save_dir: Path, entry: Dict) -> Dict:
+    chunks = entry['chunks']
+    data = dict(_get_object(save_dir, chunks['fields']))
+    for key in LIST_FIELDS:
+        if key in chunks:
+            data[key] = _get_object(save_dir, chunks[key])
+    inventory = []
+    for digest in chunks['inventory']:
+        inventory.extend(_get_object(save_dir, digest))
+    data['inventory'] = inventory
+    return data
+
+
+def load_version(save_dir: Path, slot_name: str, version_id: str) -> Dict:
+    """The save dict of one version (a unique prefix of its id is enough).
+
+    Raises ValueError if the version does not exist or is incomplete.
+    """
+    return _entry_data(save_dir, _find_entry(save_dir, slot_name, version_id))
+
+
+def _item_counts(items: List[Dict]) -> Counter:
+    counts: Counter = Counter()
+    for item in items:
+        counts[item.get('name')] += item.get('quantity', 1)
+    return counts
+
+
+def diff_versions(save_dir: Path, slot_name: str, old_id: str, new_id: str) -> Dict:
+    """What changed between two versions.
+
+    ``fields`` maps each changed field to ``(old, new)`` (None when absent)
+    and ``items`` maps item names to their change in quantity. Chunks with
+    the same hash in both versions are never loaded.
+    """
+    old, new = _find_entry(save_dir, slot_name, old_id), _find_entry(save_dir, slot_name, new_id)
+    old_chunks, new_chunks = old['chunks'], new['chunks']
+    fields: Dict = {}
+
+    def compare(before: Dict, after: Dict) -> None:
+        for key in before.keys() | after.keys():
+            if before.get(key) != after.get(key):
+                fields[key] = (before.get(key), after.get(key))
+
+    if old_chunks['fields'] != new_chunks['fields']:
+        compare(_get_object(save_dir, old_chunks['fields']), _get_object(save_dir, new_chunks['fields']))
+    for key in LIST_FIELDS:
+        if old_chunks.get(key) != new_chunks.get(key):
+            before = _get_object(save_dir, old_chunks[key]) if key in old_chunks else None
+            after = _get_object(save_dir, new_chunks[key]) if key in new_chunks else None
+            fields[key] = (before, after)
+
+    items: Dict = {}
+    if old_chunks['inventory'] != new_chunks['inventory']:
+        # Blocks present in both versions cancel out and are skipped
+        shared = Counter(old_chunks['inventory']) & Counter(new_chunks['inventory'])
+        counts: Counter = Counter()
+        for digest in (Counter(new_chunks['inventory']) - shared).elements():
+            counts.update(_item_counts(_get_object(save_dir, digest)))
+        for digest in (Counter(old_chunks['inventory']) - shared).elements():
+            counts.subtract(_item_counts(_get_object(save_dir, digest)))
+        items = {name: change for name, change in counts.items() if change}
+    return {'fields': fields, 'items': items}
+
+
+def restore_version(slot_name: str, version_id: str) -> Dict:
+    """Write a past version back as the slot's current save and return it.
+
+    The current state is recorded first, so a restore can itself be undone.
+    """
+    from . import system  # system.py imports this module
+    system._flush_background_saves()
+    slot_name = system.sanitize_slot_name(slot_name)
+    save_dir = system.get_save_dir()
+    with system._WRITE_LOCK:
+        data = load_version(save_dir, slot_name, version_id)
+        current = _load_current(slot_name)
+        if current is not None:
+            record_version(save_dir, slot_name, current, force=True)
+        system.write_save_data(slot_name, data)
+    return data
+
+
+def _load_current(slot_name: str) -> Optional[Dict]:
+    from .system import get_save_paths, read_slot_save
+    paths = get_save_paths(slot_name)
+    try:
+        return read_slot_save(paths['save'], paths['journal'])[0]
+    except (OSError, ValueError):
+        return None
+
+
+def _versions_to_keep(versions: List[Dict], policy: RetentionPolicy) -> Set[str]:
+    keep = {entry['id'] for entry in versions[-policy.keep_last:]} if policy.keep_last > 0 else set()
+    days = set()
+    for entry in reversed(versions):
+        day = time.strftime('%Y-%m-%d', time.localtime(entry['created']))
+        if day not in days:
+            if len(days) >= policy.keep_daily:
+                break
+            days.add(day)
+            keep.add(entry['id'])
+    return keep
+
+
+def prune_versions(save_dir: Path, slot_name: str, policy: RetentionPolicy = DEFAULT_RETENTION) -> int:
+    """Drop versions the policy does not keep; returns how many were dropped"""
+    versions = _load_manifest(save_dir, slot_name)
+    keep = _versions_to_keep(versions, policy)
+    kept = [entry for entry in versions if entry['id'] in keep]
+    dropped = len(versions) - len(kept)
+    if dropped:
+        _write_manifest(save_dir, slot_name, kept)
+        collect_garbage(save_dir)
+    return dropped
+
+
+def forget_history(save_dir: Path, slot_name: str) -> None:
+    """Remove a slot's history (chunks shared with other slots stay)"""
+    _LAST_RECORDED.pop((str(save_dir), slot_name), None)
+    try:
+        _manifest_path(save_dir, slot_name).unlink()
+    except FileNotFoundError:
+        return
+    collect_garbage(save_dir)
+
+
+def rename_history(save_dir: Path, old_slot: str, new_slot: str) -> None:
+    """Move a slot's history along with a renamed slot"""
+    _LAST_RECORDED.pop((str(save_dir), old_slot), None)
+    _LAST_RECORDED.pop((str(save_dir), new_slot), None)
+    try:
+        _manifest_path(save_dir, old_slot).replace(_manifest_path(save_dir, new_slot))
+    except FileNotFoundError:
+        pass
+
+
+def collect_garbage(save_dir: Path) -> int:
+    """Delete objects no manifest refers to; returns how many were deleted"""
+    history_dir = get_history_dir(save_dir)
+    referenced: Set[str] = set()
+    try:
+        manifests = [path for path in history_dir.iterdir() if path.suffix == '.json']
+    except FileNotFoundError:
+        return 0
+    for path in manifests:
+        for entry in _load_manifest(save_dir, path.stem):
+            referenced.update(_entry_hashes(entry))
+
+    deleted = 0
+    objects_dir = history_dir / OBJECTS_DIR
+    if not objects_dir.exists():
+        return 0
+    for bucket in objects_dir.iterdir():
+        for path in bucket.iterdir():
+            if path.name not in referenced:
+                try:
+                    path.unlink()
+                    deleted += 1
+                except OSError:
+                    pass
+    return deleted
+
+
+def history_size(save_dir: Path) -> int:
+    """Bytes used by all stored chunks"""
+    objects_dir = get_history_dir(save_dir) / OBJECTS_DIR
+    if not objects_dir.exists():
+        return 0
+    return sum(entry.stat().st_size for bucket in objects_dir.iterdir() for entry in os.scandir(bucket))
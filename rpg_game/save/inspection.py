@@ -0,0 +1,182 @@
+"""Read-only inspection of save files
+
+Menus and dashboards that only show a few fields (name, level, gold,
+location) do not need the inventory or a ``Player``. ``inspect_save`` maps
+the file with ``mmap`` and reads just the requested top-level fields:
+
+* binary saves: the header and the first (field) frame, nothing else;
+* JSON saves: a scanner walks the top-level object and decodes only the
+  wanted values. Anything else, the inventory included, is skipped by
+  matching brackets with a regex rather than being parsed, and the scan
+  stops as soon as every wanted field has been found. ``dumps_save`` writes
+  the inventory last, so for current saves it is never touched at all.
+
+Journaled fields (see journal.py) are applied on top, so the result matches
+what ``load_game`` would see. Nothing here writes or caches anything, and
+nothing past the last wanted field is checked: a save damaged further on
+still inspects fine and is only rejected when loaded.
+"""
+import hashlib
+import json
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, Optional, Tuple
+
+from .binary_format import SaveFormatError, fields_from_buffer, is_binary_save
+from .journal import SNAPSHOT_ID_LENGTH
+
+SUMMARY_FIELDS = ('name', 'level', 'gold', 'current_location', 'schema', 'save_slot')
+
+_WHITESPACE = re.compile(rb'\s*')
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+# Everything up to the next bracket, stepping over whole strings
+_NO_BRACKETS = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*', re.S)
+_SCALAR = re.compile(rb'[^,}\]\s]+')
+_OPEN = frozenset(b'[{')
+
+
+def _skip_ws(buffer, pos: int) -> int:
+    return _WHITESPACE.match(buffer, pos).end()
+
+
+def _value_end(buffer, pos: int) -> int:
+    """Offset just past the JSON value starting at ``pos``"""
+    first = buffer[pos:pos + 1]
+    if first == b'"':
+        match = _STRING.match(buffer, pos)
+    elif first in (b'[', b'{'):
+        depth = 0
+        size = len(buffer)
+        while pos < size:
+            pos = _NO_BRACKETS.match(buffer, pos).end()
+            if pos >= size:
+                break
+            depth += 1 if buffer[pos] in _OPEN else -1
+            pos += 1
+            if depth == 0:
+                return pos
+        raise SaveFormatError("Unterminated JSON value")
+    else:
+        match = _SCALAR.match(buffer, pos)
+    if match is None:
+        raise SaveFormatError(f"Malformed JSON value at offset {pos}")
+    return match.end()
+
+
+def json_fields(buffer, wanted: FrozenSet[str]) -> Dict:
+    """The ``wanted`` top-level fields of a JSON object, skipping the rest unparsed"""
+    found: Dict = {}
+    pos = _skip_ws(buffer, 0)
+    if buffer[pos:pos + 1] != b'{':
+        raise SaveFormatError("Save is not a JSON object")
+    pos = _skip_ws(buffer, pos + 1)
+    if buffer[pos:pos + 1] == b'}':
+        return found
+    while True:
+        match = _STRING.match(buffer, pos)
+        if match is None:
+            raise SaveFormatError(f"Expected a key at offset {pos}")
+        key = json.loads(match.group())
+        pos = _skip_ws(buffer, match.end())
+        if buffer[pos:pos + 1] != b':':
+            raise SaveFormatError(f"Expected ':' at offset {pos}")
+        pos = _skip_ws(buffer, pos + 1)
+        end = _value_end(buffer, pos)
+        if key in wanted:
+            found[key] = json.loads(buffer[pos:end])
+            if len(found) == len(wanted):
+                return found
+        pos = _skip_ws(buffer, end)
+        separator = buffer[pos:pos + 1]
+        if separator == b'}':
+            return found
+        if separator != b',':
+            raise SaveFormatError(f"Expected ',' at offset {pos}")
+        pos = _skip_ws(buffer, pos + 1)
+
+
+def _overlay_journal(journal_path: Path, found: Dict, wanted: FrozenSet[str], base: str) -> None:
+    """Apply the journal's field changes for snapshot ``base`` (same stopping rules as replay)"""
+    try:
+        f = open(journal_path, 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict) or record.get('base') != base:
+                    break
+                removed = [key for key in record.get('del', []) if key in wanted]
+                changed = {key: value for key, value in record.get('set', {}).items() if key in wanted}
+            except (ValueError, TypeError, AttributeError):
+                break
+            for key in removed:
+                found.pop(key, None)
+            found.update(changed)
+
+
+def _inspect(path: Path, wanted: FrozenSet[str], checksum: bool) -> Tuple[Dict, Optional[str]]:
+    journal_path = path.with_name(path.name + '.journal')
+    # Checked once: a journal created after this (by a background save) is
+    # simply not overlaid, rather than overlaid without a snapshot id
+    has_journal = journal_path.exists()
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise SaveFormatError("Save file is empty")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if is_binary_save(buffer[:16]):
+                fields = fields_from_buffer(buffer)
+                found = {key: fields[key] for key in wanted if key in fields}
+            else:
+                found = json_fields(buffer, wanted)
+            digest = None
+            if checksum or has_journal:
+                digest = hashlib.sha256(buffer).hexdigest()
+    if has_journal:
+        _overlay_journal(journal_path, found, wanted, digest[:SNAPSHOT_ID_LENGTH])
+    return found, digest
+
+
+def inspect_save(path, fields: Iterable[str] = SUMMARY_FIELDS) -> Dict:
+    """Selected top-level fields of a save file (absent fields are left out).
+
+    Raises OSError if the file cannot be read and ValueError if it is not a
+    save.
+    """
+    return _inspect(Path(path), frozenset(fields), False)[0]
+
+
+def inspect_save_checksum(path, fields: Iterable[str] = SUMMARY_FIELDS) -> Tuple[Dict, str]:
+    """Like ``inspect_save``, also returning the sha256 of the snapshot file"""
+    return _inspect(Path(path), frozenset(fields), True)
+
+
+def inspect_slot(slot_name, fields: Iterable[str] = SUMMARY_FIELDS) -> Optional[Dict]:
+    """Selected fields of a slot's save, or None if it is missing or unreadable"""
+    from .system import get_save_paths  # system.py imports this module (via slot_index.py)
+    try:
+        return inspect_save(get_save_paths(slot_name)['save'], fields)
+    except (OSError, ValueError):
+        return None
+
+
+def scan_saves(save_dir=None, fields: Iterable[str] = SUMMARY_FIELDS) -> Iterator[Tuple[str, Optional[Dict]]]:
+    """(slot name, fields or None if unreadable) for every save in a directory"""
+    from .slot_index import SAVE_FILE_RE  # slot_index.py imports this module
+    if save_dir is None:
+        from .system import get_save_dir
+        save_dir = get_save_dir()
+    wanted = frozenset(fields)
+    with os.scandir(save_dir) as entries:
+        names = sorted(entry.name for entry in entries if SAVE_FILE_RE.match(entry.name) and entry.is_file())
+    for name in names:
+        try:
+            found = _inspect(Path(save_dir) / name, wanted, False)[0]
+        except (OSError, ValueError):
+            found = None
+        yield SAVE_FILE_RE.match(name).group(1), found
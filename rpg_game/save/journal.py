@@ -0,0 +1,175 @@
+"""Journaled saves: a snapshot plus an append-only log of deltas
+
+Instead of rewriting the whole save (and copying the old one to ``.bak``)
+on every autosave, ``save_game`` appends one line to
+``save_<slot>.json.journal`` holding only what changed since the previous
+save: changed top-level fields and inventory operations. Once the journal
+has grown past ``JOURNAL_MAX_RECORDS`` records or half the snapshot size, the
+next save compacts it by writing a fresh snapshot and starting a new journal.
+
+Every record names the snapshot it applies to (a checksum of the snapshot
+bytes), so records from before a compaction are never replayed onto the new
+snapshot. A torn final line from a crash mid-append is ignored on load, which
+only loses the save being written at the time.
+"""
+import copy
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .binary_format import is_binary_save
+
+# Compact after this many delta records...
+JOURNAL_MAX_RECORDS = 50
+# ...or once the journal is larger than this fraction of the snapshot
+JOURNAL_MAX_RATIO = 0.5
+# Small snapshots still get at least this much journal before compacting
+JOURNAL_MIN_BYTES = 16 * 1024
+# Hex digits of the snapshot's sha256 that identify it
+SNAPSHOT_ID_LENGTH = 16
+
+
+def snapshot_id(payload: bytes) -> str:
+    """Identifier journal records use to refer to a snapshot"""
+    return hashlib.sha256(payload).hexdigest()[:SNAPSHOT_ID_LENGTH]
+
+
+class JournalState:
+    """What the last save of a slot looks like on disk"""
+
+    __slots__ = ('base', 'fmt', 'data', 'records', 'size', 'snapshot_size')
+
+    def __init__(self, base: str, fmt: str, data: Dict, records: int, size: int, snapshot_size: int):
+        self.base = base
+        self.fmt = fmt
+        self.data = data
+        self.records = records
+        self.size = size
+        self.snapshot_size = snapshot_size
+
+    def needs_compaction(self) -> bool:
+        limit = max(JOURNAL_MIN_BYTES, self.snapshot_size * JOURNAL_MAX_RATIO)
+        return self.records >= JOURNAL_MAX_RECORDS or self.size >= limit
+
+
+# Save path -> state of its snapshot and journal as last written or loaded
+_STATES: Dict[Path, JournalState] = {}
+
+
+def remember_snapshot(save_path: Path, data: Dict, payload: bytes, records: int = 0, journal_size: int = 0) -> None:
+    """Record the on-disk state after a snapshot write or a load"""
+    fmt = 'binary' if is_binary_save(payload) else 'json'
+    _STATES[save_path] = JournalState(snapshot_id(payload), fmt, copy.deepcopy(data), records, journal_size, len(payload))
+
+
+def forget_snapshot(save_path: Path) -> None:
+    """Drop cached state (the next save writes a full snapshot)"""
+    _STATES.pop(save_path, None)
+
+
+def diff_inventory(old: List, new: List) -> List:
+    """Positional inventory ops turning ``old`` into ``new``"""
+    ops = []
+    common = min(len(old), len(new))
+    for index in range(common):
+        if old[index] != new[index]:
+            ops.append(['s', index, new[index]])
+    if len(new) > common:
+        ops.append(['a', new[common:]])
+    elif len(old) > common:
+        ops.append(['t', common])
+    return ops
+
+
+def diff_save(old: Dict, new: Dict) -> Optional[Dict]:
+    """Delta record between two save dicts, or None if nothing changed"""
+    changed = {key: value for key, value in new.items()
+               if key != 'inventory' and (key not in old or old[key] != value)}
+    removed = [key for key in old if key not in new]
+    inventory = diff_inventory(old.get('inventory') or [], new.get('inventory') or [])
+    if not (changed or removed or inventory):
+        return None
+    record = {}
+    if changed:
+        record['set'] = changed
+    if removed:
+        record['del'] = removed
+    if inventory:
+        record['inv'] = inventory
+    return record
+
+
+def apply_delta(data: Dict, record: Dict) -> None:
+    """Apply one delta record to a save dict in place"""
+    data.update(record.get('set', {}))
+    for key in record.get('del', []):
+        data.pop(key, None)
+    inventory = data.setdefault('inventory', [])
+    for op in record.get('inv', []):
+        if op[0] == 's':
+            inventory[op[1]] = op[2]
+        elif op[0] == 'a':
+            inventory.extend(op[1])
+        elif op[0] == 't':
+            del inventory[op[1]:]
+
+
+def append_delta(save_path: Path, journal_path: Path, data: Dict, fmt: str) -> Optional[bool]:
+    """Append ``data``'s delta to the journal.
+
+    Returns True if a record was written, False if nothing changed and None
+    if a full snapshot is needed instead (no known base, time to compact, or
+    the snapshot is not in the configured format ``fmt`` yet).
+    """
+    state = _STATES.get(save_path)
+    if state is None or state.fmt != fmt or state.needs_compaction() or not save_path.exists():
+        return None
+    record = diff_save(state.data, data)
+    if record is None:
+        return False
+    record['base'] = state.base
+    line = (json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n').encode('utf-8')
+    with open(journal_path, 'ab') as f:
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+    state.data = copy.deepcopy(data)
+    state.records += 1
+    state.size += len(line)
+    return True
+
+
+def replay_journal(journal_path: Path, data: Dict, payload: bytes) -> Tuple[Dict, int, int, bool]:
+    """Apply every complete journal record for this snapshot to ``data``.
+
+    Returns (data, records applied, journal bytes used, clean). Replay stops
+    at the first torn, unreadable or stale line; ``clean`` is False in that
+    case so the caller can compact before appending anything after it.
+    """
+    try:
+        with open(journal_path, 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return data, 0, 0, True
+    base = snapshot_id(payload)
+    applied = 0
+    size = 0
+    for line in raw.splitlines(keepends=True):
+        if not line.endswith(b'\n'):
+            break  # Torn write from a crash
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict) or record.get('base') != base:
+                break  # Left over from before the last compaction
+            # Apply to a copy so a malformed record cannot leave half an update
+            updated = dict(data)
+            updated['inventory'] = list(data.get('inventory') or [])
+            apply_delta(updated, record)
+        except (ValueError, IndexError, KeyError, TypeError, AttributeError):
+            break
+        data = updated
+        applied += 1
+        size += len(line)
+    return data, applied, size, size == len(raw)
@@ -0,0 +1,105 @@
+"""Save schema migrations
+
+Each step upgrades a save dict from one schema version to the next and is
+registered with ``@migration(from_version)``. ``migrate_save_data`` runs the
+chain from the save's ``schema`` up to ``SAVE_SCHEMA_VERSION`` in memory only:
+loading an old save never writes anything. The upgraded player is written
+out by the next normal save, since ``Player.to_dict`` always stamps the
+current version (with a journal, that save is just a delta).
+
+Steps take a dict and return a new one without touching the input, so they
+can be tested and composed on their own.
+"""
+import time
+from typing import Callable, Dict, List, Optional
+
+from ..config import SAVE_SCHEMA_VERSION
+from ..constants import STARTING_SKILL_LEVEL, STARTING_SKILL_EXP, STARTING_SKILL_EXP_TO_NEXT
+
+Migration = Callable[[Dict], Dict]
+
+# from_version -> step producing from_version + 1
+MIGRATIONS: Dict[int, Migration] = {}
+
+SKILLS = ('fishing', 'cooking', 'mining')
+
+
+def migration(from_version: int) -> Callable[[Migration], Migration]:
+    """Register a step upgrading saves from ``from_version`` to the next version"""
+    def register(step: Migration) -> Migration:
+        if from_version in MIGRATIONS:
+            raise ValueError(f"Migration from schema {from_version} is already registered")
+        MIGRATIONS[from_version] = step
+        return step
+    return register
+
+
+def migration_path(from_version: int, to_version: int = SAVE_SCHEMA_VERSION) -> List[Migration]:
+    """Steps taking a save from ``from_version`` to ``to_version``"""
+    steps = []
+    for version in range(from_version, to_version):
+        step = MIGRATIONS.get(version)
+        if step is None:
+            raise ValueError(f"No migration registered from schema {version}")
+        steps.append(step)
+    return steps
+
+
+def migrate_save_data(data: Dict, to_version: int = SAVE_SCHEMA_VERSION) -> Dict:
+    """``data`` upgraded to ``to_version`` (returned as is if already there or newer)"""
+    version = data.get('schema', 1)
+    for step in migration_path(version, to_version):
+        data = step(data)
+    return data
+
+
+def _start_skills_fresh(data: Dict, schema: int) -> Dict:
+    upgraded = dict(data)
+    for skill in SKILLS:
+        upgraded[f'{skill}_level'] = STARTING_SKILL_LEVEL
+        upgraded[f'{skill}_exp'] = STARTING_SKILL_EXP
+        upgraded[f'{skill}_exp_to_next'] = STARTING_SKILL_EXP_TO_NEXT
+    upgraded['schema'] = schema
+    return upgraded
+
+
+@migration(1)
+def _v1_to_v2(data: Dict) -> Dict:
+    """v1 saves predate skills: every skill starts at its starting values"""
+    return _start_skills_fresh(data, 2)
+
+
+@migration(2)
+def _v2_to_v3(data: Dict) -> Dict:
+    """v2 skill progress is not carried over: skills are reset to starting values"""
+    return _start_skills_fresh(data, 3)
+
+
+def benchmark_loads(versions: Optional[List[int]] = None, inventory_size: int = 200,
+                    repeat: int = 200) -> Dict[int, float]:
+    """Seconds per load (parse, validate, migrate, build the Player) for each schema version.
+
+    Uses an in-memory JSON save so disk speed does not skew the comparison.
+    """
+    from ..models.player import Player
+    from .binary_format import dumps_save, loads_save
+    from .validation import validate_and_clean_json
+
+    template = Player('Benchmark')
+    template.inventory = [{'name': f'Item {i}', 'type': 'material', 'sell_value': i, 'quantity': i + 1}
+                          for i in range(inventory_size)]
+    results = {}
+    for version in versions or range(1, SAVE_SCHEMA_VERSION + 1):
+        data = template.to_dict()
+        data['schema'] = version
+        payload = dumps_save(data)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            Player.from_dict(validate_and_clean_json(loads_save(payload))[1])
+        results[version] = (time.perf_counter() - started) / repeat
+    return results
+
+
+if __name__ == '__main__':
+    for schema, seconds in benchmark_loads().items():
+        print(f"schema v{schema}: {seconds * 1e6:.0f} us per load")
@@ -0,0 +1,215 @@
+"""Sidecar index of save slot metadata
+
+``list_save_slots`` used to parse every save file to show a name and level.
+The index keeps one small record per slot (player name, level, mtime, size,
+schema, checksum, journal mtime and size) in ``<save dir>/.index/slots.json``:
+
+* ``save_game`` updates the slot's record right after the atomic replace;
+* when the save directory's mtime still matches the one stored in the index,
+  no save was added, replaced or removed. Appending to a journal does not
+  change that mtime (nor the snapshot's), so the journals are still stat'ed,
+  and only slots whose journal changed are read again;
+* otherwise only files whose mtime or size, or whose journal's, differ from
+  their record are read again (just the indexed fields, see inspection.py),
+  and records for removed files are dropped.
+
+The index lives in a subdirectory so rewriting it never changes the save
+directory's own mtime. It is always written atomically, and a crash between a
+save and its index update only leaves a stale record that the next refresh
+repairs.
+"""
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .inspection import inspect_save_checksum
+
+SLOT_INDEX_DIR = '.index'
+SLOT_INDEX_FILE = 'slots.json'
+SLOT_INDEX_VERSION = 1
+
+SAVE_FILE_RE = re.compile(r'save_(.+)\.json$')  # Binary saves keep the .json name (see binary_format.py)
+
+CORRUPTED_PLAYER_NAME = 'Corrupted Save'
+
+# Save fields each record is built from
+INDEXED_FIELDS = ('name', 'level', 'schema')
+
+
+def _empty_index() -> Dict:
+    return {'version': SLOT_INDEX_VERSION, 'dir_mtime_ns': None, 'slots': {}}
+
+
+def get_index_path(save_dir: Path) -> Path:
+    """Path of the slot index file for a save directory"""
+    return save_dir / SLOT_INDEX_DIR / SLOT_INDEX_FILE
+
+
+def load_slot_index(save_dir: Path) -> Dict:
+    """Read the slot index, or an empty one if it is missing or unreadable"""
+    try:
+        with open(get_index_path(save_dir), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return _empty_index()
+    if not isinstance(index, dict) or index.get('version') != SLOT_INDEX_VERSION \
+            or not isinstance(index.get('slots'), dict):
+        return _empty_index()
+    return index
+
+
+def write_slot_index(save_dir: Path, index: Dict) -> None:
+    """Atomically replace the slot index"""
+    index_path = get_index_path(save_dir)
+    index_path.parent.mkdir(exist_ok=True)
+    temp_path = index_path.with_name(index_path.name + '.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, separators=(',', ':'))
+    os.replace(temp_path, index_path)
+
+
+def _dir_mtime_ns(save_dir: Path) -> int:
+    return os.stat(save_dir).st_mtime_ns
+
+
+def _journal_stat(save_path: Path) -> Optional[List[int]]:
+    """[mtime_ns, size] of a save's journal, or None if it has none"""
+    try:
+        stat = os.stat(save_path.with_name(save_path.name + '.journal'))
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _is_current(record: Optional[Dict], stat: os.stat_result, journal: Optional[List[int]]) -> bool:
+    return record is not None and record.get('mtime_ns') == stat.st_mtime_ns \
+        and record.get('size') == stat.st_size and record.get('journal') == journal
+
+
+def slot_record(data: Optional[Dict], payload: bytes, stat: os.stat_result, checksum: Optional[str] = None,
+                journal: Optional[List[int]] = None) -> Dict:
+    """Index record for a save whose snapshot file contents are ``payload``
+    (or whose sha256 is already known as ``checksum``) and whose journal
+    has the stat ``journal``"""
+    if isinstance(data, dict):
+        player_name = data.get('name', 'Unknown')
+        level = data.get('level', 0)
+        schema = data.get('schema', 1)
+    else:
+        player_name = CORRUPTED_PLAYER_NAME
+        level = 0
+        schema = None
+    return {
+        'player_name': player_name,
+        'level': level,
+        'schema': schema,
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'checksum': checksum if checksum is not None else hashlib.sha256(payload).hexdigest(),
+        'journal': journal
+    }
+
+
+def _scan_save(path: Path, stat: os.stat_result, journal: Optional[List[int]]) -> Dict:
+    """Read the indexed fields of one save (journal applied) without loading all of it.
+
+    ``journal`` is stat'ed by the caller before reading, so an append racing
+    with the scan leaves a record the next refresh sees as stale.
+    """
+    try:
+        data, checksum = inspect_save_checksum(path, INDEXED_FIELDS)
+    except ValueError:
+        return slot_record(None, path.read_bytes(), stat, journal=journal)
+    return slot_record(data, b'', stat, checksum, journal)
+
+
+def _rescan(path: Path, stat: os.stat_result, journal: Optional[List[int]]) -> Dict:
+    try:
+        return _scan_save(path, stat, journal)
+    except OSError:
+        return slot_record(None, b'', stat, journal=journal)
+
+
+def refresh_slot_index(save_dir: Path) -> Dict:
+    """Bring the index up to date with the save directory and return it"""
+    index = load_slot_index(save_dir)
+    (save_dir / SLOT_INDEX_DIR).mkdir(exist_ok=True)
+    dir_mtime = _dir_mtime_ns(save_dir)
+    if index['dir_mtime_ns'] == dir_mtime:
+        changed = False
+        for slot_name, record in index['slots'].items():
+            path = save_dir / f'save_{slot_name}.json'
+            journal = _journal_stat(path)
+            if record.get('journal') != journal:
+                index['slots'][slot_name] = _rescan(path, os.stat(path), journal)
+                changed = True
+        if changed:
+            write_slot_index(save_dir, index)
+        return index
+
+    old_slots = index['slots']
+    slots = {}
+    with os.scandir(save_dir) as entries:
+        for entry in entries:
+            match = SAVE_FILE_RE.match(entry.name)
+            if not match or not entry.is_file():
+                continue
+            slot_name = match.group(1)
+            path = Path(entry.path)
+            stat = entry.stat()
+            journal = _journal_stat(path)
+            record = old_slots.get(slot_name)
+            if not _is_current(record, stat, journal):
+                record = _rescan(path, stat, journal)
+            slots[slot_name] = record
+
+    index = {'version': SLOT_INDEX_VERSION, 'dir_mtime_ns': dir_mtime, 'slots': slots}
+    write_slot_index(save_dir, index)
+    return index
+
+
+def dir_mtime_before_write(save_dir: Path) -> Optional[int]:
+    """Save directory mtime to pass to ``record_slot`` after writing a save"""
+    try:
+        return _dir_mtime_ns(save_dir)
+    except OSError:
+        return None
+
+
+def record_slot(save_dir: Path, slot_name: str, data: Dict, payload: Optional[bytes],
+                save_path: Path, dir_mtime_before: Optional[int]) -> None:
+    """Update one slot's record after ``save_game`` wrote it.
+
+    ``payload`` is None for journal appends, which leave the snapshot (and
+    so its checksum) unchanged.
+
+    The stored directory mtime only moves forward if the index was current
+    before this write, so changes made by anything else are still picked up
+    by the next refresh.
+    """
+    index = load_slot_index(save_dir)
+    old = index['slots'].get(slot_name)
+    journal = _journal_stat(save_path)
+    if payload is None and old is not None:
+        record = slot_record(data, b'', os.stat(save_path), old['checksum'], journal)
+    else:
+        if payload is None:
+            payload = save_path.read_bytes()
+        record = slot_record(data, payload, os.stat(save_path), journal=journal)
+    index['slots'][slot_name] = record
+    if index['dir_mtime_ns'] is not None and index['dir_mtime_ns'] == dir_mtime_before:
+        index['dir_mtime_ns'] = _dir_mtime_ns(save_dir)
+    else:
+        index['dir_mtime_ns'] = None
+    write_slot_index(save_dir, index)
+
+
+def forget_slot(save_dir: Path, slot_name: str) -> None:
+    """Drop a deleted slot's record (the next refresh re-checks the directory)"""
+    index = load_slot_index(save_dir)
+    if index['slots'].pop(slot_name, None) is not None or index['dir_mtime_ns'] is not None:
+        index['dir_mtime_ns'] = None
+        write_slot_index(save_dir, index)
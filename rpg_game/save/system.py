@@ -1,17 +1,43 @@
 """Save and load game system"""
+import copy
 import json
+import os
 import platform
 import shutil
 import re
+import threading
 from pathlib import Path
 from ..ui import Colors, colorize
 from ..constants import DEFAULT_SAVE_SLOT, MAX_SAVE_SLOT_NAME_LENGTH, SAVE_DIR_NAME
+from ..config import DEV_FLAGS
+from .binary_format import dumps_save, loads_save
+from .journal import append_delta, replay_journal, remember_snapshot, forget_snapshot
+from .history import record_version
+from .slot_index import refresh_slot_index, record_slot, dir_mtime_before_write
+from .transaction import SaveTransaction, recover_transactions
+
+# Held for every save write (journal state and slot index are not thread-safe)
+_WRITE_LOCK = threading.RLock()
+
+# Save directories already checked for interrupted transactions
+_RECOVERED_DIRS = set()
 
 
 def get_save_dir():
-    """Get the save directory, creating it if needed"""
+    """Get the save directory, creating it if needed.
+
+    The first call for a directory finishes any transaction a crash
+    interrupted (see transaction.py).
+    """
     save_dir = Path.home() / SAVE_DIR_NAME
     save_dir.mkdir(parents=True, exist_ok=True)
+    if save_dir not in _RECOVERED_DIRS:
+        _RECOVERED_DIRS.add(save_dir)
+        try:
+            recover_transactions(save_dir)
+        except OSError as e:
+            from ..utils.logging import log_error
+            log_error(f"Failed to recover interrupted save transactions: {e}")
     return save_dir
 
 
@@ -51,34 +77,39 @@ def get_save_paths(slot_name=None):
         slot_name = DEFAULT_SAVE_SLOT
     slot_name = sanitize_slot_name(slot_name)
     save_dir = get_save_dir()
+    # Also used for binary saves: the name does not tell the format (see binary_format.py)
     base_name = f'save_{slot_name}.json'
     
     save_path = save_dir / base_name
-    temp_path = save_dir / f'{base_name}.tmp'
-    backup_path = save_dir / f'{base_name}.bak'
     
     try:
         save_dir_resolved = save_dir.resolve()
         if save_path.resolve().is_relative_to(save_dir_resolved):
-            return {'save': save_path, 'temp': temp_path, 'backup': backup_path}
+            return _slot_paths(save_dir, base_name)
     except (ValueError, AttributeError):
         save_dir_str = str(save_dir.resolve())
         save_path_str = str(save_path.resolve())
         if save_path_str.startswith(save_dir_str):
-            return {'save': save_path, 'temp': temp_path, 'backup': backup_path}
+            return _slot_paths(save_dir, base_name)
     
     from ..utils.logging import log_error
     log_error(f"Path traversal attempt detected for slot: {slot_name}")
-    safe_base_name = f'save_{DEFAULT_SAVE_SLOT}.json'
+    return _slot_paths(save_dir, f'save_{DEFAULT_SAVE_SLOT}.json')
+
+
+def _slot_paths(save_dir, base_name):
+    """All files belonging to one slot"""
     return {
-        'save': save_dir / safe_base_name,
-        'temp': save_dir / f'{safe_base_name}.tmp',
-        'backup': save_dir / f'{safe_base_name}.bak'
+        'save': save_dir / base_name,
+        'temp': save_dir / f'{base_name}.tmp',
+        'backup': save_dir / f'{base_name}.bak',
+        'journal': save_dir / f'{base_name}.journal',
+        'backup_journal': save_dir / f'{base_name}.bak.journal'
     }
 
 
 def list_save_slots():
-    """List all available save slots"""
+    """List all available save slots (from the slot index, see slot_index.py)"""
     try:
         save_dir = get_save_dir()
     except (OSError, PermissionError) as e:
@@ -86,45 +117,25 @@ def list_save_slots():
         log_error(f"Failed to access save directory: {e}")
         return []
     
-    slots = []
-    
-    # Look for all save_*.json files
     try:
-        save_files = list(save_dir.glob('save_*.json'))
+        index = refresh_slot_index(save_dir)
     except (OSError, PermissionError) as e:
         from ..utils.logging import log_error
         log_error(f"Failed to list save files: {e}")
         return []
     
-    for save_file in save_files:
-        # Skip temp and backup files
-        if save_file.name.endswith('.tmp') or save_file.name.endswith('.bak'):
-            continue
-        
-        # Extract slot name from filename (save_<slot_name>.json)
-        match = re.match(r'save_(.+)\.json$', save_file.name)
-        if match:
-            slot_name = match.group(1)
-            # Try to load the save to get player info
-            try:
-                with open(save_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    player_name = data.get('name', 'Unknown')
-                    level = data.get('level', 0)
-                    slots.append({
-                        'slot_name': slot_name,
-                        'player_name': player_name,
-                        'level': level,
-                        'path': save_file
-                    })
-            except (json.JSONDecodeError, KeyError, IOError):
-                # Skip corrupted saves, but still list the slot
-                slots.append({
-                    'slot_name': slot_name,
-                    'player_name': 'Corrupted Save',
-                    'level': 0,
-                    'path': save_file
-                })
+    slots = []
+    for slot_name, record in index['slots'].items():
+        slots.append({
+            'slot_name': slot_name,
+            'player_name': record['player_name'],
+            'level': record['level'],
+            'schema': record['schema'],
+            'mtime': record['mtime_ns'] / 1e9,
+            'size': record['size'],
+            'checksum': record['checksum'],
+            'path': save_dir / f'save_{slot_name}.json'
+        })
     
     # Sort by slot name
     slots.sort(key=lambda x: x['slot_name'])
@@ -132,56 +143,169 @@ def list_save_slots():
 
 
 def delete_save_slot(slot_name):
-    """Delete a save slot and its backup files"""
+    """Delete a save slot and its backup files (all of them or none, see transaction.py)"""
+    _flush_background_saves()
     try:
         paths = get_save_paths(slot_name)
-        deleted = False
-        
-        for path_type in ['save', 'backup', 'temp']:
-            if paths[path_type].exists():
-                paths[path_type].unlink()
-                deleted = True
-        
-        return deleted
+        if not any(path.exists() for path in paths.values()):
+            return False
+        with SaveTransaction(paths['save'].parent) as transaction:
+            transaction.delete(slot_name)
+        return True
     except Exception as e:
         from ..utils.logging import log_error
         log_error(f"Failed to delete save slot '{slot_name}': {e}")
         return False
 
 
-def save_game(player, slot_name=None):
-    """Save player data to file with atomic write and backup"""
+def rename_save_slot(old_slot, new_slot):
+    """Move a slot to a new name in one transaction; True on success"""
     try:
-        # Use player's save slot if available, otherwise use provided slot or default
-        if hasattr(player, 'save_slot') and player.save_slot:
-            slot_name = player.save_slot
-        elif slot_name is None:
-            slot_name = DEFAULT_SAVE_SLOT
-        
-        slot_name = sanitize_slot_name(slot_name)
+        with SaveTransaction() as transaction:
+            transaction.rename(old_slot, new_slot)
+        return True
+    except Exception as e:
+        from ..utils.logging import log_error
+        log_error(f"Failed to rename save slot '{old_slot}' to '{new_slot}': {e}")
+        return False
+
+
+def _flush_background_saves():
+    """Let queued background saves land before slot files are read or removed"""
+    from .writer import flush_saves  # writer.py imports this module
+    flush_saves()
+
+
+def _keep_backup(paths):
+    """Make the current snapshot the backup, hard-linking instead of copying where possible"""
+    try:
+        if paths['backup'].exists():
+            paths['backup'].unlink()
+        os.link(paths['save'], paths['backup'])
+    except OSError:
+        shutil.copy2(paths['save'], paths['backup'])
+
+
+def _update_slot_index(save_dir, slot_name, data, payload, save_path, dir_mtime):
+    """Keep the slot index current; a failure here only costs a rescan later"""
+    try:
+        record_slot(save_dir, slot_name, data, payload, save_path, dir_mtime)
+    except (OSError, ValueError) as e:
+        from ..utils.logging import log_warning
+        log_warning(f"Failed to update slot index: {e}")
+
+
+def read_slot_save(save_path, journal_path):
+    """Load a snapshot and replay its journal.
+
+    Returns (data, payload, records applied, journal bytes, clean).
+    """
+    payload = save_path.read_bytes()
+    data = loads_save(payload)
+    data, records, journal_size, clean = replay_journal(journal_path, data, payload)
+    return data, payload, records, journal_size, clean
+
+
+def _player_slot(player, slot_name=None):
+    """Slot a player saves to: their own slot, else ``slot_name``, else the default"""
+    if hasattr(player, 'save_slot') and player.save_slot:
+        slot_name = player.save_slot
+    elif slot_name is None:
+        slot_name = DEFAULT_SAVE_SLOT
+    return sanitize_slot_name(slot_name)
+
+
+def snapshot_player(player, slot_name=None):
+    """(slot name, save dict) for ``player``, sharing nothing with the live player.
+
+    Safe to hand to another thread while the game keeps mutating the player.
+    """
+    slot_name = _player_slot(player, slot_name)
+    data = copy.deepcopy(player.to_dict())
+    # Store save slot in player data for future loads
+    data['save_slot'] = slot_name
+    return slot_name, data
+
+
+def write_save_data(slot_name, data):
+    """Write a save dict to a slot: a journal delta, or an atomic snapshot with backup.
+
+    Raises on failure (after removing any temp file). Writes are serialized,
+    so the background writer and direct ``save_game`` calls never interleave.
+    """
+    with _WRITE_LOCK:
         paths = get_save_paths(slot_name)
+        try:
+            _write_slot(paths, sanitize_slot_name(slot_name), data)
+        except Exception:
+            try:
+                if paths['temp'].exists():
+                    paths['temp'].unlink()
+            except (OSError, PermissionError) as cleanup_error:
+                from ..utils.logging import log_error
+                log_error(f"Failed to clean up temp save file: {cleanup_error}")
+            raise
+        try:
+            record_version(paths['save'].parent, sanitize_slot_name(slot_name), data)
+        except (OSError, ValueError) as e:
+            # History is a safety net: losing a version must not fail the save
+            from ..utils.logging import log_warning
+            log_warning(f"Could not record save history for slot '{slot_name}': {e}")
+
+
+def _write_slot(paths, slot_name, data):
+    save_dir = paths['save'].parent
+    dir_mtime = dir_mtime_before_write(save_dir)
+    
+    save_format = DEV_FLAGS.get('save_format', 'json')
+    
+    # Usually only the changes since the last save are appended to the journal
+    appended = append_delta(paths['save'], paths['journal'], data, save_format)
+    if appended is not None:
+        if appended:
+            _update_slot_index(save_dir, slot_name, data, None, paths['save'], dir_mtime)
+        return
+    
+    # Full snapshot (first save of the session, or compacting the journal)
+    payload = dumps_save(data, save_format)
+    
+    # Keep the previous snapshot as the backup
+    if paths['save'].exists():
+        _keep_backup(paths)
+    
+    # Write to temp file first
+    with open(paths['temp'], 'wb') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    
+    # Atomic replace
+    if platform.system() == 'Windows':
+        # On Windows, need to remove target first
+        if paths['save'].exists():
+            paths['save'].unlink()
+        paths['temp'].rename(paths['save'])
+    else:
+        # Unix atomic replace
+        paths['temp'].replace(paths['save'])
+    
+    # The old journal belongs to the snapshot that just became the backup
+    if paths['journal'].exists():
+        paths['journal'].replace(paths['backup_journal'])
+    elif paths['backup_journal'].exists():
+        paths['backup_journal'].unlink()
+    remember_snapshot(paths['save'], data, payload)
+    
+    _update_slot_index(save_dir, slot_name, data, payload, paths['save'], dir_mtime)
+
+
+def save_game(player, slot_name=None):
+    """Save player data now, on the calling thread (see writer.py for background saves)"""
+    try:
+        slot_name = _player_slot(player, slot_name)
         data = player.to_dict()
-        # Store save slot in player data for future loads
         data['save_slot'] = slot_name
-        
-        # Create backup of existing save if it exists
-        if paths['save'].exists():
-            shutil.copy2(paths['save'], paths['backup'])
-        
-        # Write to temp file first
-        with open(paths['temp'], 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        # Atomic replace
-        if platform.system() == 'Windows':
-            # On Windows, need to remove target first
-            if paths['save'].exists():
-                paths['save'].unlink()
-            paths['temp'].rename(paths['save'])
-        else:
-            # Unix atomic replace
-            paths['temp'].replace(paths['save'])
-        
+        write_save_data(slot_name, data)
         return True
     except Exception as e:
         error_msg = f"Error saving game: {e}"
@@ -189,19 +313,6 @@ def save_game(player, slot_name=None):
         # Log the error
         from ..utils.logging import log_error
         log_error(f"Failed to save game: {e}", exc_info=True)
-        # Clean up temp file if it exists (use the slot_name from the try block)
-        try:
-            # Re-determine slot_name for cleanup (slot_name param always exists, may be None)
-            cleanup_slot = DEFAULT_SAVE_SLOT
-            if hasattr(player, 'save_slot') and player.save_slot:
-                cleanup_slot = player.save_slot
-            elif slot_name is not None:
-                cleanup_slot = slot_name
-            cleanup_paths = get_save_paths(cleanup_slot)
-            if cleanup_paths['temp'].exists():
-                cleanup_paths['temp'].unlink()
-        except (OSError, PermissionError) as cleanup_error:
-            log_error(f"Failed to clean up temp save file: {cleanup_error}")
         return False
 
 
@@ -210,6 +321,7 @@ def load_game(slot_name=None):
     # Import here to avoid circular dependency
     from ..models.player import Player
     
+    _flush_background_saves()
     try:
         if slot_name is None:
             slot_name = DEFAULT_SAVE_SLOT
@@ -220,8 +332,12 @@ def load_game(slot_name=None):
         # Try main save file first
         if paths['save'].exists():
             try:
-                with open(paths['save'], 'r', encoding='utf-8') as f:
-                    raw_data = json.load(f)
+                raw_data, payload, records, journal_size, clean = read_slot_save(paths['save'], paths['journal'])
+                # Later saves append to this journal unless replay stopped early
+                if clean:
+                    remember_snapshot(paths['save'], raw_data, payload, records, journal_size)
+                else:
+                    forget_snapshot(paths['save'])
                 
                 # Validate JSON schema before deserialization
                 from .validation import validate_and_clean_json
@@ -239,14 +355,14 @@ def load_game(slot_name=None):
                     player.save_slot = slot_name
                 return player
             except (json.JSONDecodeError, KeyError, ValueError) as e:
-                # Main save corrupted, try backup
+                # Main save corrupted, try backup (the next save writes a fresh snapshot)
+                forget_snapshot(paths['save'])
                 from ..utils.logging import log_error, log_warning
                 log_error(f"Main save file corrupted: {e}", exc_info=True)
                 print(f"\n{colorize('⚠️', Colors.YELLOW)} {colorize('Main save file corrupted. Attempting backup...', Colors.WHITE)}")
                 if paths['backup'].exists():
                     try:
-                        with open(paths['backup'], 'r', encoding='utf-8') as f:
-                            raw_data = json.load(f)
+                        raw_data = read_slot_save(paths['backup'], paths['backup_journal'])[0]
                         
                         # Validate JSON schema before deserialization
                         from .validation import validate_and_clean_json
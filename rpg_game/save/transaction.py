@@ -0,0 +1,257 @@
+"""Crash-consistent multi-slot transactions
+
+Deleting or renaming a slot touches several files (the save, its ``.bak``,
+``.tmp`` and journals), and a batch over many slots touches many more. A
+``SaveTransaction`` groups such changes so that after a crash either all of
+them or none of them have happened:
+
+1. ``write``/``delete``/``rename`` only stage operations in memory;
+2. ``commit`` writes one intent log to ``<save dir>/.txn/`` holding every
+   operation and every new payload, followed by a sha256 of the whole log,
+   and fsyncs it once. Once that fsync returns the batch is committed;
+3. the operations are applied (new saves written through a temp file and
+   replaced, old files unlinked) without a fsync per file;
+4. a single flush makes the applied files durable, then the log is removed.
+
+Applying a log is idempotent (operations only ever replace or remove whole
+files), so ``recover_transactions`` - run by ``get_save_dir`` the first
+time it sees a directory - simply redoes every complete log it finds and
+drops the incomplete ones, whose checksum does not match.
+
+A batch therefore costs two disk flushes whatever the number of slots,
+instead of one fsync per file.
+"""
+import hashlib
+import json
+import os
+import platform
+import struct
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .binary_format import dumps_save
+from .history import forget_history, rename_history, record_version
+from .journal import forget_snapshot, remember_snapshot
+from .slot_index import forget_slot, record_slot, dir_mtime_before_write
+
+TRANSACTION_DIR = '.txn'
+LOG_MAGIC = b'DETX1\n'
+_HEADER_LENGTH = struct.Struct('>Q')
+_DIGEST_SIZE = hashlib.sha256().digest_size
+
+# Files a slot may have besides its save
+SLOT_SUFFIXES = ('', '.tmp', '.bak', '.journal', '.bak.journal')
+
+
+class TransactionError(ValueError):
+    """An intent log that cannot be read back"""
+
+
+def get_transaction_dir(save_dir: Path) -> Path:
+    return Path(save_dir) / TRANSACTION_DIR
+
+
+def encode_log(ops: List[Dict], payloads: List[bytes]) -> bytes:
+    """Intent log bytes: magic, header length, JSON header, payloads, sha256"""
+    offset = 0
+    for op, payload in zip((op for op in ops if op['op'] == 'write'), payloads):
+        op['offset'], op['size'] = offset, len(payload)
+        offset += len(payload)
+    header = json.dumps({'ops': ops}, separators=(',', ':')).encode('utf-8')
+    body = b''.join([LOG_MAGIC, _HEADER_LENGTH.pack(len(header)), header, *payloads])
+    return body + hashlib.sha256(body).digest()
+
+
+def decode_log(log: bytes) -> Tuple[List[Dict], memoryview]:
+    """(operations, payload area) of a complete intent log"""
+    body, digest = log[:-_DIGEST_SIZE], log[-_DIGEST_SIZE:]
+    if not log.startswith(LOG_MAGIC) or len(log) < len(LOG_MAGIC) + _HEADER_LENGTH.size + _DIGEST_SIZE:
+        raise TransactionError("Not an intent log")
+    if hashlib.sha256(body).digest() != digest:
+        raise TransactionError("Intent log is incomplete")
+    start = len(LOG_MAGIC) + _HEADER_LENGTH.size
+    (header_length,) = _HEADER_LENGTH.unpack_from(body, len(LOG_MAGIC))
+    header = json.loads(bytes(body[start:start + header_length]))
+    return header['ops'], memoryview(body)[start + header_length:]
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Make a new directory entry durable (not possible, nor needed, on Windows)"""
+    if platform.system() == 'Windows':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _flush_files(paths: List[Path]) -> None:
+    """One flush for everything applied, where the OS offers it"""
+    if hasattr(os, 'sync'):
+        os.sync()
+        return
+    for path in paths:
+        with open(path, 'rb+') as f:
+            os.fsync(f.fileno())
+
+
+def apply_log(save_dir: Path, ops: List[Dict], payloads) -> List[Path]:
+    """Apply decoded operations; returns the files written. Safe to repeat."""
+    written = []
+    for op in ops:
+        for name in op.get('remove', ()):
+            try:
+                (save_dir / name).unlink()
+            except FileNotFoundError:
+                pass
+        if op['op'] == 'write':
+            target = save_dir / op['path']
+            temp = target.with_name(target.name + '.tmp')
+            with open(temp, 'wb') as f:
+                f.write(payloads[op['offset']:op['offset'] + op['size']])
+            temp.replace(target)
+            written.append(target)
+    return written
+
+
+def recover_transactions(save_dir: Path) -> int:
+    """Redo committed intent logs left by a crash; returns how many were redone"""
+    txn_dir = get_transaction_dir(save_dir)
+    try:
+        logs = sorted(path for path in txn_dir.iterdir() if path.suffix == '.log')
+    except FileNotFoundError:
+        return 0
+    redone = 0
+    for path in logs:
+        try:
+            ops, payloads = decode_log(path.read_bytes())
+        except (TransactionError, ValueError, KeyError):
+            # Crashed before the commit fsync: none of it was applied
+            path.unlink()
+            continue
+        _flush_files(apply_log(save_dir, ops, payloads))
+        path.unlink()
+        for op in ops:
+            forget_snapshot(save_dir / op['path'])
+            forget_slot(save_dir, op['slot'])
+        redone += 1
+    return redone
+
+
+class SaveTransaction:
+    """Slot writes, deletions and renames that land together or not at all.
+
+    Use as a context manager: the transaction commits when the block ends
+    normally and is discarded if it raises.
+    """
+
+    def __init__(self, save_dir: Optional[Path] = None):
+        from .system import get_save_dir  # system.py imports this module
+        self.save_dir = Path(save_dir) if save_dir is not None else get_save_dir()
+        self._ops: List[Dict] = []
+        self._payloads: List[bytes] = []
+        self._data: Dict[str, Dict] = {}
+        self._renames: List[Tuple[str, str]] = []
+
+    def _slot(self, slot_name: str) -> Tuple[str, str]:
+        from .system import sanitize_slot_name
+        slot_name = sanitize_slot_name(slot_name)
+        return slot_name, f'save_{slot_name}.json'
+
+    def write(self, slot_name: str, data: Dict, save_format: Optional[str] = None) -> None:
+        """Replace a slot's save with ``data`` (its previous journal is dropped)"""
+        from ..config import DEV_FLAGS
+        slot_name, base_name = self._slot(slot_name)
+        payload = dumps_save(data, save_format or DEV_FLAGS.get('save_format', 'json'))
+        self._ops.append({'op': 'write', 'slot': slot_name, 'path': base_name,
+                          'remove': [base_name + '.journal']})
+        self._payloads.append(payload)
+        self._data[slot_name] = data
+
+    def delete(self, slot_name: str) -> None:
+        """Remove every file of a slot"""
+        slot_name, base_name = self._slot(slot_name)
+        self._ops.append({'op': 'delete', 'slot': slot_name, 'path': base_name,
+                          'remove': [base_name + suffix for suffix in SLOT_SUFFIXES]})
+        self._data.pop(slot_name, None)
+
+    def rename(self, old_slot: str, new_slot: str) -> None:
+        """Move a slot's current state to a new name (the old backup is not kept)"""
+        from .system import read_slot_save
+        from .validation import validate_and_clean_json
+        old_slot, old_base = self._slot(old_slot)
+        new_slot, _ = self._slot(new_slot)
+        if old_slot == new_slot:
+            return
+        save_path = self.save_dir / old_base
+        data = read_slot_save(save_path, save_path.with_name(old_base + '.journal'))[0]
+        is_valid, data, error = validate_and_clean_json(data)
+        if not is_valid:
+            raise ValueError(f"Cannot rename slot '{old_slot}': {error}")
+        data['save_slot'] = new_slot
+        self.write(new_slot, data)
+        self.delete(old_slot)
+        self._renames.append((old_slot, new_slot))
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    def commit(self) -> None:
+        """Log, apply and flush the staged operations"""
+        from . import system
+        if not self._ops:
+            return
+        system._flush_background_saves()
+        with system._WRITE_LOCK:
+            txn_dir = get_transaction_dir(self.save_dir)
+            txn_dir.mkdir(exist_ok=True)
+            log_path = txn_dir / f'{time.time_ns():020d}-{os.getpid()}.log'
+            log = encode_log(self._ops, self._payloads)
+            with open(log_path, 'wb') as f:
+                f.write(log)
+                f.flush()
+                os.fsync(f.fileno())
+            _fsync_dir(txn_dir)
+
+            dir_mtime = dir_mtime_before_write(self.save_dir)
+            written = apply_log(self.save_dir, self._ops, b''.join(self._payloads))
+            _flush_files(written)
+            log_path.unlink()
+            self._after_commit(dir_mtime)
+            self._ops, self._payloads = [], []
+
+    def _after_commit(self, dir_mtime: Optional[int]) -> None:
+        """Bring the in-memory journal state, slot index and history up to date"""
+        payloads = iter(self._payloads)
+        for op in self._ops:
+            save_path = self.save_dir / op['path']
+            if op['op'] == 'write':
+                payload = next(payloads)
+                data = self._data.get(op['slot'])
+                if data is None:
+                    continue
+                remember_snapshot(save_path, data, payload)
+                record_slot(self.save_dir, op['slot'], data, payload, save_path, dir_mtime)
+            else:
+                forget_snapshot(save_path)
+                forget_slot(self.save_dir, op['slot'])
+        for old_slot, new_slot in self._renames:
+            rename_history(self.save_dir, old_slot, new_slot)
+        for op in self._ops:
+            if op['op'] == 'delete' and op['slot'] not in self._data:
+                forget_history(self.save_dir, op['slot'])
+        for slot_name, data in self._data.items():
+            try:
+                record_version(self.save_dir, slot_name, data)
+            except (OSError, ValueError):
+                pass  # history is best-effort, as for single saves
+
+    def __enter__(self) -> 'SaveTransaction':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc_type is None:
+            self.commit()
+        return False
@@ -1,9 +1,38 @@
-"""JSON schema validation for save files"""
+"""JSON schema validation for save files
+
+``SAVE_SCHEMA`` is compiled once, at import, into a generated function: each
+declared property is fetched with one ``dict.get`` and checked inline with
+an exact type test and its bounds, and cleaning (keeping only declared
+fields) happens in the same pass. Inventory entries and equipped items are
+checked against ``ITEM_SCHEMA`` inside that function too.
+"""
 import json
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from ..utils.logging import log_error
 
 
+# Inventory entries and equipped items. Items carry many optional stats, so
+# unknown keys are kept; the ones listed must have the right type.
+ITEM_SCHEMA = {
+    "type": "object",
+    "required": ["name"],
+    "properties": {
+        "name": {"type": "string", "minLength": 1, "maxLength": 100},
+        "type": {"type": "string", "maxLength": 50},
+        "item_type": {"type": "string", "maxLength": 50},
+        "description": {"type": "string", "maxLength": 500},
+        "quantity": {"type": "integer", "minimum": 1},
+        "sell_value": {"type": "number", "minimum": 0},
+        "cost": {"type": "number", "minimum": 0},
+        "grade": {"type": "integer", "minimum": 0},
+        "level_req": {"type": "integer", "minimum": 0},
+        "attack": {"type": "number"},
+        "defense": {"type": "number"},
+        "heal": {"type": "number", "minimum": 0}
+    },
+    "additionalProperties": True
+}
+
 # Save file JSON schema definition
 SAVE_SCHEMA = {
     "type": "object",
@@ -16,7 +45,7 @@ SAVE_SCHEMA = {
         "gold": {"type": "integer", "minimum": 0},
         "inventory": {
             "type": "array",
-            "items": {"type": "object"},
+            "items": ITEM_SCHEMA,
             "maxItems": 1000  # Prevent resource exhaustion
         },
         "base_hp": {"type": "integer", "minimum": 1, "maximum": 1000},
@@ -28,126 +57,210 @@ SAVE_SCHEMA = {
         "max_hp": {"type": "integer", "minimum": 1},
         "attack": {"type": "integer", "minimum": 0},
         "defense": {"type": "integer", "minimum": 0},
-        "weapon": {"type": ["object", "null"]},
-        "armor": {"type": ["object", "null"]},
-        "tool": {"type": ["object", "null"]},
+        "weapon": {"type": ["object", "null"], "properties": ITEM_SCHEMA["properties"]},
+        "armor": {"type": ["object", "null"], "properties": ITEM_SCHEMA["properties"]},
+        "tool": {"type": ["object", "null"], "properties": ITEM_SCHEMA["properties"]},
+        "kill_streak": {"type": "integer", "minimum": 0},
+        "total_kills": {"type": "integer", "minimum": 0},
+        "highest_level_enemy": {"type": "integer", "minimum": 0},
+        "highest_tower_floor": {"type": "integer", "minimum": 0},
+        "achievements": {"type": "array", "items": {"type": "string"}, "maxItems": 1000},
+        "fishing_level": {"type": "integer", "minimum": 1},
+        "fishing_exp": {"type": "integer", "minimum": 0},
+        "fishing_exp_to_next": {"type": "integer", "minimum": 0},
+        "cooking_level": {"type": "integer", "minimum": 1},
+        "cooking_exp": {"type": "integer", "minimum": 0},
+        "cooking_exp_to_next": {"type": "integer", "minimum": 0},
+        "mining_level": {"type": "integer", "minimum": 1},
+        "mining_exp": {"type": "integer", "minimum": 0},
+        "mining_exp_to_next": {"type": "integer", "minimum": 0},
+        "current_location": {"type": "string", "maxLength": 100},
         "save_slot": {"type": "string", "maxLength": 50},
         "schema": {"type": "integer", "minimum": 1, "maximum": 100},
         "world_anchor_timestamp": {"type": "number", "minimum": 0}
     },
-    "additionalProperties": True  # Allow extra fields for forward compatibility
+    # Unknown fields are accepted but dropped when cleaning
+    "additionalProperties": True
 }
 
+# validate(data, cleaned) -> error message, or None if the data is valid
+ObjectValidator = Callable[[Dict[str, Any], Dict[str, Any]], Optional[str]]
+
+# bool is a subclass of int, so generated type tests are exact
+_PYTHON_TYPES = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+    "null": (type(None),)
+}
+
+_MISSING = object()
+
+
+def _type_error(label: str, expected, value) -> str:
+    return f"Field '{label}' has invalid type. Expected {expected}, got {type(value).__name__}"
+
+
+class _CodeBuilder:
+    """Accumulates generated source and the constants it refers to"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.env: Dict[str, Any] = {'MISSING': _MISSING, 'type_error': _type_error}
+
+    def const(self, value) -> str:
+        name = f"c{len(self.env)}"
+        self.env[name] = value
+        return name
+
+    def emit(self, indent: int, line: str) -> None:
+        self.lines.append('    ' * indent + line)
+
+
+def _emit_value_checks(code: _CodeBuilder, indent: int, label: str, spec: Dict[str, Any],
+                       var: str, where: str = "") -> None:
+    """Emit the checks for the value held in ``var``.
+
+    Each failure returns its message prefixed with ``where`` (an f-string
+    fragment locating array elements, e.g. ``inventory[3]: ``).
+    """
+    def fail(at: int, message: str) -> None:
+        code.emit(at, f"return f{where + message!r}")
+
+    expected = spec.get("type")
+    names = expected if isinstance(expected, list) else [expected]
+    try:
+        types = tuple(t for name in names for t in _PYTHON_TYPES[name])
+    except KeyError as e:
+        raise ValueError(f"Unsupported schema type for '{label}': {e}") from e
+    if len(types) == 1:
+        code.emit(indent, f"if type({var}) is not {code.const(types[0])}:")
+    else:
+        code.emit(indent, f"if type({var}) not in {code.const(frozenset(types))}:")
+    code.emit(indent + 1, f"return f{where!r} + type_error({label!r}, {expected!r}, {var})")
+
+    def guarded(kinds) -> int:
+        # Bounds only apply to some of the allowed types (e.g. ["object", "null"])
+        if set(types) <= set(kinds):
+            return indent
+        code.emit(indent, f"if type({var}) in {code.const(frozenset(kinds))}:")
+        return indent + 1
+
+    if "minimum" in spec or "maximum" in spec:
+        inner = guarded((int, float))
+        if "minimum" in spec:
+            code.emit(inner, f"if {var} < {spec['minimum']!r}:")
+            fail(inner + 1, f"Field '{label}' value {{{var}}} is below minimum {spec['minimum']}")
+        if "maximum" in spec:
+            code.emit(inner, f"if {var} > {spec['maximum']!r}:")
+            fail(inner + 1, f"Field '{label}' value {{{var}}} exceeds maximum {spec['maximum']}")
+
+    if "minLength" in spec or "maxLength" in spec:
+        inner = guarded((str,))
+        if "minLength" in spec:
+            code.emit(inner, f"if len({var}) < {spec['minLength']!r}:")
+            fail(inner + 1, f"Field '{label}' length {{len({var})}} is below minimum {spec['minLength']}")
+        if "maxLength" in spec:
+            code.emit(inner, f"if len({var}) > {spec['maxLength']!r}:")
+            fail(inner + 1, f"Field '{label}' length {{len({var})}} exceeds maximum {spec['maxLength']}")
+
+    if "maxItems" in spec or "items" in spec:
+        inner = guarded((list,))
+        if "maxItems" in spec:
+            code.emit(inner, f"if len({var}) > {spec['maxItems']!r}:")
+            fail(inner + 1, f"Field '{label}' array length {{len({var})}} exceeds maximum {spec['maxItems']}")
+        if "items" in spec:
+            # Element checks are inlined into the loop
+            code.emit(inner, f"for {var}_index, {var}_item in enumerate({var}):")
+            _emit_value_checks(code, inner + 1, f"{label}[]", spec["items"], f"{var}_item",
+                               f"{where}{label}[{{{var}_index}}]: ")
+
+    if "properties" in spec:
+        _emit_object_checks(code, guarded((dict,)), spec, var, where or f"{label}: ")
+
+
+def _emit_object_checks(code: _CodeBuilder, indent: int, schema: Dict[str, Any], var: str,
+                        where: str = "", cleaned: Optional[str] = None) -> None:
+    """Emit the checks for the dict held in ``var``: each declared property is
+    looked up once and checked inline, and copied into ``cleaned`` if given"""
+    required = list(schema.get("required", ()))
+    if required:
+        code.emit(indent, f"if not {code.const(frozenset(required))} <= {var}.keys():")
+        code.emit(indent + 1, f"missing = [field for field in {required!r} if field not in {var}]")
+        code.emit(indent + 1, f"return f{where!r} + 'Missing required fields: ' + ', '.join(missing)")
+    for index, (name, spec) in enumerate(schema["properties"].items()):
+        field_var = f"{var}_{index}"
+        code.emit(indent, f"{field_var} = {var}.get({name!r}, MISSING)")
+        code.emit(indent, f"if {field_var} is not MISSING:")
+        _emit_value_checks(code, indent + 1, name, spec, field_var, where)
+        if cleaned is not None:
+            code.emit(indent + 1, f"{cleaned}[{name!r}] = {field_var}")
+
+
+def _compile_object(schema: Dict[str, Any]) -> ObjectValidator:
+    """Compile an object schema into ``validate(data, cleaned)``.
+
+    Declared fields that pass are copied into ``cleaned``; the first error
+    found is returned, or None.
+    """
+    code = _CodeBuilder()
+    code.emit(0, "def validate(data, cleaned):")
+    _emit_object_checks(code, 1, schema, "data", cleaned="cleaned")
+    code.emit(1, "return None")
+    return _build(code)
+
+
+def _build(code: _CodeBuilder):
+    namespace = dict(code.env)
+    exec('\n'.join(code.lines), namespace)
+    return namespace['validate']
+
+
+def compile_schema(schema: Dict[str, Any]) -> Callable[[Any], Tuple[bool, Optional[Dict[str, Any]], Optional[str]]]:
+    """Compile an object schema into a validate-and-clean function"""
+    validate_object = _compile_object(schema)
+
+    def validate(data):
+        if type(data) is not dict:
+            return False, None, "Save data must be a dictionary"
+        cleaned: Dict[str, Any] = {}
+        error = validate_object(data, cleaned)
+        if error is not None:
+            return False, None, error
+        return True, cleaned, None
+    return validate
+
+
+_validate_save = compile_schema(SAVE_SCHEMA)
+
 
 def validate_save_data(data: Dict[str, Any]) -> tuple[bool, Optional[str]]:
     """
     Validate save file data against JSON schema.
-    
+
     Args:
         data: Dictionary containing save data
-        
+
     Returns:
         Tuple of (is_valid, error_message)
         If valid, error_message is None
     """
-    # Basic type check
-    if not isinstance(data, dict):
-        return False, "Save data must be a dictionary"
-    
-    # Check required fields
-    required_fields = SAVE_SCHEMA["required"]
-    missing_fields = [field for field in required_fields if field not in data]
-    if missing_fields:
-        return False, f"Missing required fields: {', '.join(missing_fields)}"
-    
-    # Validate field types and ranges
-    properties = SAVE_SCHEMA["properties"]
-    for field_name, field_value in data.items():
-        if field_name not in properties:
-            continue  # Additional properties allowed
-        
-        field_schema = properties[field_name]
-        
-        # Type validation
-        expected_type = field_schema.get("type")
-        if expected_type:
-            if isinstance(expected_type, list):
-                # Multiple types allowed (e.g., ["object", "null"])
-                if not any(_is_valid_type(field_value, t) for t in expected_type):
-                    return False, f"Field '{field_name}' has invalid type. Expected {expected_type}, got {type(field_value).__name__}"
-            else:
-                if not _is_valid_type(field_value, expected_type):
-                    return False, f"Field '{field_name}' has invalid type. Expected {expected_type}, got {type(field_value).__name__}"
-        
-        # Range validation for numbers
-        if isinstance(field_value, (int, float)):
-            if "minimum" in field_schema and field_value < field_schema["minimum"]:
-                return False, f"Field '{field_name}' value {field_value} is below minimum {field_schema['minimum']}"
-            if "maximum" in field_schema and field_value > field_schema["maximum"]:
-                return False, f"Field '{field_name}' value {field_value} exceeds maximum {field_schema['maximum']}"
-        
-        # String length validation
-        if isinstance(field_value, str):
-            if "minLength" in field_schema and len(field_value) < field_schema["minLength"]:
-                return False, f"Field '{field_name}' length {len(field_value)} is below minimum {field_schema['minLength']}"
-            if "maxLength" in field_schema and len(field_value) > field_schema["maxLength"]:
-                return False, f"Field '{field_name}' length {len(field_value)} exceeds maximum {field_schema['maxLength']}"
-        
-        # Array validation
-        if isinstance(field_value, list):
-            if "maxItems" in field_schema and len(field_value) > field_schema["maxItems"]:
-                return False, f"Field '{field_name}' array length {len(field_value)} exceeds maximum {field_schema['maxItems']}"
-    
-    return True, None
-
-
-def _is_valid_type(value: Any, expected_type: str) -> bool:
-    """Check if value matches expected JSON schema type"""
-    type_map = {
-        "string": str,
-        "integer": int,
-        "number": (int, float),
-        "boolean": bool,
-        "array": list,
-        "object": dict,
-        "null": type(None)
-    }
-    
-    if expected_type not in type_map:
-        return True  # Unknown type, skip validation
-    
-    expected_python_type = type_map[expected_type]
-    if isinstance(expected_python_type, tuple):
-        return isinstance(value, expected_python_type)
-    return isinstance(value, expected_python_type)
+    is_valid, _, error = _validate_save(data)
+    return is_valid, error
 
 
 def validate_and_clean_json(data: Dict[str, Any]) -> tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
     """
     Validate JSON data and clean it for safe deserialization.
-    
+
     Args:
         data: Raw JSON data dictionary
-        
+
     Returns:
         Tuple of (is_valid, cleaned_data, error_message)
+        cleaned_data holds only the fields declared in SAVE_SCHEMA
     """
-    is_valid, error = validate_save_data(data)
-    if not is_valid:
-        return False, None, error
-    
-    # Clean the data (remove potentially dangerous fields, normalize types)
-    cleaned_data = {}
-    
-    # Copy only known safe fields
-    safe_fields = set(SAVE_SCHEMA["properties"].keys()) | set(SAVE_SCHEMA["required"])
-    for field_name, field_value in data.items():
-        if field_name in safe_fields or field_name in ["kill_streak", "total_kills", "highest_level_enemy", 
-                                                       "highest_tower_floor", "achievements", "fishing_level",
-                                                       "fishing_exp", "fishing_exp_to_next", "cooking_level",
-                                                       "cooking_exp", "cooking_exp_to_next", "mining_level",
-                                                       "mining_exp", "mining_exp_to_next", "current_location"]:
-            cleaned_data[field_name] = field_value
-    
-    return True, cleaned_data, None
-
+    return _validate_save(data)
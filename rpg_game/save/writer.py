@@ -0,0 +1,114 @@
+"""Background save writer
+
+``save_game`` serializes, fsyncs and updates the slot index on the calling
+thread, which stalls the game loop on every save. ``queue_save`` instead
+takes a snapshot of ``Player.to_dict()`` (a deep copy, so the game can keep
+changing the player) and hands it to a single writer thread:
+
+* requests for the same slot coalesce - while a write is in progress only
+  the newest pending snapshot is kept, so a burst of saves costs at most one
+  extra write;
+* the write itself is ``write_save_data``, the same journal/snapshot path
+  ``save_game`` uses, so what reaches the disk is unchanged;
+* failures are logged and remembered until the next ``flush``.
+
+Durability is kept by flushing before anything depends on the file: quitting,
+loading and deleting a slot all wait for pending writes, and an ``atexit``
+hook flushes on interpreter exit.
+"""
+import atexit
+import threading
+from typing import Dict, List, Optional
+
+from .system import snapshot_player, write_save_data
+
+
+class SaveWriter:
+    """Single background thread writing the latest snapshot of each slot"""
+
+    def __init__(self, write=write_save_data):
+        self._write = write
+        self._cond = threading.Condition()
+        self._pending: Dict[str, Dict] = {}
+        self._busy = False
+        self._errors: List[str] = []
+        self._thread: Optional[threading.Thread] = None
+        self.writes = 0
+
+    def submit(self, slot_name: str, data: Dict) -> None:
+        """Queue ``data`` for ``slot_name``, replacing any snapshot still waiting"""
+        with self._cond:
+            self._pending[slot_name] = data
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='save-writer', daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def pending(self) -> bool:
+        """True while anything is queued or being written"""
+        with self._cond:
+            return bool(self._pending) or self._busy
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for every queued write; True if all writes since the last flush succeeded"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: not self._pending and not self._busy, timeout):
+                return False
+            ok = not self._errors
+            self._errors.clear()
+            return ok
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                slot_name, data = self._pending.popitem()
+                self._busy = True
+            try:
+                self._write(slot_name, data)
+            except Exception as e:
+                from ..utils.logging import log_error
+                log_error(f"Background save of slot '{slot_name}' failed: {e}", exc_info=True)
+                with self._cond:
+                    self._errors.append(slot_name)
+            with self._cond:
+                self.writes += 1
+                self._busy = False
+                self._cond.notify_all()
+
+
+_WRITER: Optional[SaveWriter] = None
+
+
+def get_save_writer() -> SaveWriter:
+    """The shared background writer"""
+    global _WRITER
+    if _WRITER is None:
+        _WRITER = SaveWriter()
+    return _WRITER
+
+
+def queue_save(player, slot_name=None) -> bool:
+    """Snapshot ``player`` now and save it in the background.
+
+    Returns False only if the snapshot could not be taken; write failures are
+    logged and reported by ``flush_saves``.
+    """
+    try:
+        slot_name, data = snapshot_player(player, slot_name)
+    except Exception as e:
+        from ..utils.logging import log_error
+        log_error(f"Failed to snapshot player for saving: {e}", exc_info=True)
+        return False
+    get_save_writer().submit(slot_name, data)
+    return True
+
+
+def flush_saves(timeout: Optional[float] = None) -> bool:
+    """Wait for pending background saves; True if they all succeeded"""
+    if _WRITER is None:
+        return True
+    return _WRITER.flush(timeout)
+
+
+atexit.register(flush_saves)
@@ -1,7 +1,7 @@
 """Service layer for game actions - separates business logic from presentation"""
 from typing import Optional
 from ..models.player import Player
-from ..save.system import save_game
+from ..save.writer import queue_save, flush_saves
 
 
 class GameActionService:
@@ -111,11 +111,13 @@ class GameActionService:
             return True
         return False
     
-    def handle_save_action(self) -> tuple[bool, str]:
-        """Save game"""
-        if save_game(self.player):
-            return True, "Game saved successfully!"
-        return False, "Failed to save game!"
+    def handle_save_action(self, wait: bool = False) -> tuple[bool, str]:
+        """Save game in the background; ``wait`` blocks until it is on disk (quitting)"""
+        if not queue_save(self.player):
+            return False, "Failed to save game!"
+        if wait and not flush_saves():
+            return False, "Failed to save game!"
+        return True, "Game saved successfully!"
     
     def handle_stat_allocation(self) -> bool:
         """Allocate stat points"""
@@ -242,7 +244,7 @@ class LocationHandlerService:
             else:
                 save_choice = input("\n💾 Save before quitting? (y/n): ").strip().lower()
                 if save_choice == 'y':
-                    success, message = self.action_service.handle_save_action()
+                    success, message = self.action_service.handle_save_action(wait=True)
                     print(f"\n{'✅' if success else '❌'} {message}")
                     input("\nPress Enter to continue...")
                 print("\n👋 Thanks for playing!")
@@ -253,7 +255,7 @@ class LocationHandlerService:
             if self.player.stat_points > 0:
                 save_choice = input("\n💾 Save before quitting? (y/n): ").strip().lower()
                 if save_choice == 'y':
-                    success, message = self.action_service.handle_save_action()
+                    success, message = self.action_service.handle_save_action(wait=True)
                     print(f"\n{'✅' if success else '❌'} {message}")
                     input("\nPress Enter to continue...")
                 print("\n👋 Thanks for playing!")
@@ -339,7 +341,7 @@ class LocationHandlerService:
             else:
                 save_choice = input("\n💾 Save before quitting? (y/n): ").strip().lower()
                 if save_choice == 'y':
-                    success, message = self.action_service.handle_save_action()
+                    success, message = self.action_service.handle_save_action(wait=True)
                     print(f"\n{'✅' if success else '❌'} {message}")
                     input("\nPress Enter to continue...")
                 print("\n👋 Thanks for playing!")
@@ -350,7 +352,7 @@ class LocationHandlerService:
             if self.player.stat_points > 0:
                 save_choice = input("\n💾 Save before quitting? (y/n): ").strip().lower()
                 if save_choice == 'y':
-                    success, message = self.action_service.handle_save_action()
+                    success, message = self.action_service.handle_save_action(wait=True)
                     print(f"\n{'✅' if success else '❌'} {message}")
                     input("\nPress Enter to continue...")
                 print("\n👋 Thanks for playing!")
@@ -30,7 +30,7 @@ class CommandRouter:
         if command == "quit":
             save_choice = input("\n💾 Save before quitting? (y/n): ").strip().lower()
             if save_choice == 'y':
-                success, message = self.action_service.handle_save_action()
+                success, message = self.action_service.handle_save_action(wait=True)
                 print(f"\n{'✅' if success else '❌'} {message}")
                 input("\nPress Enter to continue...")
             print("\n👋 Thanks for playing!")
@@ -9,6 +9,7 @@ from .mining import (
     MINING_ORES, MINING_LEVEL_REQUIREMENTS, MINING_XP_AWARDS,
     get_mining_catch, go_mining
 )
+from .offline import OfflineGathering, fast_forward_gathering
 from .cooking import COOK_LEVEL_REQUIREMENTS, COOKING_XP_AWARDS, cook_fish
 from .training import training_simulator
 
@@ -18,6 +19,7 @@ __all__ = [
     'get_fishing_catch', 'go_fishing', 'get_fish_key_from_name',
     'MINING_ORES', 'MINING_LEVEL_REQUIREMENTS', 'MINING_XP_AWARDS',
     'get_mining_catch', 'go_mining',
+    'OfflineGathering', 'fast_forward_gathering',
     'COOK_LEVEL_REQUIREMENTS', 'COOKING_XP_AWARDS', 'cook_fish',
     'training_simulator'
 ]
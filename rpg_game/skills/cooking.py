@@ -1,15 +1,16 @@
 """Cooking skill system"""
-import random
 import time
 import threading
 from datetime import datetime
 from ..config import DEV_FLAGS
+from ..systems.rng import rng_stream
 from ..ui import Colors, colorize, clear_screen, show_notification, skill_xp_bar
-from ..items.inventory import add_item_to_inventory, remove_item_from_inventory, get_item_quantity
+from ..items.inventory import apply_inventory_changes, get_item_quantity
 from ..items.rarity import format_item_name
+from ..items.registry import find_by_name
 from ..save.system import get_save_dir
 from .core import add_skill_xp
-from .fishing import FISH_TYPES, COOKED_FISH_ITEMS, GOURMET_FISH_ITEMS, GOURMET_COOKING_CHANCE
+from .fishing import COOKED_FISH_ITEMS, GOURMET_FISH_ITEMS, GOURMET_COOKING_CHANCE
 from ..achievements.system import check_achievements
 
 
@@ -74,35 +75,35 @@ def cook_fish(player):
         raw_fish_items = []
         for item in player.inventory:
             if item.get('type') == 'material':
-                for fish_key, fish_data in FISH_TYPES.items():
-                    if item.get('name') == fish_data['name']:
-                        # Use normalized key for lookup
-                        lookup_key = fish_data.get('key', fish_key)
-                        required_level = COOK_LEVEL_REQUIREMENTS.get(lookup_key, 1)
-                        if player.cooking_level < required_level:
-                            success_chance = 0.0
-                        else:
-                            from ..constants import (
-                                COOKING_SUCCESS_BASE, COOKING_SUCCESS_INCREMENT,
-                                COOKING_SUCCESS_MIN, COOKING_SUCCESS_MAX
-                            )
-                            success_chance = max(
-                                COOKING_SUCCESS_MIN,
-                                min(COOKING_SUCCESS_MAX, COOKING_SUCCESS_BASE + COOKING_SUCCESS_INCREMENT * (player.cooking_level - required_level))
-                            )
+                fish = find_by_name(item.get('name'), 'fish')
+                if fish is not None:
+                    fish_key, fish_data = fish.key, fish.fields
+                    # Use normalized key for lookup
+                    lookup_key = fish_data.get('key', fish_key)
+                    required_level = COOK_LEVEL_REQUIREMENTS.get(lookup_key, 1)
+                    if player.cooking_level < required_level:
+                        success_chance = 0.0
+                    else:
+                        from ..constants import (
+                            COOKING_SUCCESS_BASE, COOKING_SUCCESS_INCREMENT,
+                            COOKING_SUCCESS_MIN, COOKING_SUCCESS_MAX
+                        )
+                        success_chance = max(
+                            COOKING_SUCCESS_MIN,
+                            min(COOKING_SUCCESS_MAX, COOKING_SUCCESS_BASE + COOKING_SUCCESS_INCREMENT * (player.cooking_level - required_level))
+                        )
                         
-                        qty = get_item_quantity(item)
-                        xp_per_cook = COOKING_XP_AWARDS.get(lookup_key, 10)
+                    qty = get_item_quantity(item)
+                    xp_per_cook = COOKING_XP_AWARDS.get(lookup_key, 10)
                         
-                        raw_fish_items.append({
-                            'item': item,
-                            'fish_key': lookup_key,  # Use normalized key
-                            'required_level': required_level,
-                            'success_chance': success_chance,
-                            'quantity': qty,
-                            'xp_per_cook': xp_per_cook
-                        })
-                        break
+                    raw_fish_items.append({
+                        'item': item,
+                        'fish_key': lookup_key,  # Use normalized key
+                        'required_level': required_level,
+                        'success_chance': success_chance,
+                        'quantity': qty,
+                        'xp_per_cook': xp_per_cook
+                    })
         
         if not raw_fish_items:
             print(f"\n{colorize('❌', Colors.BRIGHT_RED)} {colorize('You have no raw fish to cook!', Colors.WHITE)}")
@@ -245,13 +246,14 @@ def cook_fish(player):
                         break  # User cancelled before this fish finished
                     
                     # Determine success/failure
-                    if random.random() < success_chance:
+                    cooked_item = None
+                    if rng_stream('skills').random() < success_chance:
                         # Success - check for gourmet (1% chance)
-                        is_gourmet = random.random() < GOURMET_COOKING_CHANCE
+                        is_gourmet = rng_stream('skills').random() < GOURMET_COOKING_CHANCE
                         
                         if is_gourmet:
                             # Create gourmet version (4x heal and sell value)
-                            add_item_to_inventory(player.inventory, gourmet_item_template.copy())
+                            cooked_item = gourmet_item_template
                             gourmet_successes += 1
                             successes += 1
                             xp_gain = selected_fish['xp_per_cook'] * 2  # Bonus XP for gourmet
@@ -265,7 +267,7 @@ def cook_fish(player):
                                 show_notification(f"✨ GOURMET! {gourmet_name}! +{xp_gain} XP", Colors.BRIGHT_MAGENTA, NOTIFICATION_DURATION_LONG, critical=True)
                         else:
                             # Normal cooked fish
-                            add_item_to_inventory(player.inventory, cooked_item_template.copy())
+                            cooked_item = cooked_item_template
                             successes += 1
                             xp_gain = selected_fish['xp_per_cook']
                             total_xp += xp_gain
@@ -289,8 +291,11 @@ def cook_fish(player):
                             from ..constants import NOTIFICATION_DURATION_SHORT
                             show_notification(f"💨 Burnt the fish…", Colors.RED, NOTIFICATION_DURATION_SHORT)
                     
-                    # Remove 1 raw fish
-                    remove_item_from_inventory(player.inventory, selected_fish['item'], 1)
+                    # Swap 1 raw fish for the result in one batch
+                    changes = [(selected_fish['item'], -1)]
+                    if cooked_item is not None:
+                        changes.append((cooked_item, 1))
+                    apply_inventory_changes(player.inventory, changes)
                     
                     # Brief pause between cooks (unless fast mode or cancelled)
                     if cook_num < cook_qty - 1 and not DEV_FLAGS['fast'] and cooking_active:
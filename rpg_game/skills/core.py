@@ -1,42 +1,54 @@
 """Core skill XP system"""
-from ..constants import (
-    MAX_SKILL_LEVEL, SKILL_EXP_MULTIPLIER_PER_LEVEL,
-    NOTIFICATION_DURATION_NORMAL
-)
+from ..constants import MAX_SKILL_LEVEL, NOTIFICATION_DURATION_NORMAL
 from ..ui import Colors, show_notification
 from ..achievements.system import check_achievements
+from ..systems.xp_tables import SKILL_XP
+from .sampling import invalidate_catch_samplers
+
+# Seconds per gathering attempt before tool boosts (go_fishing / go_mining)
+BASE_GATHERING_DURATION = 8
+
+# Level-up notification color per skill
+SKILL_LEVEL_COLORS = {
+    'fishing': Colors.BRIGHT_CYAN,
+    'cooking': Colors.BRIGHT_MAGENTA,
+    'mining': Colors.BRIGHT_MAGENTA,
+}
+
+
+def gathering_duration(player, boost_key, speed_boost=None):
+    """Seconds per gathering attempt with the equipped tool's (or an explicit) speed boost"""
+    if speed_boost is None:
+        speed_boost = 0
+        if player.tool and player.tool.get('type') == 'tool' and boost_key in player.tool:
+            speed_boost = player.tool[boost_key]
+    return max(1.0, BASE_GATHERING_DURATION + speed_boost)  # Minimum 1 second
+
+
+def apply_skill_xp(player, skill, amount):
+    """Add XP to a skill without any UI; returns the list of levels reached"""
+    if skill not in SKILL_LEVEL_COLORS:
+        return []
+    level_attr = f'{skill}_level'
+    exp_attr = f'{skill}_exp'
+    next_attr = f'{skill}_exp_to_next'
+
+    old_level = getattr(player, level_attr)
+    level, exp, exp_to_next = SKILL_XP.resolve(old_level, getattr(player, exp_attr), getattr(player, next_attr), amount)
+    reached = list(range(old_level + 1, level + 1))
+    if level >= MAX_SKILL_LEVEL:
+        exp = exp_to_next - 1  # Cap at 99
+
+    setattr(player, level_attr, level)
+    setattr(player, exp_attr, exp)
+    setattr(player, next_attr, exp_to_next)
+    if reached:
+        invalidate_catch_samplers(skill)
+    return reached
 
 
 def add_skill_xp(player, skill, amount):
     """Add XP to a skill and handle level ups"""
-    if skill == "fishing":
-        player.fishing_exp += amount
-        while player.fishing_exp >= player.fishing_exp_to_next and player.fishing_level < MAX_SKILL_LEVEL:
-            player.fishing_exp -= player.fishing_exp_to_next
-            player.fishing_level += 1
-            player.fishing_exp_to_next = int(player.fishing_exp_to_next * SKILL_EXP_MULTIPLIER_PER_LEVEL)
-            show_notification(f"Fishing level {player.fishing_level}!", Colors.BRIGHT_CYAN, NOTIFICATION_DURATION_NORMAL, critical=True)
-            check_achievements(player, 'fishing_level')
-        if player.fishing_level >= MAX_SKILL_LEVEL:
-            player.fishing_exp = player.fishing_exp_to_next - 1  # Cap at 99
-    elif skill == "cooking":
-        player.cooking_exp += amount
-        while player.cooking_exp >= player.cooking_exp_to_next and player.cooking_level < MAX_SKILL_LEVEL:
-            player.cooking_exp -= player.cooking_exp_to_next
-            player.cooking_level += 1
-            player.cooking_exp_to_next = int(player.cooking_exp_to_next * SKILL_EXP_MULTIPLIER_PER_LEVEL)
-            show_notification(f"Cooking level {player.cooking_level}!", Colors.BRIGHT_MAGENTA, NOTIFICATION_DURATION_NORMAL, critical=True)
-            check_achievements(player, 'cooking_level')
-        if player.cooking_level >= MAX_SKILL_LEVEL:
-            player.cooking_exp = player.cooking_exp_to_next - 1  # Cap at 99
-    elif skill == "mining":
-        player.mining_exp += amount
-        while player.mining_exp >= player.mining_exp_to_next and player.mining_level < MAX_SKILL_LEVEL:
-            player.mining_exp -= player.mining_exp_to_next
-            player.mining_level += 1
-            player.mining_exp_to_next = int(player.mining_exp_to_next * SKILL_EXP_MULTIPLIER_PER_LEVEL)
-            show_notification(f"Mining level {player.mining_level}!", Colors.BRIGHT_MAGENTA, NOTIFICATION_DURATION_NORMAL, critical=True)
-            check_achievements(player, 'mining_level')
-        if player.mining_level >= MAX_SKILL_LEVEL:
-            player.mining_exp = player.mining_exp_to_next - 1  # Cap at 99
-
+    for level in apply_skill_xp(player, skill, amount):
+        show_notification(f"{skill.capitalize()} level {level}!", SKILL_LEVEL_COLORS[skill], NOTIFICATION_DURATION_NORMAL, critical=True)
+        check_achievements(player, f'{skill}_level')
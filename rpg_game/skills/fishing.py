@@ -1,15 +1,17 @@
 """Fishing skill system"""
-import random
 import time
 import threading
 from datetime import datetime
 from ..config import DEV_FLAGS
+from ..systems.rng import rng_stream
 from ..ui import Colors, colorize, clear_screen, show_notification
 from ..items.inventory import add_item_to_inventory
 from ..items.rarity import format_item_name
+from ..items.registry import find_by_name
 from ..models.location import LOCATIONS
 from ..save.system import get_save_dir
-from .core import add_skill_xp
+from .core import add_skill_xp, gathering_duration
+from .sampling import get_catch_sampler
 from ..achievements.system import check_achievements
 
 
@@ -91,18 +93,15 @@ GOURMET_FISH_ITEMS = {
 GOURMET_COOKING_CHANCE = 0.01  # 1% chance
 
 
-def get_fishing_catch(player, eligible_fish):
-    """Calculate which fish to catch based on level-weighted distribution"""
-    if not eligible_fish:
-        return None, None
-    
+def _fishing_catch_weights(fishing_level, eligible_fish):
+    """Level-weighted catch weights, in eligible_fish order"""
     from ..constants import (
         FISHING_LEVEL_BOOST_MULTIPLIER, FISHING_LEVEL_BOOST_MAX,
         FISHING_RARITY_WEIGHT_DIVISOR, FISHING_LOW_TIER_THRESHOLD
     )
     
     # Calculate level boost (up to 25% absolute)
-    level_boost = min(FISHING_LEVEL_BOOST_MAX, player.fishing_level * FISHING_LEVEL_BOOST_MULTIPLIER)
+    level_boost = min(FISHING_LEVEL_BOOST_MAX, fishing_level * FISHING_LEVEL_BOOST_MULTIPLIER)
     
     # Build weights with level scaling
     weights = {}
@@ -133,25 +132,18 @@ def get_fishing_catch(player, eligible_fish):
         for fish_key in low_tier_fish:
             if fish_key in weights:
                 weights[fish_key] *= scale_factor
-        
-        # Re-normalize
-        total_weight = sum(weights.values())
-    
-    # Normalize to probabilities
-    probabilities = {k: v / total_weight for k, v in weights.items()}
     
-    # Roll for catch
-    roll = random.random()
-    cumulative = 0
-    
-    for fish_key, fish_data in eligible_fish:
-        if fish_key in probabilities:
-            cumulative += probabilities[fish_key]
-            if roll <= cumulative:
-                return fish_key, fish_data
+    return [weights[fish_key] for fish_key, _ in eligible_fish]
+
+
+def get_fishing_catch(player, eligible_fish):
+    """Calculate which fish to catch based on level-weighted distribution"""
+    if not eligible_fish:
+        return None, None
     
-    # Fallback to first eligible
-    return eligible_fish[0][0], eligible_fish[0][1]
+    # Weights are compiled once per (fishing level, eligible set)
+    sampler = get_catch_sampler('fishing', player.fishing_level, eligible_fish, _fishing_catch_weights)
+    return sampler.draw(rng_stream('skills'))
 
 
 def log_fishing_outcome(player, fish_data, quantity, xp_gained):
@@ -218,13 +210,7 @@ def go_fishing(player):
     catch_count = 0
     total_xp = 0
     
-    # Check equipped tool for fishing rod bonus
-    fishing_speed_boost = 0
-    if player.tool and player.tool.get('type') == 'tool' and 'fishing_speed_boost' in player.tool:
-        fishing_speed_boost = player.tool['fishing_speed_boost']
-    
-    base_fishing_duration = 8
-    fishing_duration = max(1.0, base_fishing_duration + fishing_speed_boost)  # Minimum 1 second
+    fishing_duration = gathering_duration(player, 'fishing_speed_boost')
     
     def fishing_loop():
         nonlocal fishing_active, fish_caught, total_value, catch_count, total_xp
@@ -272,7 +258,7 @@ def go_fishing(player):
             
             # Check for line break (5% chance)
             from ..constants import FISHING_RARE_CATCH_CHANCE
-            if random.random() < FISHING_RARE_CATCH_CHANCE:
+            if rng_stream('skills').random() < FISHING_RARE_CATCH_CHANCE:
                 continue  # Skip this catch
             
             # Determine catch using level-based weighting
@@ -347,8 +333,6 @@ def go_fishing(player):
 
 def get_fish_key_from_name(fish_name):
     """Map fish name to FISH_TYPES key"""
-    for fish_key, fish_data in FISH_TYPES.items():
-        if fish_data['name'] == fish_name:
-            return fish_key
-    return None
+    definition = find_by_name(fish_name, 'fish')
+    return definition.key if definition is not None else None
 
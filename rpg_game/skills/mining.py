@@ -1,14 +1,16 @@
 """Mining skill system"""
-import random
 import time
 import threading
 from ..config import DEV_FLAGS
+from ..systems.rng import rng_stream
 from ..ui import Colors, colorize, clear_screen, show_notification, skill_xp_bar
 from ..items.inventory import add_item_to_inventory
 from ..items.rarity import format_item_name
+from ..items.registry import find_by_name
 from ..models.location import LOCATIONS
 from ..achievements.system import check_achievements
-from .core import add_skill_xp
+from .core import add_skill_xp, gathering_duration
+from .sampling import get_catch_sampler
 
 
 # Mining system - Ore types with rarity (sell_value determines rarity)
@@ -62,18 +64,15 @@ MINING_XP_AWARDS = {
 }
 
 
-def get_mining_catch(player, eligible_ores):
-    """Calculate which ore to mine based on level-weighted distribution"""
-    if not eligible_ores:
-        return None, None
-    
+def _mining_catch_weights(mining_level, eligible_ores):
+    """Level-weighted mining weights, in eligible_ores order"""
     # Separate gems from regular ores
     gems = ['sapphire', 'ruby', 'emerald', 'diamond', 'dragonstone', 'onyx']
     low_tier_ores = ['copper', 'tin']  # Low tier ores that should remain common
     
     from ..constants import MINING_LEVEL_BOOST_MULTIPLIER, MINING_LEVEL_BOOST_MAX
     # Calculate level boost for higher tier ores (up to 25% absolute)
-    level_boost = min(MINING_LEVEL_BOOST_MAX, player.mining_level * MINING_LEVEL_BOOST_MULTIPLIER)
+    level_boost = min(MINING_LEVEL_BOOST_MAX, mining_level * MINING_LEVEL_BOOST_MULTIPLIER)
     
     # Build weights with level scaling
     weights = {}
@@ -86,7 +85,7 @@ def get_mining_catch(player, eligible_ores):
         if ore_key in gems:
             # Base chance is very low, but scales with level
             # At level 1: base chance, at level 99: base chance * 3.0
-            level_multiplier = 1.0 + (player.mining_level / 50.0)  # Up to ~3x at level 99
+            level_multiplier = 1.0 + (mining_level / 50.0)  # Up to ~3x at level 99
             weight = base_chance * level_multiplier
         elif ore_key not in low_tier_ores:
             # Regular higher tier ores get level boost
@@ -102,35 +101,28 @@ def get_mining_catch(player, eligible_ores):
     low_tier_total = sum(weights.get(k, 0) for k in low_tier_ores if k in weights)
     total_weight = sum(weights.values())
     
-    if total_weight > 0 and low_tier_total / total_weight < 0.50:
+    if total_weight <= 0:
+        # Fallback if no weights
+        return [1.0] * len(eligible_ores)
+    
+    if low_tier_total / total_weight < 0.50:
         # Boost low tier to maintain 50% minimum
         scale_factor = (0.50 * total_weight) / low_tier_total
         for ore_key in low_tier_ores:
             if ore_key in weights:
                 weights[ore_key] *= scale_factor
-        
-        # Re-normalize
-        total_weight = sum(weights.values())
-    
-    # Normalize to probabilities
-    if total_weight > 0:
-        probabilities = {k: v / total_weight for k, v in weights.items()}
-    else:
-        # Fallback if no weights
-        probabilities = {ore_key: 1.0 / len(eligible_ores) for ore_key, _ in eligible_ores}
     
-    # Roll for catch
-    roll = random.random()
-    cumulative = 0
-    
-    for ore_key, ore_data in eligible_ores:
-        if ore_key in probabilities:
-            cumulative += probabilities[ore_key]
-            if roll <= cumulative:
-                return ore_key, ore_data
+    return [weights[ore_key] for ore_key, _ in eligible_ores]
+
+
+def get_mining_catch(player, eligible_ores):
+    """Calculate which ore to mine based on level-weighted distribution"""
+    if not eligible_ores:
+        return None, None
     
-    # Fallback to first eligible
-    return eligible_ores[0][0], eligible_ores[0][1]
+    # Weights are compiled once per (mining level, eligible set)
+    sampler = get_catch_sampler('mining', player.mining_level, eligible_ores, _mining_catch_weights)
+    return sampler.draw(rng_stream('skills'))
 
 
 def go_mining(player):
@@ -179,13 +171,7 @@ def go_mining(player):
     mine_count = 0
     total_xp = 0
     
-    # Check equipped tool for pickaxe bonus
-    mining_speed_boost = 0
-    if player.tool and player.tool.get('type') == 'tool' and 'mining_speed_boost' in player.tool:
-        mining_speed_boost = player.tool['mining_speed_boost']
-    
-    base_mining_duration = 8  # Base mining time in seconds
-    mining_duration = max(1.0, base_mining_duration + mining_speed_boost)  # Minimum 1 second
+    mining_duration = gathering_duration(player, 'mining_speed_boost')
     
     def mining_loop():
         nonlocal mining_active, ores_mined, total_value, mine_count, total_xp
@@ -296,10 +282,9 @@ def go_mining(player):
         
         # Check for rare gem achievements
         for ore_name in ores_mined:
-            for ore_key, ore_data in MINING_ORES.items():
-                if ore_data['name'] == ore_name and ore_data['sell_value'] >= 75:
-                    check_achievements(player, 'rare_drop', ore_data['sell_value'])
-                    break
+            ore = find_by_name(ore_name, 'ores')
+            if ore is not None and ore.fields['sell_value'] >= 75:
+                check_achievements(player, 'rare_drop', ore.fields['sell_value'])
     else:
         print(f"\n{colorize('No ores mined this session.', Colors.WHITE)}")
     
@@ -0,0 +1,155 @@
+"""Offline fast-forward for gathering skills
+
+``go_fishing`` and ``go_mining`` spend one real-time cycle per attempt.
+``fast_forward_gathering`` resolves a whole stretch of elapsed time in one
+call instead: it runs the same per-attempt rolls with no display or
+sleeping, applies XP as it goes and switches to the new eligible set and
+catch weights whenever a level-up crosses an unlock threshold. Catches are
+added to the inventory as one stack per item at the end.
+"""
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from ..achievements.system import check_achievements
+from ..constants import FISHING_RARE_CATCH_CHANCE, MAX_SKILL_LEVEL
+from ..items.inventory import add_item_to_inventory
+from ..systems.rng import rng_stream
+from .core import apply_skill_xp, gathering_duration
+from .fishing import FISH_TYPES, FISH_LEVEL_REQUIREMENTS, FISHING_XP_AWARDS, _fishing_catch_weights
+from .mining import MINING_ORES, MINING_LEVEL_REQUIREMENTS, MINING_XP_AWARDS, _mining_catch_weights
+from .sampling import get_catch_sampler
+
+
+class GatheringSkill(NamedTuple):
+    """Tables and rules for one gathering skill"""
+    items: Dict[str, Dict]
+    requirements: Dict[str, int]
+    xp_awards: Dict[str, int]
+    weigh: Callable
+    boost_key: str
+    miss_chance: float           # Attempts that yield nothing (fishing line breaks)
+    first_achievement: str
+
+
+GATHERING_SKILLS = {
+    'fishing': GatheringSkill(FISH_TYPES, FISH_LEVEL_REQUIREMENTS, FISHING_XP_AWARDS,
+                              _fishing_catch_weights, 'fishing_speed_boost',
+                              FISHING_RARE_CATCH_CHANCE, 'first_catch'),
+    'mining': GatheringSkill(MINING_ORES, MINING_LEVEL_REQUIREMENTS, MINING_XP_AWARDS,
+                             _mining_catch_weights, 'mining_speed_boost',
+                             0.0, 'first_mine'),
+}
+
+
+class OfflineGathering(NamedTuple):
+    """Outcome of one fast-forwarded gathering session"""
+    skill: str
+    attempts: int
+    catches: Dict[str, int]      # Item key -> count
+    xp_gained: int
+    total_value: int
+    start_level: int
+    end_level: int
+    levels_reached: List[int]
+    unlocked: List[str]          # Item keys that became eligible mid-run
+
+
+@lru_cache(maxsize=None)
+def eligible_entries(skill: str, level: int) -> Tuple[Tuple[str, Dict], ...]:
+    """(key, data) pairs a player of ``level`` can gather, as go_fishing/go_mining build them"""
+    spec = GATHERING_SKILLS[skill]
+    entries = []
+    for item_key, item_data in spec.items.items():
+        lookup_key = item_data.get('key', item_key)
+        if level >= spec.requirements.get(lookup_key, 1):
+            entries.append((lookup_key, item_data))
+    return tuple(entries)
+
+
+def fast_forward_gathering(player, skill: str, elapsed_seconds: float,
+                           speed_boost: Optional[float] = None, rng=None,
+                           award_achievements: bool = True) -> OfflineGathering:
+    """Resolve ``elapsed_seconds`` of fishing or mining in one call.
+
+    Args:
+        player: Player to update (skill XP, levels and inventory)
+        skill: 'fishing' or 'mining'
+        elapsed_seconds: Wall time spent gathering
+        speed_boost: Seconds added per attempt (default: the equipped tool's boost)
+        rng: Random source (default: the 'skills' stream)
+        award_achievements: Run the usual achievement checks once at the end
+    """
+    spec = GATHERING_SKILLS[skill]
+    rng = rng or rng_stream('skills')
+    rand = rng.random
+    cycle = gathering_duration(player, spec.boost_key, speed_boost)
+    attempts = max(0, int(elapsed_seconds // cycle))
+
+    level_attr = f'{skill}_level'
+    start_level = getattr(player, level_attr)
+    level = start_level
+    entries = eligible_entries(skill, level)
+    sampler = get_catch_sampler(skill, level, entries, spec.weigh)
+
+    # XP is banked locally and only applied once it can reach the next level
+    def xp_to_level():
+        if level >= MAX_SKILL_LEVEL:
+            return float('inf')
+        return getattr(player, f'{skill}_exp_to_next') - getattr(player, f'{skill}_exp')
+
+    catches: Dict[str, int] = {}
+    data_by_key: Dict[str, Dict] = {}
+    levels_reached: List[int] = []
+    unlocked: List[str] = []
+    xp_awards = spec.xp_awards
+    miss_chance = spec.miss_chance
+    xp_gained = 0
+    pending = 0
+    needed = xp_to_level()
+
+    for _ in range(attempts):
+        if miss_chance and rand() < miss_chance:
+            continue
+        item_key, item_data = sampler.draw(rng)
+        catches[item_key] = catches.get(item_key, 0) + 1
+        data_by_key[item_key] = item_data
+        xp = xp_awards.get(item_key, 10)
+        xp_gained += xp
+        pending += xp
+        if pending >= needed:
+            levels_reached.extend(apply_skill_xp(player, skill, pending))
+            pending = 0
+            if getattr(player, level_attr) != level:
+                level = getattr(player, level_attr)
+                known = {key for key, _ in entries}
+                entries = eligible_entries(skill, level)
+                unlocked.extend(key for key, _ in entries if key not in known)
+                sampler = get_catch_sampler(skill, level, entries, spec.weigh)
+            needed = xp_to_level()
+    if pending:
+        apply_skill_xp(player, skill, pending)
+
+    total_value = 0
+    for item_key, count in catches.items():
+        item_data = data_by_key[item_key]
+        add_item_to_inventory(player.inventory, item_data.copy(), count)
+        total_value += item_data['sell_value'] * count
+
+    if award_achievements and catches:
+        check_achievements(player, spec.first_achievement)
+        if levels_reached:
+            check_achievements(player, f'{skill}_level')
+        if skill == 'mining':
+            check_achievements(player, 'rare_drop', max(data_by_key[key]['sell_value'] for key in catches))
+
+    return OfflineGathering(
+        skill=skill,
+        attempts=attempts,
+        catches=catches,
+        xp_gained=xp_gained,
+        total_value=total_value,
+        start_level=start_level,
+        end_level=getattr(player, level_attr),
+        levels_reached=levels_reached,
+        unlocked=unlocked
+    )
@@ -0,0 +1,70 @@
+"""Cached cumulative-weight samplers for gathering skills
+
+Catch weights only depend on the skill level and the set of eligible
+entries, so each (skill, level, eligible keys) combination is compiled once
+into a normalized cumulative array and every roll is a single bisect.
+``add_skill_xp`` drops a skill's samplers when that skill levels up.
+"""
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# (key, data) pairs as built by go_fishing / go_mining
+CatchEntries = Sequence[Tuple[str, Dict]]
+
+
+class CatchSampler:
+    """Weighted picker over a fixed list of entries"""
+
+    __slots__ = ('entries', 'cumulative')
+
+    def __init__(self, entries: CatchEntries, weights: Sequence[float]):
+        self.entries = tuple(entries)
+        total = sum(weights)
+        self.cumulative: List[float] = [w / total for w in accumulate(weights)]
+
+    def draw(self, rng) -> Tuple[str, Dict]:
+        """Pick one (key, data) entry"""
+        index = bisect_left(self.cumulative, rng.random())
+        if index >= len(self.entries):
+            # Rounding left the last bucket short of 1.0; match the old fallback
+            index = 0
+        return self.entries[index]
+
+
+# skill -> {(level, eligible keys): sampler}
+_SAMPLERS: Dict[str, Dict[Tuple[int, Tuple[str, ...]], CatchSampler]] = {}
+
+# skill -> (entries object, level, sampler) for the list a session keeps reusing
+_LAST_USED: Dict[str, Tuple[CatchEntries, int, CatchSampler]] = {}
+
+
+def get_catch_sampler(skill: str, level: int, entries: CatchEntries,
+                      weigh: Callable[[int, CatchEntries], Sequence[float]]) -> CatchSampler:
+    """Cached sampler for ``entries`` at ``level``; ``weigh`` builds the weights on a miss.
+
+    Repeat calls with the same list object skip key construction entirely,
+    so callers must not mutate ``entries`` after first use.
+    """
+    last = _LAST_USED.get(skill)
+    if last is not None and last[0] is entries and last[1] == level:
+        return last[2]
+
+    samplers = _SAMPLERS.setdefault(skill, {})
+    key = (level, tuple(entry[0] for entry in entries))
+    sampler = samplers.get(key)
+    if sampler is None:
+        sampler = CatchSampler(entries, weigh(level, entries))
+        samplers[key] = sampler
+    _LAST_USED[skill] = (entries, level, sampler)
+    return sampler
+
+
+def invalidate_catch_samplers(skill: str = None) -> None:
+    """Forget cached samplers for one skill (or all skills)"""
+    if skill is None:
+        _SAMPLERS.clear()
+        _LAST_USED.clear()
+    else:
+        _SAMPLERS.pop(skill, None)
+        _LAST_USED.pop(skill, None)
@@ -7,16 +7,19 @@ from ..ui import Colors, colorize, clear_screen, show_notification
 
 def add_exp(player, amount, silent=False):
     """Add XP to player and handle level ups (silent mode for training)"""
-    player.exp += amount
-    levels_gained = 0
+    if not silent:
+        player.exp += amount
+        levels_gained = 0
+        # Handle multiple level ups in a row, prompting for each
+        while player.level_up():
+            levels_gained += 1
+        return levels_gained
     
-    # Handle multiple level ups in a row
-    while player.level_up(silent=silent):
-        levels_gained += 1
-        if silent:
-            # Silent mode: just show a brief notification
-            from ..constants import NOTIFICATION_DURATION_NORMAL, STAT_POINTS_PER_LEVEL
-            show_notification(f"Level {player.level}! +{STAT_POINTS_PER_LEVEL} stat points banked", Colors.BRIGHT_GREEN, NOTIFICATION_DURATION_NORMAL, critical=True)
+    # Silent mode: resolve every level at once and show one brief notification
+    levels_gained = player.gain_exp(amount)
+    if levels_gained:
+        from ..constants import NOTIFICATION_DURATION_NORMAL, STAT_POINTS_PER_LEVEL
+        show_notification(f"Level {player.level}! +{levels_gained * STAT_POINTS_PER_LEVEL} stat points banked", Colors.BRIGHT_GREEN, NOTIFICATION_DURATION_NORMAL, critical=True)
     
     return levels_gained
 
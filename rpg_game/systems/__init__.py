@@ -1,11 +1,17 @@
 """Game systems - time, weather, etc."""
 from .time_system import (
-    GameClock, initialize_clock, get_clock, display_clock_hud,
+    GameClock, is_night_at, initialize_clock, get_clock, display_clock_hud,
     REAL_SECONDS_PER_DAY, DAY_PHASE_DURATION, NIGHT_PHASE_DURATION
 )
+from .rng import (
+    RNGService, RNG_STREAMS, derive_seed, initialize_rng, get_rng, rng_stream
+)
+from .xp_tables import XPCurve, CHARACTER_XP, SKILL_XP
 
 __all__ = [
-    'GameClock', 'initialize_clock', 'get_clock', 'display_clock_hud',
-    'REAL_SECONDS_PER_DAY', 'DAY_PHASE_DURATION', 'NIGHT_PHASE_DURATION'
+    'GameClock', 'is_night_at', 'initialize_clock', 'get_clock', 'display_clock_hud',
+    'REAL_SECONDS_PER_DAY', 'DAY_PHASE_DURATION', 'NIGHT_PHASE_DURATION',
+    'RNGService', 'RNG_STREAMS', 'derive_seed', 'initialize_rng', 'get_rng', 'rng_stream',
+    'XPCurve', 'CHARACTER_XP', 'SKILL_XP'
 ]
 
@@ -12,6 +12,14 @@ SECONDS_PER_IN_GAME_HOUR = REAL_SECONDS_PER_DAY / 24  # 150 real seconds = 1 in-
 SECONDS_PER_IN_GAME_MINUTE = SECONDS_PER_IN_GAME_HOUR / 60  # 2.5 real seconds = 1 in-game minute
 
 
+def is_night_at(anchor_timestamp, now=None):
+    """Check the day/night phase for an anchor without building a GameClock"""
+    if now is None:
+        now = time.time()
+    elapsed_real_seconds = max(0, now - anchor_timestamp)
+    return elapsed_real_seconds % REAL_SECONDS_PER_DAY >= DAY_PHASE_DURATION
+
+
 class GameClock:
     """Real-time in-game clock (1 real hour = 1 in-game day)"""
     
@@ -0,0 +1,97 @@
+"""Precomputed XP curves
+
+Both XP curves are geometric with integer truncation at every step:
+exp_to_next(L + 1) = int(exp_to_next(L) * multiplier). ``XPCurve`` stores
+the per-level requirement and the cumulative XP needed to reach each level,
+so resolving any grant is one bisect on the cumulative table instead of a
+loop over every level crossed.
+
+A player whose ``exp_to_next`` is not on the curve (old saves, hand-edited
+files) is stepped level by level the old way until it rejoins the table.
+"""
+from bisect import bisect_right
+from typing import List, Tuple
+
+from ..constants import (
+    STARTING_EXP_TO_NEXT, EXP_MULTIPLIER_PER_LEVEL,
+    STARTING_SKILL_EXP_TO_NEXT, SKILL_EXP_MULTIPLIER_PER_LEVEL, MAX_SKILL_LEVEL,
+    MAX_DEV_LEVEL
+)
+
+# Character levels precomputed up front; higher levels are appended on demand
+CHARACTER_TABLE_LEVELS = 100
+
+
+class XPCurve:
+    """Requirement and cumulative XP tables for one levelling curve"""
+
+    __slots__ = ('multiplier', 'max_level', 'requirements', 'cumulative')
+
+    def __init__(self, start: int, multiplier: float, levels: int, max_level: int):
+        self.multiplier = multiplier
+        self.max_level = max_level
+        # Index 0 is unused so that index == level
+        self.requirements: List[int] = [0, start]
+        self.cumulative: List[int] = [0, 0]
+        self._extend(levels)
+
+    def _extend(self, level: int) -> None:
+        """Grow the tables to cover ``level``"""
+        requirements = self.requirements
+        cumulative = self.cumulative
+        while len(requirements) <= level:
+            cumulative.append(cumulative[-1] + requirements[-1])
+            requirements.append(int(requirements[-1] * self.multiplier))
+
+    def exp_to_next(self, level: int) -> int:
+        """XP needed to go from ``level`` to ``level + 1``"""
+        if level >= len(self.requirements):
+            self._extend(level)
+        return self.requirements[level]
+
+    def advance(self, level: int, exp_to_next: int) -> int:
+        """Requirement after one level-up from ``level`` with ``exp_to_next``"""
+        if exp_to_next == self.exp_to_next(level):
+            return self.exp_to_next(level + 1)
+        return int(exp_to_next * self.multiplier)
+
+    def total_exp(self, level: int) -> int:
+        """Total XP needed to reach ``level`` from level 1 with 0 XP"""
+        if level >= len(self.cumulative):
+            self._extend(level)
+        return self.cumulative[level]
+
+    def level_for_total(self, total: int) -> int:
+        """Highest level reachable with ``total`` XP (capped at max_level)"""
+        cap = self.max_level
+        while self.cumulative[-1] <= total and len(self.cumulative) <= cap:
+            # Tables only grow as far as a grant actually needs
+            self._extend(min(cap, 2 * len(self.cumulative)))
+        return min(cap, bisect_right(self.cumulative, total) - 1)
+
+    def resolve(self, level: int, exp: int, exp_to_next: int, amount: int) -> Tuple[int, int, int]:
+        """Apply ``amount`` XP and return the new (level, exp, exp_to_next).
+
+        Stops at ``max_level`` with any excess left in ``exp``; capping
+        the displayed XP there is up to the caller.
+        """
+        exp += amount
+        cap = self.max_level
+        # Off-curve requirement: step the old way until it lands on the table
+        while exp >= exp_to_next > 0 and level < cap and exp_to_next != self.exp_to_next(level):
+            exp -= exp_to_next
+            level += 1
+            exp_to_next = int(exp_to_next * self.multiplier)
+        if exp < exp_to_next or level >= cap or exp_to_next != self.exp_to_next(level):
+            return level, exp, exp_to_next
+
+        total = self.total_exp(level) + exp
+        new_level = self.level_for_total(total)
+        return new_level, total - self.cumulative[new_level], self.requirements[new_level]
+
+
+# Character curve: levels 1-100 precomputed, extended up to MAX_DEV_LEVEL when needed
+CHARACTER_XP = XPCurve(STARTING_EXP_TO_NEXT, EXP_MULTIPLIER_PER_LEVEL, CHARACTER_TABLE_LEVELS, MAX_DEV_LEVEL)
+
+# Skill curve: levels 1-99
+SKILL_XP = XPCurve(STARTING_SKILL_EXP_TO_NEXT, SKILL_EXP_MULTIPLIER_PER_LEVEL, MAX_SKILL_LEVEL, MAX_SKILL_LEVEL)
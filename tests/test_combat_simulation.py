@@ -0,0 +1,229 @@
+"""Unit tests for the headless combat simulation engine"""
+import pytest
+from rpg_game.combat.enemies import BASE_ENEMIES
+from rpg_game.combat.simulation import (
+    PlayerSnapshot, SimulationResult, binomial, make_rng, simulate_encounters
+)
+
+
+class TestCombatSimulation:
+    """Test batch encounter resolution"""
+
+    def test_binomial_edge_cases(self):
+        """Test degenerate probabilities"""
+        rng = make_rng(1)
+        assert binomial(rng, 100, 0.0) == 0
+        assert binomial(rng, 100, 1.0) == 100
+        assert binomial(rng, 0, 0.5) == 0
+
+    def test_binomial_mean(self):
+        """Test that skip sampling matches the expected mean"""
+        rng = make_rng(7)
+        n, p = 200000, 0.01
+        draws = [binomial(rng, n, p) for _ in range(20)]
+        mean = sum(draws) / len(draws)
+        assert abs(mean - n * p) < 0.02 * n * p
+
+    def test_same_seed_is_reproducible(self):
+        """Test that a seed fully determines the result"""
+        pool = [e for e in BASE_ENEMIES if e['tier'] == 1]
+        first = simulate_encounters(pool, 5000, 3, rng=make_rng(42))
+        second = simulate_encounters(pool, 5000, 3, rng=make_rng(42))
+        assert first.to_dict() == second.to_dict()
+
+    def test_loot_only_mode_kills_everything(self):
+        """Test that every encounter is a kill without player stats"""
+        pool = [e for e in BASE_ENEMIES if e['tier'] == 1]
+        result = simulate_encounters(pool, 3000, 1, rng=make_rng(3))
+        assert result.kills == result.encounters == 3000
+        assert sum(result.enemy_kills.values()) == 3000
+        # Heads are guaranteed drops
+        heads = sum(count for name, count in result.loot.items() if name.endswith('Head'))
+        assert heads == 3000
+
+    def test_fights_resolved_with_snapshot(self):
+        """Test that weak players lose fights when stats are supplied"""
+        pool = [e for e in BASE_ENEMIES if e['tier'] == 6]
+        weak = PlayerSnapshot(max_attack=10, defense=0, max_hp=20, dex=0, agl=0)
+        result = simulate_encounters(pool, 500, 90, 2.0, player_stats=weak, rng=make_rng(5))
+        assert result.deaths == 500
+        assert result.kills == 0
+        assert result.damage_taken > 0
+
+    def test_merge(self):
+        """Test merging partial results"""
+        pool = BASE_ENEMIES[:2]
+        a = simulate_encounters(pool, 100, 1, rng=make_rng(1))
+        b = simulate_encounters(pool, 200, 1, rng=make_rng(2))
+        merged = SimulationResult().merge(a).merge(b)
+        assert merged.kills == 300
+        assert merged.total_gold == a.total_gold + b.total_gold
+
+    def test_scaled_enemy_table_matches_scale_enemy(self):
+        """Test that cached records match the dict scaler and are shared"""
+        from rpg_game.combat.system import get_scaled_enemy, scale_enemy
+        template = BASE_ENEMIES[0]
+        record = get_scaled_enemy(template, 12, 1.1, night=True)
+        assert get_scaled_enemy(template, 12, 1.1, night=True) is record
+        legacy = scale_enemy(template, 12, 1.1, night=True)
+        assert (legacy['hp'], legacy['attack'], legacy['gold']) == (record.hp, record.attack, record.gold)
+        # Mutating the legacy dict must not leak into the shared table
+        legacy['drops'].append({'item': 'tepes_shard', 'chance': 1.0})
+        assert len(record.drops) == len(template['drops'])
+
+
+class TestCombatEngine:
+    """Test the UI-free combat core"""
+
+    def test_auto_fight_event_stream(self):
+        """Test that a fight ends with exactly one defeat event and HP stays consistent"""
+        from rpg_game.combat.engine import CombatEngine, EnemyDefeated, PlayerDefeated, Hit, Crit, EnemyHit
+        from rpg_game.combat.system import get_scaled_enemy
+        stats = PlayerSnapshot(max_attack=40, defense=5, max_hp=120, dex=20, agl=10)
+        enemy = get_scaled_enemy(BASE_ENEMIES[0], 5)
+        for seed in range(50):
+            engine = CombatEngine(stats, enemy, rng=make_rng(seed))
+            events = list(engine.auto_fight())
+            endings = [e for e in events if isinstance(e, (EnemyDefeated, PlayerDefeated))]
+            assert len(endings) == 1 and events[-1] is endings[0]
+            dealt = sum(e.dealt for e in events if isinstance(e, (Hit, Crit)))
+            taken = sum(e.damage for e in events if isinstance(e, EnemyHit))
+            assert engine.enemy_hp == max(0, enemy.hp - dealt)
+            assert engine.player_hp == max(0, stats.max_hp - taken)
+
+    def test_potions_do_not_overheal(self):
+        """Test that potions stop at max HP and the enemy still counters"""
+        from rpg_game.combat.engine import CombatEngine, Heal, EnemyHit, Dodge
+        from rpg_game.combat.system import get_scaled_enemy
+        stats = PlayerSnapshot(max_attack=10, defense=0, max_hp=100, dex=0, agl=0)
+        engine = CombatEngine(stats, get_scaled_enemy(BASE_ENEMIES[0], 1), player_hp=70, rng=make_rng(1))
+        events = list(engine.use_potions(20, 5))
+        assert events[0] == Heal(30, 2, 5)
+        assert isinstance(events[1], (EnemyHit, Dodge))
+
+
+class TestLootTables:
+    """Test that compiled loot tables match per-entry drop rolls"""
+
+    KILLS = 200000
+
+    @staticmethod
+    def _richest_enemy():
+        return max(BASE_ENEMIES, key=lambda e: len(e['drops']))
+
+    def test_per_item_rates(self):
+        """Test every item's drop rate against its exact chance, day and night"""
+        from rpg_game.combat.loot import LootTable
+        enemy = self._richest_enemy()
+        for night, multiplier in ((False, 1.0), (True, 1.5)):
+            table = LootTable.for_drops(enemy['drops'], night)
+            rng = make_rng(21)
+            counts = {}
+            for _ in range(self.KILLS):
+                for item_id in table.roll(rng):
+                    counts[item_id] = counts.get(item_id, 0) + 1
+            for drop in enemy['drops']:
+                p = min(1.0, drop['chance'] * multiplier)
+                observed = counts.get(drop['item'], 0) / self.KILLS
+                sigma = (p * (1 - p) / self.KILLS) ** 0.5
+                assert abs(observed - p) <= 5 * sigma + 1e-12, drop['item']
+
+    def test_drops_per_kill_distribution(self):
+        """Chi-square test of items per kill against the exact Poisson-binomial law"""
+        from rpg_game.combat.loot import LootTable
+        enemy = self._richest_enemy()
+        table = LootTable.for_drops(enemy['drops'])
+        chances = [min(1.0, d['chance']) for d in enemy['drops']]
+        exact = [1.0]
+        for p in chances:
+            nxt = [0.0] * (len(exact) + 1)
+            for k, mass in enumerate(exact):
+                nxt[k] += mass * (1 - p)
+                nxt[k + 1] += mass * p
+            exact = nxt
+
+        rng = make_rng(8)
+        observed = [0] * len(exact)
+        for _ in range(self.KILLS):
+            observed[len(table.roll(rng))] += 1
+
+        chi2 = 0.0
+        bins = 0
+        for k, mass in enumerate(exact):
+            expected = mass * self.KILLS
+            if expected >= 20:
+                chi2 += (observed[k] - expected) ** 2 / expected
+                bins += 1
+        df = bins - 1
+        assert chi2 < df + 6 * (2 * df) ** 0.5
+
+    def test_one_draw_per_kill_plus_one_per_drop(self):
+        """Test the RNG cost of a kill"""
+        from rpg_game.combat.loot import LootTable
+
+        class CountingRandom:
+            def __init__(self, rng):
+                self.rng = rng
+                self.calls = 0
+
+            def random(self):
+                self.calls += 1
+                return self.rng.random()
+
+        enemy = self._richest_enemy()
+        table = LootTable.for_drops(enemy['drops'])
+        rng = CountingRandom(make_rng(2))
+        rolled = sum(len(table.roll(rng)) - len(table.guaranteed) for _ in range(1000))
+        assert rng.calls == 1000 + rolled
+
+
+class TestEncounterEV:
+    """Test the analytic expected-value calculator"""
+
+    def test_matches_sampled_fights(self):
+        """Test that exact EVs agree with a large seeded sample"""
+        from rpg_game.combat.analysis import expected_encounter
+        from rpg_game.combat.simulation import _resolve_fights
+        from rpg_game.combat.system import get_scaled_enemy
+        stats = PlayerSnapshot(max_attack=25, defense=3, max_hp=80, dex=60, agl=30)
+        enemy = get_scaled_enemy(BASE_ENEMIES[5], 10)
+        ev = expected_encounter(stats, enemy)
+        fights = 100000
+        wins, rounds, damage_taken = _resolve_fights(make_rng(9), fights, stats, enemy)
+        assert abs(ev.win_probability - wins / fights) < 0.01
+        assert abs(ev.expected_rounds - rounds / fights) < 0.02 * ev.expected_rounds
+        assert abs(ev.expected_damage_taken - damage_taken / fights) < 0.02 * ev.expected_damage_taken
+
+    def test_guaranteed_win_drops(self):
+        """Test that a one-shot kill gives full rewards and guaranteed heads"""
+        from rpg_game.combat.analysis import expected_encounter
+        from rpg_game.combat.system import get_scaled_enemy
+        enemy = get_scaled_enemy(BASE_ENEMIES[0], 1)
+        stats = PlayerSnapshot(max_attack=10000, defense=0, max_hp=10, dex=0, agl=0)
+        ev = expected_encounter(stats, enemy)
+        assert ev.win_probability == pytest.approx(1.0)
+        assert ev.turns_to_kill == pytest.approx(1.0)
+        assert ev.expected_damage_taken == 0
+        assert ev.expected_gold == pytest.approx(enemy.gold)
+        heads = [name for name in ev.expected_drops if name.endswith('Head')]
+        assert heads and ev.expected_drops[heads[0]] == pytest.approx(1.0)
+
+
+class TestBalanceSweep:
+    """Test seeded multi-process sweeps"""
+
+    def test_sweep_independent_of_worker_count(self):
+        """Test that chunk seeding makes results independent of parallelism"""
+        from rpg_game.combat.sweep import run_balance_sweep
+        zones = ['Limbo Dungeon', 'Rhaom Dungeon']
+        serial = run_balance_sweep(3000, zones=zones, seed=11, workers=1, chunk_size=1000)
+        parallel = run_balance_sweep(3000, zones=zones, seed=11, workers=2, chunk_size=1000)
+        assert serial.to_dict() == parallel.to_dict()
+        assert len(serial.cells) == 4
+        assert serial.total.kills == 12000
+
+    def test_derive_seed_is_stable(self):
+        """Test that derived seeds differ per cell and are repeatable"""
+        from rpg_game.combat.sweep import derive_seed
+        assert derive_seed(1, 'Limbo Dungeon', 3, False, 0) == derive_seed(1, 'Limbo Dungeon', 3, False, 0)
+        assert derive_seed(1, 'Limbo Dungeon', 3, False, 0) != derive_seed(1, 'Limbo Dungeon', 3, True, 0)
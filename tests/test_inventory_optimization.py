@@ -56,3 +56,201 @@ class TestInventoryOptimization:
         assert removed is True
         assert len(inventory) == 0
 
+    
+    def test_swap_remove_keeps_indexes_consistent(self):
+        """Test that removals move only the last item and every lookup stays right"""
+        index = InventoryIndex()
+        stacks = [index.add_item({'name': f'Ore {i}', 'type': 'material', 'sell_value': i}) for i in range(50)]
+        sword = {'name': 'Sword', 'type': 'weapon', 'attack': 5}
+        index.append(sword)
+        
+        assert index.remove_item(stacks[3], quantity=1) is True
+        assert index[3] is sword
+        for i in range(0, 50, 2):
+            index.remove(stacks[i])
+        assert len(index) == 25
+        for position, item in enumerate(index):
+            assert index.index(item) == position
+            assert index.find_by_name(item['name']) == [item]
+        assert index.find_item({'name': 'Ore 4', 'type': 'material', 'sell_value': 4}) is None
+        assert sword in index and stacks[0] not in index
+    
+    def test_player_inventory_is_list_compatible(self):
+        """Test that Player.inventory is indexed, copyable and saves as a list"""
+        import copy
+        from rpg_game.models.player import Player
+        player = Player("Hoarder")
+        player.inventory = [{'name': 'Gem', 'type': 'material', 'sell_value': 5, 'quantity': 2}]
+        assert isinstance(player.inventory, InventoryIndex)
+        add_item_to_inventory(player.inventory, {'name': 'Gem', 'type': 'material', 'sell_value': 5})
+        assert player.inventory == [{'name': 'Gem', 'type': 'material', 'sell_value': 5, 'quantity': 3}]
+        
+        snapshot = copy.deepcopy(player.inventory)
+        remove_item_from_inventory(player.inventory, player.inventory[0], 3)
+        assert len(player.inventory) == 0 and snapshot[0]['quantity'] == 3
+        assert snapshot.find_by_name('Gem') == [snapshot[0]]
+        
+        player.inventory = snapshot
+        data = player.to_dict()
+        assert type(data['inventory']) is list and data['inventory'][0]['quantity'] == 3
+        assert Player.from_dict(data).inventory == data['inventory']
+    
+    def test_items_interned_as_flyweights(self):
+        """Test that known items share one definition and unknown ones stay dicts"""
+        from rpg_game.items import POTIONS, DROP_ITEMS
+        from rpg_game.items.registry import ItemStack, get_item_def
+        index = InventoryIndex()
+        index.add_item(POTIONS['large_healing_ampul'].copy())
+        index.add_item(DROP_ITEMS['large_healing_ampul'].copy(), quantity=2)
+        index.add_item({'name': 'Mystery Box', 'type': 'material', 'sell_value': 1})
+        stack, mystery = index
+        assert isinstance(stack, ItemStack) and type(mystery) is dict
+        assert stack.definition is get_item_def('potions:large_healing_ampul')
+        assert stack['quantity'] == 3 and stack.get('heal') == 200 and stack.overrides is None
+        assert stack == {**POTIONS['large_healing_ampul'], 'quantity': 3}
+    
+    def test_instance_overrides_survive_saving(self):
+        """Test that per-instance bonuses are kept and saved as plain dicts"""
+        from rpg_game.items import SWORDS
+        from rpg_game.models.player import Player
+        player = Player("Smith")
+        sword = SWORDS['g10'].copy()
+        sword['talisman_bonuses'] = {'bonus_str': 5}
+        add_item_to_inventory(player.inventory, sword)
+        stored = player.inventory[0]
+        assert stored.overrides == {'talisman_bonuses': {'bonus_str': 5}}
+        assert type(stored.copy()) is dict
+        
+        saved = player.to_dict()['inventory']
+        assert saved == [{**SWORDS['g10'], 'talisman_bonuses': {'bonus_str': 5}}]
+        assert all(type(item) is dict for item in saved)
+    
+    def test_catalog_indexes(self):
+        """Test catalog lookups by key, name, type and grade, and conflict detection"""
+        from rpg_game.items import registry
+        from rpg_game.game.dev_tables import get_item_sell_value
+        from rpg_game.skills.fishing import get_fish_key_from_name
+        assert get_item_sell_value('head_kid') == 120
+        assert get_item_sell_value('sapphire') == 2500
+        assert get_item_sell_value('no_such_item') == '?'
+        assert get_fish_key_from_name('Sea Bream') == 'sea_bream'
+        assert get_fish_key_from_name('Cooked Goby') is None
+        assert registry.find_by_name('Iron Ore').stack_id == registry.find_by_name('Iron Ore', 'ores').stack_id
+        assert {d.item_id for d in registry.items_of_grade(10)} >= {'swords:g10', 'armor:g10'}
+        assert all(d.fields['type'] == 'talisman' for d in registry.items_of_type('talisman'))
+        assert registry.check_catalog() == []
+        
+        registry._BY_NAME['Goby'].append(registry.ItemDef(-1, 'test:goby', {'name': 'Goby', 'type': 'material', 'sell_value': 1}, -1))
+        try:
+            assert any("'Goby'" in conflict for conflict in registry._find_conflicts())
+        finally:
+            registry._BY_NAME['Goby'].pop()
+    
+    def test_partitions_follow_changes(self):
+        """Test that type partitions and counters are kept up to date"""
+        index = InventoryIndex()
+        small = index.add_item({'name': 'Small Potion', 'type': 'consumable', 'heal': 20, 'sell_value': 5})
+        big = index.add_item({'name': 'Big Potion', 'type': 'consumable', 'heal': 80, 'sell_value': 30})
+        index.add_item({'name': 'Bread', 'type': 'consumable', 'heal': 0})
+        sword = {'name': 'Sword', 'type': 'weapon', 'attack': 3}
+        index.append(sword)
+        index.add_item({'name': 'Talisman', 'type': 'talisman', 'sell_value': 500})
+        index.add_item({'name': 'Talisman 2', 'type': 'talisman', 'sell_value': 500})
+        
+        assert index.healing_items() == [big, small]
+        assert index.equippable_items() == [sword]
+        assert [item['name'] for item in index.sellable_items()] == ['Small Potion', 'Big Potion', 'Talisman', 'Talisman 2']
+        assert index.count_type('talisman') == 2
+        
+        index.remove_item(big, 1)
+        index.remove(sword)
+        index[index.index(small)] = {'name': 'Medium Potion', 'type': 'consumable', 'heal': 50}
+        assert [item['name'] for item in index.healing_items()] == ['Medium Potion']
+        assert index.equippable_items() == []
+        assert [item['name'] for item in index.sellable_items()] == ['Talisman', 'Talisman 2']
+        index.clear()
+        assert index.count_type('talisman') == 0 and index.healing_items() == []
+    
+    def test_batch_changes_are_atomic(self):
+        """Test that a batch applies as a whole or not at all"""
+        from rpg_game.items.inventory_optimized import InventoryError, apply_inventory_changes
+        fish = {'name': 'Goby', 'type': 'material', 'sell_value': 50}
+        meal = {'name': 'Cooked Goby', 'type': 'consumable', 'heal': 10, 'sell_value': 60}
+        index = InventoryIndex()
+        index.add_item(fish, 3)
+        
+        index.apply([(fish, -1), (meal, 1), (fish, -1), (meal, 1)])
+        assert index.count(index.find_item(fish).stack_key) == 1
+        assert index.find_item(meal)['quantity'] == 2
+        
+        before = index.to_list()
+        with pytest.raises(InventoryError):
+            index.apply([(meal, 5), (fish, -2)])
+        assert index.to_list() == before
+        
+        # A failure half way is undone
+        class Broken(dict):
+            def keys(self):
+                raise RuntimeError("broken")
+            __iter__ = keys
+        with pytest.raises(RuntimeError):
+            index.apply([(fish, -1), (meal, -1), (Broken(name='New', type='material'), 1)])
+        assert sorted(map(str, index.to_list())) == sorted(map(str, before))
+        
+        inventory = [dict(fish, quantity=2)]
+        with pytest.raises(InventoryError):
+            apply_inventory_changes(inventory, [(meal, 1), (fish, -3)])
+        assert inventory == [dict(fish, quantity=2)]
+        apply_inventory_changes(inventory, [(meal, 1), (fish, -2)])
+        assert inventory == [dict(meal, quantity=1)]
+    
+    def test_snapshot_restore(self):
+        """Test rolling an inventory back without copying it"""
+        index = InventoryIndex()
+        sword = {'name': 'Sword', 'type': 'weapon', 'attack': 3}
+        index.append(sword)
+        potion = index.add_item({'name': 'Potion', 'type': 'consumable', 'heal': 20}, 4)
+        snapshot = index.snapshot()
+        expected = sorted(map(str, index.to_list()))
+        
+        index.remove_item(potion, 4)
+        index.remove(sword)
+        index.add_item({'name': 'Drop', 'type': 'material', 'sell_value': 7}, 2)
+        index.append({'name': 'Axe', 'type': 'weapon', 'attack': 5})
+        
+        index.restore(snapshot)
+        assert sorted(map(str, index.to_list())) == expected
+        assert index.find_by_name('Drop') == [] and index.healing_items()[0]['quantity'] == 4
+    
+    def test_deleted_fields_survive_copies(self):
+        """Test that an item missing a table field can be copied, pickled and saved"""
+        import copy
+        import json
+        import pickle
+        from rpg_game.items import POTIONS
+        old_item = POTIONS['large_healing_ampul'].copy()
+        del old_item['cost']  # as in an older save
+        index = InventoryIndex([old_item])
+        
+        for clone in (copy.deepcopy(index), pickle.loads(pickle.dumps(index))):
+            assert 'cost' not in clone[0]
+            assert json.loads(json.dumps(clone.to_list())) == index.to_list()
+        
+        shallow = copy.copy(index[0])
+        shallow['cost'] = 1
+        assert 'cost' not in index[0]
+    
+    def test_list_batch_spans_stacks(self):
+        """Test that the plain-list batch removes across stacks and keeps the caller's items"""
+        from rpg_game.items.inventory_optimized import InventoryError, apply_inventory_changes
+        ore = {'name': 'Ore', 'type': 'material', 'sell_value': 10}
+        first, second = dict(ore, quantity=3), dict(ore, quantity=3)
+        sword = {'name': 'Sword', 'type': 'weapon', 'attack': 3}
+        inventory = [first, sword, second]
+        
+        with pytest.raises(InventoryError):
+            apply_inventory_changes(inventory, [(ore, -7)])
+        assert inventory == [first, sword, second] and first['quantity'] == 3
+        
+        apply_inventory_changes(inventory, [(ore, -5), (sword, -1)])
+        assert inventory == [dict(ore, quantity=1)] and inventory[0] is second
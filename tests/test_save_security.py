@@ -125,3 +125,56 @@ class TestSaveSecurity:
         assert cleaned_data is not None
         assert error is None
 
+    
+    def test_inventory_items_validated(self):
+        """Test that inventory entries are checked against the item schema"""
+        data = {
+            "name": "TestPlayer",
+            "level": 5,
+            "exp": 100,
+            "exp_to_next": 200,
+            "gold": 500,
+            "inventory": [{"name": "Goby", "type": "material", "quantity": 2}],
+        }
+        assert validate_save_data(data) == (True, None)
+        
+        data["inventory"].append({"name": "Cod", "quantity": -3})
+        is_valid, error = validate_save_data(data)
+        assert is_valid is False
+        assert error.startswith("inventory[1]:")
+        
+        data["inventory"][1] = {"type": "material"}
+        is_valid, error = validate_save_data(data)
+        assert is_valid is False
+        assert "Missing required fields: name" in error
+    
+    def test_bool_is_not_integer(self):
+        """Test that booleans are rejected for integer fields"""
+        data = {
+            "name": "TestPlayer",
+            "level": True,
+            "exp": 100,
+            "exp_to_next": 200,
+            "gold": 500,
+            "inventory": [],
+        }
+        is_valid, error = validate_save_data(data)
+        assert is_valid is False
+        assert "invalid type" in error
+    
+    def test_clean_drops_unknown_fields(self):
+        """Test that cleaning keeps declared fields only"""
+        data = {
+            "name": "TestPlayer",
+            "level": 5,
+            "exp": 100,
+            "exp_to_next": 200,
+            "gold": 500,
+            "inventory": [],
+            "mining_level": 3,
+            "__class__": "Exploit",
+        }
+        is_valid, cleaned_data, error = validate_and_clean_json(data)
+        assert is_valid is True
+        assert cleaned_data["mining_level"] == 3
+        assert "__class__" not in cleaned_data
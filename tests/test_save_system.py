@@ -0,0 +1,532 @@
+"""Unit tests for save slot storage"""
+import json
+import pytest
+from rpg_game.models.player import Player
+from rpg_game.save import history, journal, system
+from rpg_game.config import DEV_FLAGS
+from rpg_game.save.binary_format import (
+    SaveFormatError, dumps_save, loads_save, is_binary_save, INVENTORY_CHUNK
+)
+from rpg_game.save.slot_index import load_slot_index
+
+
+@pytest.fixture
+def save_dir(temp_save_dir, monkeypatch):
+    """Point the save system at a temporary directory"""
+    monkeypatch.setattr(system, 'get_save_dir', lambda: temp_save_dir)
+    return temp_save_dir
+
+
+def make_player(name, slot, level=1):
+    """Player bound to a save slot"""
+    player = Player(name)
+    player.save_slot = slot
+    player.level = level
+    return player
+
+
+class TestSlotIndex:
+    """Test the sidecar slot metadata index"""
+
+    def test_save_updates_index(self, save_dir):
+        """Test that saving records the slot without a rescan"""
+        assert system.save_game(make_player("Indexed", 'alpha', 7))
+        record = load_slot_index(save_dir)['slots']['alpha']
+        assert record['player_name'] == 'Indexed' and record['level'] == 7
+        assert record['size'] == (save_dir / 'save_alpha.json').stat().st_size
+
+    def test_unchanged_directory_skips_parsing(self, save_dir, monkeypatch):
+        """Test that listing does not open save files when nothing changed"""
+        system.save_game(make_player("One", 'one'))
+        system.list_save_slots()
+
+        def fail(*args, **kwargs):
+            raise AssertionError("save file was parsed")
+        monkeypatch.setattr('rpg_game.save.slot_index._scan_save', fail)
+        slots = system.list_save_slots()
+        assert [s['slot_name'] for s in slots] == ['one']
+
+    def test_external_changes_rescanned(self, save_dir):
+        """Test that files written outside save_game are picked up incrementally"""
+        system.save_game(make_player("Kept", 'kept'))
+        system.list_save_slots()
+        (save_dir / 'save_manual.json').write_text(json.dumps({'name': 'Manual', 'level': 3}))
+        (save_dir / 'save_broken.json').write_text('{not json')
+        slots = {s['slot_name']: s for s in system.list_save_slots()}
+        assert slots['manual']['level'] == 3
+        assert slots['broken']['player_name'] == 'Corrupted Save'
+        assert slots['kept']['player_name'] == 'Kept'
+
+    def test_delete_removes_record(self, save_dir):
+        """Test that deleted slots disappear from the listing"""
+        system.save_game(make_player("Gone", 'gone'))
+        assert system.delete_save_slot('gone')
+        assert 'gone' not in load_slot_index(save_dir)['slots']
+        assert system.list_save_slots() == []
+
+
+class TestBinaryFormat:
+    """Test the compact binary save format"""
+
+    def make_data(self, items):
+        player = make_player("Packed", 'packed', 12)
+        for i in range(items):
+            player.inventory.append({'name': f'Ore {i % 7}', 'type': 'material', 'sell_value': 10, 'quantity': i + 1})
+        player.inventory.append({'name': 'Sword', 'type': 'weapon', 'attack': 3})
+        return player.to_dict()
+
+    def test_round_trip(self):
+        """Test that a multi-chunk inventory decodes to the same data"""
+        data = self.make_data(INVENTORY_CHUNK * 2 + 5)
+        payload = dumps_save(data, 'binary')
+        assert is_binary_save(payload)
+        assert loads_save(payload) == data
+        assert len(payload) < len(dumps_save(data, 'json')) / 5
+
+    def test_truncated_save_rejected(self):
+        """Test that a cut-off file fails instead of loading a partial inventory"""
+        payload = dumps_save(self.make_data(50), 'binary')
+        with pytest.raises(SaveFormatError):
+            loads_save(payload[:-3])
+
+    def test_json_save_migrates(self, save_dir, monkeypatch):
+        """Test that a JSON save loads and is rewritten in the configured format"""
+        system.save_game(make_player("Legacy", 'legacy', 4))
+        assert not is_binary_save((save_dir / 'save_legacy.json').read_bytes())
+        monkeypatch.setitem(DEV_FLAGS, 'save_format', 'binary')
+        player = system.load_game('legacy')
+        assert player.level == 4
+        assert system.save_game(player)
+        assert is_binary_save((save_dir / 'save_legacy.json').read_bytes())
+        assert system.load_game('legacy').name == "Legacy"
+        assert system.list_save_slots()[0]['player_name'] == "Legacy"
+
+
+class TestSaveJournal:
+    """Test journaled autosaves"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_states(self):
+        journal._STATES.clear()
+        yield
+        journal._STATES.clear()
+
+    def test_autosave_appends_delta(self, save_dir):
+        """Test that a second save only appends the change"""
+        player = make_player("Journal", 'jr')
+        system.save_game(player)
+        snapshot = (save_dir / 'save_jr.json').read_bytes()
+        player.gold += 250
+        player.inventory.append({'name': 'Goby', 'type': 'material', 'sell_value': 50, 'quantity': 2})
+        assert system.save_game(player)
+        assert (save_dir / 'save_jr.json').read_bytes() == snapshot
+        lines = (save_dir / 'save_jr.json.journal').read_bytes().splitlines()
+        assert len(lines) == 1 and len(lines[0]) < len(snapshot) / 4
+        journal._STATES.clear()
+        loaded = system.load_game('jr')
+        assert loaded.gold == player.gold
+        assert loaded.inventory[-1]['name'] == 'Goby'
+        assert system.list_save_slots()[0]['player_name'] == "Journal"
+
+    def test_stale_record_repaired_after_journal_append(self, save_dir, monkeypatch):
+        """Test that a refresh picks up a journaled change the index missed"""
+        player = make_player("Crash", 'crash', 1)
+        system.save_game(player)
+        assert system.list_save_slots()[0]['level'] == 1
+        
+        monkeypatch.setattr('rpg_game.save.system.record_slot', lambda *args: None)
+        player.level = 7
+        assert system.save_game(player)
+        assert (save_dir / 'save_crash.json.journal').exists()
+        assert system.list_save_slots()[0]['level'] == 7
+        assert load_slot_index(save_dir)['slots']['crash']['level'] == 7
+
+    def test_torn_record_ignored(self, save_dir):
+        """Test that a half-written record from a crash is skipped"""
+        player = make_player("Torn", 'torn')
+        system.save_game(player)
+        player.gold = 111
+        system.save_game(player)
+        with open(save_dir / 'save_torn.json.journal', 'ab') as f:
+            f.write(b'{"set":{"gold":999')
+        journal._STATES.clear()
+        assert system.load_game('torn').gold == 111
+
+    def test_compaction_moves_journal_to_backup(self, save_dir, monkeypatch):
+        """Test that compaction writes a snapshot and keeps the old state as the backup"""
+        monkeypatch.setattr(journal, 'JOURNAL_MAX_RECORDS', 3)
+        player = make_player("Compact", 'cmp')
+        for gold in range(5):
+            player.gold = gold
+            system.save_game(player)
+        # Snapshot, three deltas, then a new snapshot on the fifth save
+        assert not (save_dir / 'save_cmp.json.journal').exists()
+        assert json.loads((save_dir / 'save_cmp.json').read_bytes())['gold'] == 4
+        (save_dir / 'save_cmp.json').write_text('{corrupt')
+        journal._STATES.clear()
+        assert system.load_game('cmp').gold == 3
+
+
+class TestSaveWriter:
+    """Test the background save writer"""
+
+    def test_burst_coalesces(self):
+        """Test that saves queued during a write collapse into one more write"""
+        import threading
+        from rpg_game.save.writer import SaveWriter
+        started = threading.Event()
+        release = threading.Event()
+        written = []
+
+        def slow_write(slot_name, data):
+            written.append(data['gold'])
+            started.set()
+            release.wait(5)
+
+        writer = SaveWriter(slow_write)
+        writer.submit('main', {'gold': 0})
+        assert started.wait(5)
+        for gold in range(1, 20):
+            writer.submit('main', {'gold': gold})
+        release.set()
+        assert writer.flush(5)
+        assert written == [0, 19]
+
+    def test_snapshot_is_isolated(self, save_dir):
+        """Test that changes after queueing do not leak into the queued save"""
+        from rpg_game.save.writer import queue_save, flush_saves
+        player = make_player("Async", 'async')
+        player.inventory.append({'name': 'Goby', 'type': 'material', 'quantity': 1})
+        assert queue_save(player)
+        player.gold = 12345
+        player.inventory[-1]['quantity'] = 99
+        assert flush_saves(5)
+        data = json.loads((save_dir / 'save_async.json').read_bytes())
+        assert data['gold'] != 12345 and data['inventory'][-1]['quantity'] == 1
+
+    def test_failure_logged_and_reported(self, monkeypatch):
+        """Test that a failed background write is logged and fails the next flush"""
+        from rpg_game.save.writer import SaveWriter
+        logged = []
+        monkeypatch.setattr('rpg_game.utils.logging.log_error', lambda msg, **kw: logged.append(msg))
+
+        def broken_write(slot_name, data):
+            raise OSError("disk full")
+
+        writer = SaveWriter(broken_write)
+        writer.submit('main', {})
+        assert not writer.flush(5)
+        assert 'disk full' in logged[0]
+        assert writer.flush(5)
+
+
+class TestSaveCorpus:
+    """Test bulk validation, migration and stats over a save directory"""
+
+    @pytest.fixture
+    def archive(self, tmp_path):
+        """Five valid saves (two on schema 1) and one corrupt file"""
+        for index in range(5):
+            data = make_player(f"P{index}", f"s{index}", level=index % 3 + 1).to_dict()
+            data['gold'] = 10 ** index
+            data['inventory'] = [{'name': 'Goby', 'type': 'material', 'quantity': index + 1}]
+            if index < 2:
+                data['schema'] = 1
+            fmt = 'binary' if index % 2 else 'json'
+            (tmp_path / f'save_s{index}.json').write_bytes(dumps_save(data, fmt))
+        (tmp_path / 'save_bad.json').write_text('{"name": "Bad"}')
+        return tmp_path
+
+    def test_stats_and_migration(self, archive):
+        """Test that stats cover every save and old schemas are rewritten"""
+        from rpg_game.config import SAVE_SCHEMA_VERSION
+        from rpg_game.save.corpus import run_corpus
+        stats = run_corpus(archive, migrate=True, workers=0)
+        assert (stats.saves, stats.valid, stats.errors, stats.migrated) == (6, 5, 1, 2)
+        assert stats.levels == {1: 2, 2: 2, 3: 1}
+        assert stats.gold_buckets == {1: 1, 10: 1, 100: 1, 1000: 1, 10000: 1}
+        assert stats.items['Goby'] == 15
+        assert stats.error_samples[0][0] == 'save_bad.json'
+        for name in ('save_s0.json', 'save_s1.json'):
+            assert loads_save((archive / name).read_bytes())['schema'] == SAVE_SCHEMA_VERSION
+        assert is_binary_save((archive / 'save_s1.json').read_bytes())
+        assert run_corpus(archive, migrate=True, workers=0).migrated == 0
+
+    def test_pool_matches_inline(self, archive):
+        """Test that the worker pool produces the same aggregates"""
+        from rpg_game.save.corpus import run_corpus
+        inline = run_corpus(archive, workers=0).to_dict()
+        pooled = run_corpus(archive, workers=2, chunk_size=2).to_dict()
+        inline.pop('error_samples'), pooled.pop('error_samples')
+        assert pooled == inline
+
+    def test_resume_from_checkpoint(self, archive, monkeypatch):
+        """Test that an interrupted run picks up where it stopped"""
+        from rpg_game.save import corpus
+        monkeypatch.setattr(corpus, 'CHECKPOINT_INTERVAL', 0)
+        checkpoint = archive / 'progress.json'
+
+        def interrupt(done, total):
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            corpus.run_corpus(archive, workers=0, checkpoint=checkpoint, progress=interrupt, chunk_size=2)
+        seen = []
+        stats = corpus.run_corpus(archive, workers=0, checkpoint=checkpoint,
+                                  progress=lambda done, total: seen.append(done), chunk_size=2)
+        assert seen == [4, 6]
+        assert stats.saves == 6 and stats.valid == 5
+
+
+class TestSaveMigrations:
+    """Test the registered schema migration chain"""
+
+    def test_chain_composes(self):
+        """Test that v1 data runs every step and the input is left alone"""
+        from rpg_game.config import SAVE_SCHEMA_VERSION
+        from rpg_game.save.migrations import migrate_save_data, migration_path
+        data = {'name': 'Old', 'schema': 1, 'fishing_level': 40}
+        upgraded = migrate_save_data(data)
+        assert upgraded['schema'] == SAVE_SCHEMA_VERSION
+        assert upgraded['fishing_level'] == 1 and upgraded['mining_exp'] == 0
+        assert data == {'name': 'Old', 'schema': 1, 'fishing_level': 40}
+        assert migrate_save_data(upgraded) is upgraded
+        with pytest.raises(ValueError):
+            migration_path(0)
+
+    def test_old_save_loads_without_writing(self, save_dir, monkeypatch):
+        """Test that loading migrates in memory and the next save writes it out"""
+        from rpg_game.config import SAVE_SCHEMA_VERSION
+        data = make_player("Legacy", 'old').to_dict()
+        data['schema'] = 1
+        data['fishing_level'] = 50
+        payload = dumps_save(data)
+        (save_dir / 'save_old.json').write_bytes(payload)
+
+        def no_writes(*args, **kwargs):
+            raise AssertionError("load wrote to disk")
+        with monkeypatch.context() as patch:
+            patch.setattr(system, 'write_save_data', no_writes)
+            patch.setattr('rpg_game.save.writer.queue_save', no_writes)
+            player = system.load_game('old')
+        assert player.fishing_level == 1
+        assert (save_dir / 'save_old.json').read_bytes() == payload
+
+        assert system.save_game(player)
+        saved = system.read_slot_save(save_dir / 'save_old.json', save_dir / 'save_old.json.journal')[0]
+        assert saved['schema'] == SAVE_SCHEMA_VERSION
+
+    def test_benchmark_covers_every_version(self):
+        """Test that the load benchmark reports each schema version"""
+        from rpg_game.config import SAVE_SCHEMA_VERSION
+        from rpg_game.save.migrations import benchmark_loads
+        timings = benchmark_loads(inventory_size=5, repeat=2)
+        assert sorted(timings) == list(range(1, SAVE_SCHEMA_VERSION + 1))
+
+
+class TestSaveInspection:
+    """Test reading selected fields without loading the save"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_states(self):
+        journal._STATES.clear()
+        yield
+        journal._STATES.clear()
+
+    def test_fields_from_either_format(self, tmp_path):
+        """Test JSON (inventory first or last) and binary saves"""
+        from rpg_game.save.inspection import inspect_save
+        data = make_player("Peek", 'peek', level=9).to_dict()
+        data['inventory'] = [{'name': 'Odd "name" ] {', 'type': 'material', 'quantity': 3}] * 50
+        legacy = {'inventory': data['inventory'], **{k: v for k, v in data.items() if k != 'inventory'}}
+        (tmp_path / 'legacy.json').write_text(json.dumps(legacy, indent=2))
+        (tmp_path / 'compact.json').write_text(json.dumps(legacy, separators=(',', ':')))
+        (tmp_path / 'current.json').write_bytes(dumps_save(data))
+        (tmp_path / 'binary.json').write_bytes(dumps_save(data, 'binary'))
+        expected = {'name': "Peek", 'level': 9, 'gold': data['gold'], 'current_location': data['current_location']}
+        for name in ('legacy.json', 'compact.json', 'current.json', 'binary.json'):
+            assert inspect_save(tmp_path / name, expected.keys()) == expected
+        assert inspect_save(tmp_path / 'current.json', ['missing']) == {}
+
+    def test_journal_applied_without_loading(self, save_dir, monkeypatch):
+        """Test that journaled changes show up and no Player is built"""
+        from rpg_game.save.inspection import inspect_slot
+        player = make_player("Journaled", 'jr', level=4)
+        system.save_game(player)
+        player.gold = 4242
+        system.save_game(player)
+        assert (save_dir / 'save_jr.json.journal').exists()
+
+        def no_player(*args, **kwargs):
+            raise AssertionError("a Player was built")
+        monkeypatch.setattr(Player, 'from_dict', no_player)
+        assert inspect_slot('jr', ['name', 'gold']) == {'name': "Journaled", 'gold': 4242}
+        assert inspect_slot('nope') is None
+
+    def test_journal_created_during_inspection(self, tmp_path, monkeypatch):
+        """Test that a journal appearing mid-inspection is ignored, not a crash"""
+        from pathlib import Path
+        from rpg_game.save.inspection import inspect_save
+        path = tmp_path / 'save_race.json'
+        path.write_bytes(dumps_save(make_player("Race", 'race').to_dict()))
+        journal_path = path.with_name(path.name + '.journal')
+        real_exists = Path.exists
+        checks = []
+
+        def exists_then_created(self, *args, **kwargs):
+            if self == journal_path:
+                checks.append(self)
+                if len(checks) == 1:
+                    return False
+                # A background save lands right after the first check
+                journal_path.write_text('{"base": "x", "set": {"name": "Late"}}\n')
+            return real_exists(self, *args, **kwargs)
+        monkeypatch.setattr(Path, 'exists', exists_then_created)
+        assert inspect_save(path, ['name']) == {'name': "Race"}
+
+    def test_scan_marks_unreadable(self, tmp_path):
+        """Test that a directory scan yields None for broken saves"""
+        from rpg_game.save.inspection import scan_saves
+        (tmp_path / 'save_good.json').write_bytes(dumps_save(make_player("Good", 'good').to_dict()))
+        (tmp_path / 'save_bad.json').write_text('{"level": [1, "name": "Bad"')
+        (tmp_path / 'save_empty.json').write_bytes(b'')
+        results = dict(scan_saves(tmp_path, ['name']))
+        assert results == {'bad': None, 'empty': None, 'good': {'name': "Good"}}
+
+
+class TestSaveHistory:
+    """Test the deduplicated per-slot version history"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_states(self):
+        journal._STATES.clear()
+        history._LAST_RECORDED.clear()
+        yield
+        journal._STATES.clear()
+        history._LAST_RECORDED.clear()
+
+    def version_data(self, gold, items=200):
+        data = make_player("Hoarder", 'hoard', level=5).to_dict()
+        data['gold'] = gold
+        data['inventory'] = [{'name': f'Ore {i}', 'type': 'material', 'quantity': 1} for i in range(items)]
+        data['achievements'] = ['first_blood']
+        data['world_anchor_timestamp'] = 0
+        return data
+
+    def test_unchanged_chunks_stored_once(self, save_dir):
+        """Test that versions share the inventory and achievement chunks"""
+        def stored():
+            return sorted(p.name for p in (history.get_history_dir(save_dir) / 'objects').rglob('*') if p.is_file())
+
+        history.record_version(save_dir, 'hoard', self.version_data(0), now=1000)
+        first = stored()
+        for step in range(1, 20):
+            history.record_version(save_dir, 'hoard', self.version_data(step), now=1000 + step * 3600)
+        assert len(history.list_versions(save_dir, 'hoard')) == 10
+        # Only the fields chunk differs between versions
+        assert len(first) == 6 and len(stored()) == len(first) + 9
+
+    def test_diff_and_restore(self, save_dir):
+        """Test diffing two versions and rolling a slot back"""
+        old = history.record_version(save_dir, 'hoard', self.version_data(10), now=1000)
+        newer = self.version_data(99, items=201)
+        new = history.record_version(save_dir, 'hoard', newer, now=5000)
+        diff = history.diff_versions(save_dir, 'hoard', old, new)
+        assert diff == {'fields': {'gold': (10, 99)}, 'items': {'Ore 200': 1}}
+
+        system.write_save_data('hoard', newer)
+        restored = history.restore_version('hoard', old[:6])
+        assert restored['gold'] == 10
+        assert system.load_game('hoard').gold == 10
+        # The state replaced by the restore is still in the history
+        assert [v.summary['gold'] for v in history.list_versions(save_dir, 'hoard')] == [10, 99]
+
+    def test_prune_collects_unreferenced_chunks(self, save_dir):
+        """Test the retention policy and chunk garbage collection"""
+        policy = history.RetentionPolicy(keep_last=2, keep_daily=0)
+        for step in range(5):
+            history.record_version(save_dir, 'hoard', self.version_data(step, items=step), now=1000 + step * 3600,
+                                   policy=policy)
+        kept = history.list_versions(save_dir, 'hoard')
+        assert [v.summary['gold'] for v in kept] == [3, 4]
+        history.forget_history(save_dir, 'hoard')
+        assert history.history_size(save_dir) == 0
+
+    def test_saves_record_history_and_delete_forgets(self, save_dir, monkeypatch):
+        """Test that writes add versions at most once per interval"""
+        player = make_player("Saver", 'saver')
+        system.save_game(player)
+        player.gold = 5
+        system.save_game(player)
+        assert len(history.list_versions(save_dir, 'saver')) == 1
+        monkeypatch.setattr(history, 'HISTORY_MIN_INTERVAL', 0)
+        system.save_game(player)
+        assert [v.summary['gold'] for v in history.list_versions(save_dir, 'saver')] == [50, 5]
+        system.delete_save_slot('saver')
+        assert history.list_versions(save_dir, 'saver') == []
+
+
+class TestSaveTransactions:
+    """Test multi-slot transactions and crash recovery"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_states(self):
+        journal._STATES.clear()
+        yield
+        journal._STATES.clear()
+
+    def test_rename_moves_slot_and_history(self, save_dir):
+        """Test that a rename leaves only the new slot behind"""
+        system.save_game(make_player("Mover", 'before', level=6))
+        assert system.rename_save_slot('before', 'after')
+        assert sorted(p.name for p in save_dir.glob('save_*')) == ['save_after.json']
+        player = system.load_game('after')
+        assert player.name == "Mover" and player.save_slot == 'after'
+        assert [v.summary['level'] for v in history.list_versions(save_dir, 'after')] == [6]
+        assert not system.rename_save_slot('missing', 'other')
+
+    def test_batch_commits_together_or_not_at_all(self, save_dir, monkeypatch):
+        """Test that a batch costs the same flushes for any size and that errors discard it"""
+        from rpg_game.save import transaction
+        fsyncs, syncs = [], []
+        real_fsync = transaction.os.fsync
+        monkeypatch.setattr(transaction.os, 'fsync', lambda fd: (fsyncs.append(fd), real_fsync(fd)))
+        monkeypatch.setattr(transaction.os, 'sync', lambda: syncs.append(1), raising=False)
+        with transaction.SaveTransaction() as txn:
+            for i in range(8):
+                txn.write(f'batch{i}', make_player(f"Batch {i}", f'batch{i}').to_dict())
+        assert len(fsyncs) <= 2 and len(syncs) == 1
+        assert len(system.list_save_slots()) == 8
+        assert not any(transaction.get_transaction_dir(save_dir).iterdir())
+
+        with pytest.raises(RuntimeError):
+            with transaction.SaveTransaction() as txn:
+                txn.delete('batch0')
+                txn.write('batch9', make_player("Never", 'batch9').to_dict())
+                raise RuntimeError("interrupted")
+        assert len(system.list_save_slots()) == 8
+
+    def test_recovery_redoes_complete_logs_only(self, save_dir):
+        """Test that startup recovery finishes committed logs and drops torn ones"""
+        from rpg_game.save import transaction
+        system.save_game(make_player("Old", 'old'))
+        txn_dir = transaction.get_transaction_dir(save_dir)
+        txn_dir.mkdir()
+        payload = dumps_save(make_player("Fresh", 'fresh').to_dict())
+        committed = transaction.encode_log(
+            [{'op': 'write', 'slot': 'fresh', 'path': 'save_fresh.json', 'remove': []},
+             {'op': 'delete', 'slot': 'old', 'path': 'save_old.json',
+              'remove': ['save_old.json', 'save_old.json.bak']}], [payload])
+        (txn_dir / '1.log').write_bytes(committed)
+        torn = transaction.encode_log(
+            [{'op': 'delete', 'slot': 'fresh', 'path': 'save_fresh.json', 'remove': ['save_fresh.json']}], [])
+        (txn_dir / '2.log').write_bytes(torn[:-5])
+
+        assert transaction.recover_transactions(save_dir) == 1
+        assert not any(txn_dir.iterdir())
+        assert [s['slot_name'] for s in system.list_save_slots()] == ['fresh']
+        assert system.load_game('fresh').name == "Fresh"
+        # Redoing an already applied log changes nothing
+        (txn_dir / '3.log').write_bytes(committed)
+        assert transaction.recover_transactions(save_dir) == 1
+        assert (save_dir / 'save_fresh.json').read_bytes() == payload
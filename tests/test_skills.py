@@ -0,0 +1,96 @@
+"""Unit tests for gathering skill helpers"""
+import random
+from rpg_game.models.player import Player
+from rpg_game.skills import FISHING_XP_AWARDS, fast_forward_gathering
+from rpg_game.skills.core import apply_skill_xp
+from rpg_game.skills.sampling import CatchSampler, get_catch_sampler, invalidate_catch_samplers
+
+
+class TestCatchSampler:
+    """Test cached cumulative-weight catch sampling"""
+
+    def setup_method(self):
+        invalidate_catch_samplers()
+
+    def test_draw_matches_weights(self):
+        """Test that draws follow the normalized weights"""
+        entries = [('goby', {}), ('salmon', {}), ('tuna', {})]
+        sampler = CatchSampler(entries, [6.0, 3.0, 1.0])
+        rng = random.Random(1)
+        counts = {'goby': 0, 'salmon': 0, 'tuna': 0}
+        for _ in range(20000):
+            counts[sampler.draw(rng)[0]] += 1
+        assert abs(counts['goby'] / 20000 - 0.6) < 0.02
+        assert abs(counts['tuna'] / 20000 - 0.1) < 0.02
+
+    def test_sampler_cached_per_level_and_set(self):
+        """Test that weights are built once per (level, eligible set)"""
+        calls = []
+
+        def weigh(level, entries):
+            calls.append(level)
+            return [1.0] * len(entries)
+
+        entries = [('copper', {}), ('tin', {})]
+        first = get_catch_sampler('mining', 5, entries, weigh)
+        assert get_catch_sampler('mining', 5, list(entries), weigh) is first
+        assert get_catch_sampler('mining', 6, entries, weigh) is not first
+        assert calls == [5, 6]
+
+    def test_invalidate_on_level_up(self):
+        """Test that invalidation forces the weights to be rebuilt"""
+        calls = []
+
+        def weigh(level, entries):
+            calls.append(level)
+            return [1.0] * len(entries)
+
+        entries = [('goby', {})]
+        get_catch_sampler('fishing', 3, entries, weigh)
+        invalidate_catch_samplers('fishing')
+        get_catch_sampler('fishing', 3, entries, weigh)
+        assert calls == [3, 3]
+
+
+class TestOfflineGathering:
+    """Test fast-forwarded fishing and mining"""
+
+    def setup_method(self):
+        invalidate_catch_samplers()
+
+    def test_attempts_follow_cycle_time(self):
+        """Test that elapsed time divides into whole attempts"""
+        player = Player("Tester")
+        result = fast_forward_gathering(player, 'mining', 3600, speed_boost=-2,
+                                        rng=random.Random(3), award_achievements=False)
+        assert result.attempts == 600
+        assert sum(result.catches.values()) == 600  # Mining never misses
+
+    def test_inventory_and_xp_applied(self):
+        """Test that catches stack into the inventory and XP matches the awards"""
+        player = Player("Tester")
+        result = fast_forward_gathering(player, 'fishing', 8 * 500,
+                                        rng=random.Random(7), award_achievements=False)
+        expected_xp = sum(FISHING_XP_AWARDS[key] * count for key, count in result.catches.items())
+        assert result.xp_gained == expected_xp
+        stacked = sum(item.get('quantity', 1) for item in player.inventory if item.get('type') == 'material')
+        assert stacked == sum(result.catches.values())
+
+    def test_level_ups_unlock_new_catches(self):
+        """Test that crossing a level threshold widens the eligible set mid-run"""
+        player = Player("Tester")
+        result = fast_forward_gathering(player, 'fishing', 8 * 20000,
+                                        rng=random.Random(11), award_achievements=False)
+        assert result.end_level == player.fishing_level > result.start_level
+        assert result.levels_reached == list(range(result.start_level + 1, result.end_level + 1))
+        assert 'mackerel' in result.unlocked and result.catches.get('mackerel', 0) > 0
+
+    def test_matches_incremental_xp(self):
+        """Test that banked XP ends in the same state as per-catch add_skill_xp"""
+        bulk = Player("Bulk")
+        result = fast_forward_gathering(bulk, 'mining', 8 * 3000,
+                                        rng=random.Random(5), award_achievements=False)
+        single = Player("Single")
+        apply_skill_xp(single, 'mining', result.xp_gained)
+        assert (bulk.mining_level, bulk.mining_exp, bulk.mining_exp_to_next) == \
+            (single.mining_level, single.mining_exp, single.mining_exp_to_next)
@@ -0,0 +1,68 @@
+"""Unit tests for the precomputed XP curves"""
+import random
+from rpg_game.constants import EXP_MULTIPLIER_PER_LEVEL, SKILL_EXP_MULTIPLIER_PER_LEVEL, MAX_SKILL_LEVEL, MAX_DEV_LEVEL
+from rpg_game.models.player import Player
+from rpg_game.systems.xp_tables import CHARACTER_XP, SKILL_XP
+
+
+def step_levels(level, exp, exp_to_next, amount, multiplier, cap):
+    """The original one-level-at-a-time loop"""
+    exp += amount
+    while exp >= exp_to_next and level < cap:
+        exp -= exp_to_next
+        level += 1
+        exp_to_next = int(exp_to_next * multiplier)
+    return level, exp, exp_to_next
+
+
+class TestXPCurve:
+    """Test that table lookups match the iterative level-up loops"""
+
+    def test_requirements_match_loop(self):
+        """Test that the requirement table follows the truncated geometric chain"""
+        required = 100
+        for level in range(1, 101):
+            assert CHARACTER_XP.exp_to_next(level) == required
+            required = int(required * EXP_MULTIPLIER_PER_LEVEL)
+
+    def test_resolve_matches_loop(self):
+        """Test random grants against the loop for both curves"""
+        rng = random.Random(4)
+        for curve, multiplier, cap in ((SKILL_XP, SKILL_EXP_MULTIPLIER_PER_LEVEL, MAX_SKILL_LEVEL),
+                                       (CHARACTER_XP, EXP_MULTIPLIER_PER_LEVEL, CHARACTER_XP.max_level)):
+            for _ in range(300):
+                level = rng.randint(1, 60)
+                exp_to_next = curve.exp_to_next(level)
+                exp = rng.randrange(exp_to_next)
+                amount = rng.choice([0, 5, exp_to_next, 10 ** rng.randint(1, 14)])
+                assert curve.resolve(level, exp, exp_to_next, amount) == \
+                    step_levels(level, exp, exp_to_next, amount, multiplier, cap)
+
+    def test_skill_cap(self):
+        """Test that skills stop at the max level with the excess left in exp"""
+        level, exp, exp_to_next = SKILL_XP.resolve(1, 0, 100, 10 ** 30)
+        assert level == MAX_SKILL_LEVEL
+        assert exp == 10 ** 30 - SKILL_XP.total_exp(MAX_SKILL_LEVEL)
+
+    def test_off_curve_requirement(self):
+        """Test that legacy exp_to_next values level the old way"""
+        assert SKILL_XP.resolve(3, 0, 150, 1000) == step_levels(3, 0, 150, 1000, SKILL_EXP_MULTIPLIER_PER_LEVEL, MAX_SKILL_LEVEL)
+
+    def test_player_gain_exp(self):
+        """Test that a bulk grant matches repeated level_up calls"""
+        bulk = Player("Bulk")
+        stepped = Player("Stepped")
+        bulk.gain_exp(123456)
+        stepped.exp += 123456
+        while stepped.level_up(silent=True):
+            pass
+        assert (bulk.level, bulk.exp, bulk.exp_to_next, bulk.stat_points) == \
+            (stepped.level, stepped.exp, stepped.exp_to_next, stepped.stat_points)
+    
+    def test_level_up_respects_cap(self):
+        """Test that level_up cannot use XP gain_exp held back at the cap"""
+        player = Player("Capped")
+        player.gain_exp(CHARACTER_XP.total_exp(MAX_DEV_LEVEL) * 2)
+        assert player.level == MAX_DEV_LEVEL and player.exp >= player.exp_to_next
+        assert not player.level_up(silent=True)
+        assert player.level == MAX_DEV_LEVEL